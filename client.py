@@ -23,19 +23,23 @@ def handler_result(result):
         print("【LLM回答】", result)
         return result
 
-    # 如果返回对象带 data 字段
-    if hasattr(result, "data"):
-        data = result.data
-        if "screenshot" in data:  # 假设工具返回截图
-            image_base64 = data["screenshot"]
-            image_bytes = base64.b64decode(image_base64)
-            with open("output.png", "wb") as f:
-                f.write(image_bytes)
-            print("【保存截图】 output.png")
-            return "image_saved"
-        else:
-            print("【工具返回数据】", data)
-            return data
+    # 如果返回对象带 content 字段（MCP 内容块：文本 / 图片）
+    if hasattr(result, "content"):
+        outputs = []
+        for block in result.content:
+            if block.type == "image":  # 工具返回截图（PNG 内容块）
+                image_bytes = base64.b64decode(block.data)
+                with open("output.png", "wb") as f:
+                    f.write(image_bytes)
+                print("【保存截图】 output.png")
+                outputs.append("image_saved")
+            elif block.type == "text":
+                print("【工具返回数据】", block.text)
+                outputs.append(block.text)
+            else:
+                print("【工具返回数据】", block)
+                outputs.append(block)
+        return outputs
 
     # 默认打印
     print("【未知返回类型】", result)
@@ -47,40 +51,43 @@ async def main():
     # 初始化 MCP 客户端
     client = Client("server.py")
 
-    # 获取 MCP 提供的工具信息，整理成描述字典
-    tools_info = {}
+    # 整个程序只建立一次 MCP 会话：列出工具和代理之后的每次工具调用都复用它
     async with client:
+        # 获取 MCP 提供的工具信息，整理成描述字典
+        tools_info = {}
         tools = await client.list_tools()
         for tool in tools:
             tools_info[tool.name] = {
                 "desc": tool.description,
                 "params": tool.inputSchema or {}
             }
-    ########################模型示例####################################
-    # 1.初始化 OllamaToolAgent： 继承GenericToolAgent
-    # agent = OllamaToolAgent(
-    #     model_name="qwen3:1.7b",
-    #     tools= tools_info,
-    #     client= client,
-    #     # 额外ollama的参数
-    # )
+        ########################模型示例####################################
+        # 1.初始化 OllamaToolAgent： 继承GenericToolAgent
+        # agent = OllamaToolAgent(
+        #     model_name="qwen3:1.7b",
+        #     tools= tools_info,
+        #     client= client,
+        #     # tool_top_k=8,  # 工具较多时每次只列出与输入相关的 8 个工具（另加 State-Tool）
+        #     # 额外ollama的参数
+        # )
 
-    # 2.API或函数调用
-    # 定义一个简单 API 函数
-    def my_api(prompt: str) -> str:
-        return '{"tool_name": "Launch-Tool", "tool_args": {"name": "chrome"}}'
-    agent = APIToolAgent(
-        api_callable=my_api,
-        tools= tools_info,
-        client= client,
-    )
+        # 2.API或函数调用
+        # 定义一个简单 API 函数
+        def my_api(prompt: str) -> str:
+            return '{"tool_name": "Launch-Tool", "tool_args": {"name": "chrome"}}'
+        agent = APIToolAgent(
+            api_callable=my_api,
+            tools= tools_info,
+            client= client,
+        )
 
-    # 循环交互
-    while True:
-        query = input("user input: ")
-        tool = await agent.decide_action(query)  # 判断动作
-        result = await agent.act(tool, query)    # 执行动作
-        handler_result(result)                   # 处理结果
+        # 循环交互（代理负责会话保活与断线重连；input 放到线程中，等待输入时保活检查照常运行）
+        async with agent:
+            while True:
+                query = await asyncio.to_thread(input, "user input: ")
+                tool = await agent.decide_action(query)  # 判断动作
+                result = await agent.act(tool, query)    # 执行动作
+                handler_result(result)                   # 处理结果
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""
+应用名查找：AppNameIndex 与 fuzzywuzzy process.extractOne 的耗时对比
+- 名称：5000 个由常见软件名用词随机组合的应用名（外加 google chrome、notepad、visual studio code）
+- 查询：完全一致、缩写、拼写错误与部分名称各若干条
+- 统计：建索引耗时；每条查询的耗时与结果（得分阈值 80）
+    * 旧调用：extractOne(query, 字典)，与原 launch_app 相同；对字典打分的是值（AppID）而不是名称
+    * extractOne(query, 名称列表)：按名称逐个打分的正确写法
+    * AppNameIndex.match
+- 未安装 python-Levenshtein 时 fuzzywuzzy 使用纯 Python 实现，两边都会变慢，差距不变
+
+用法（在项目根目录执行）：
+    python other/app_index_benchmark.py
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fuzzywuzzy import process  # noqa: E402
+from src.desktop.app_index import AppNameIndex  # noqa: E402
+
+COUNT = 5000
+WORDS = [
+    "microsoft", "office", "word", "excel", "visual", "studio", "code", "google", "chrome", "adobe",
+    "reader", "photoshop", "notepad", "calculator", "paint", "settings", "steam", "discord", "spotify", "zoom",
+    "teams", "outlook", "update", "uninstall", "help", "manual", "tools", "driver", "manager", "center",
+    "console", "terminal", "python", "java", "node", "git", "bash", "media", "player", "video",
+    "audio", "editor", "viewer", "sync", "backup", "cloud", "drive", "security", "antivirus", "game",
+]
+QUERIES = ["chrome", "notepad", "visual studio code", "vs code", "spotfy", "calculater", "microsoft excel", "adobe reader 12"]
+
+
+def app_names() -> dict[str, str]:
+    """应用名 -> AppID，与开始菜单数据的形式一致"""
+    rng = random.Random(1)
+    apps = {}
+    while len(apps) < COUNT:
+        suffix = "".join(rng.choices(string.digits, k=rng.choice([0, 0, 2])))
+        name = (" ".join(rng.sample(WORDS, rng.randint(1, 4))) + " " + suffix).strip()
+        apps[name] = f"id{len(apps)}"
+    apps.update({"google chrome": "chrome", "notepad": "np", "visual studio code": "vsc"})
+    return apps
+
+
+def main():
+    apps = app_names()
+    start = time.perf_counter()
+    index = AppNameIndex(apps.items())
+    print(f"names: {len(apps)}   index build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    for query in QUERIES:
+        start = time.perf_counter()
+        legacy = process.extractOne(query, apps, score_cutoff=80)
+        legacy_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        expected = process.extractOne(query, list(apps), score_cutoff=80)
+        extract_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        matched = index.match(query, score_cutoff=80)
+        index_ms = (time.perf_counter() - start) * 1000
+        print(f"{query!r:22} old call {legacy_ms:7.1f} ms -> {legacy and legacy[0]!r:10} "
+              f"names {extract_ms:7.1f} ms -> {expected and expected[0]!r:22} index {index_ms:6.2f} ms -> {matched and matched[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Scrape-Batch-Tool 的并发抓取（src/web/batch.py：scrape_many + HostLimiter）与逐个抓取的耗时对比
+- 服务端：本机 ThreadingHTTPServer，通过不同的回环地址模拟多个主机（按 Host 头区分）
+    * 127.0.0.1：正常主机，立即返回约 80 KB 的页面
+    * 127.0.0.2：慢主机，每个响应前等待 1 秒
+    * 127.0.0.3：总是返回 500
+- URL：正常与慢主机各 10 个，外加 500 主机、拒绝连接的端口、非法 URL、无人响应的主机各一个和一个重复 URL，共 25 个
+- 先用 WebClient.document 逐个抓取，再用 scrape_many 批量抓取（不使用磁盘缓存，内存中的文档每次清空）
+- 检查：
+    * 结果按输入顺序返回，重复的 URL 只请求一次
+    * 每个主机同时进行的请求数不超过 WEB_HOST_CONCURRENCY
+    * 同一主机相邻两次请求开始的间隔不小于 WEB_HOST_INTERVAL（服务端计时，容差 20 ms）
+    * 失败只影响对应的 URL：500 返回状态码，拒绝连接与非法 URL 返回错误，其余正常
+
+用法（在项目根目录执行）：
+    python other/batch_scrape_benchmark.py
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.web import WebClient  # noqa: E402
+from src.web.batch import scrape_many  # noqa: E402
+from src.web.config import WEB_HOST_CONCURRENCY, WEB_HOST_INTERVAL  # noqa: E402
+
+PAGE = ("<html><body>" + "".join(f"<p>Paragraph {index} " + "word " * 50 + "</p>" for index in range(300)) + "</body></html>").encode()
+FAST, SLOW, FAILING, SILENT = "127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"
+SLOW_DELAY = 1.0
+TOLERANCE = 0.02
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight: Counter = Counter()
+    peak: Counter = Counter()
+    starts: dict = defaultdict(list)
+    paths: Counter = Counter()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        host = self.headers["Host"].split(":")[0]
+        with Handler.lock:
+            Handler.in_flight[host] += 1
+            Handler.peak[host] = max(Handler.peak[host], Handler.in_flight[host])
+            Handler.starts[host].append(time.monotonic())
+            Handler.paths[self.path] += 1
+        try:
+            if host == SLOW:
+                time.sleep(SLOW_DELAY)
+            if host == FAILING:
+                self.send_response(500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+        finally:
+            with Handler.lock:
+                Handler.in_flight[host] -= 1
+
+    @classmethod
+    def reset(cls):
+        cls.peak.clear()
+        cls.starts.clear()
+        cls.paths.clear()
+
+
+def build_urls(port: int) -> list[str]:
+    urls = []
+    for index in range(10):
+        urls.append(f"http://{FAST}:{port}/a{index}")
+        urls.append(f"http://{SLOW}:{port}/s{index}")
+    # 127.0.0.4 上没有绑定端口 1 的服务，与拒绝连接的情况相同但主机不同
+    return urls + [f"http://{FAILING}:{port}/fail", f"http://{FAST}:1/refused", "notaurl", f"http://{SILENT}:1/x", f"http://{FAST}:{port}/a0"]
+
+
+def main():
+    server = ThreadingHTTPServer(("0.0.0.0", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = build_urls(server.server_address[1])
+    client = WebClient(cache_path=None)
+
+    start = time.perf_counter()
+    for url in urls:
+        try:
+            client.document(url)
+        except Exception:
+            pass
+    sequential = time.perf_counter() - start
+    client.documents.clear()
+    Handler.reset()
+
+    start = time.perf_counter()
+    results = asyncio.run(scrape_many(client, urls))
+    batch = time.perf_counter() - start
+    print(f"{len(urls)} URLs   sequential {sequential:.2f} s   batch {batch:.2f} s")
+
+    failures = []
+    if [result.url for result in results] != urls:
+        failures.append("results not in input order")
+    if Handler.paths["/a0"] != 1:
+        failures.append(f"duplicate URL requested {Handler.paths['/a0']} times")
+    print(f"peak requests in flight per host: {dict(Handler.peak)} (limit {WEB_HOST_CONCURRENCY})")
+    if any(peak > WEB_HOST_CONCURRENCY for peak in Handler.peak.values()):
+        failures.append("per-host concurrency exceeded")
+    for host, starts in sorted(Handler.starts.items()):
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        if gaps:
+            print(f"{host}: {len(starts)} requests, minimum start gap {min(gaps):.3f} s (limit {WEB_HOST_INTERVAL} s)")
+            if min(gaps) < WEB_HOST_INTERVAL - TOLERANCE:
+                failures.append(f"{host}: requests started {min(gaps):.3f} s apart")
+
+    for result in results[-6:]:
+        status = result.document.fetch.status if result.document is not None else None
+        print(f"  {result.url:<32} status {status}  error {result.error}  queued {result.waited:.2f} s  fetched in {result.elapsed:.2f} s")
+    by_url = dict(zip(urls, results))
+    expected_errors = {urls[-4], urls[-3], urls[-2]}
+    for url, result in by_url.items():
+        if (result.error is not None) != (url in expected_errors):
+            failures.append(f"{url}: unexpected {'error ' + result.error if result.error else 'success'}")
+    failing = by_url[urls[-5]]
+    if failing.document is None or failing.document.fetch.status != 500:
+        failures.append("500 response not reported with its status")
+
+    server.shutdown()
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Scrape-Tool 正文提取（mode="main"）效果与耗时分析
+- 语料：other/web_corpus 下保存的 HTML 页面（博客、新闻、文档、论坛、商品页、GBK 中文新闻、纯导航页、
+  省略 </tr> </td> 的老式表格页、整个 body 包在一个 <form> 里的 WebForms 页面）
+- 对每个页面分别用 full / main 两种模式转换为 Markdown，统计字符数、压缩比例、转换耗时
+- 检查 main 模式是否保留正文关键句、是否去掉了 Cookie 横幅、侧栏、评论等噪声
+
+用法（在项目根目录执行）：
+    python other/extract_benchmark.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS = Path(__file__).resolve().parent / "web_corpus"
+sys.path.insert(0, str(ROOT))
+
+from src.web import CONVERTERS  # noqa: E402
+
+# 页面 -> (main 模式必须包含的文字, main 模式不应包含的文字)
+EXPECTED = {
+    "blog_post.html": (["How we cached our scraper", "Revalidation turned out to matter", "Fresh hits"],
+                       ["We use cookies", "Categories", "user3", "You might also like"]),
+    "news_article.html": (["312 million dollars", "three public information sessions"],
+                          ["Your privacy matters", "Most read", "Sponsored"]),
+    "docs_page.html": (["# Scheduler", "scheduler.submit", "| `priority` |", "Shutting down"],
+                       ["Guide chapter", "Topic 3.2"]),
+    "forum_thread.html": (["export.buffer_rows", "3.2.1"],
+                          ["Similar threads", "member1"]),
+    "product_page.html": (["40-hour battery", "Two devices can be connected"],
+                          ["We use cookies", "Accessory 3", "Subcategory"]),
+    "zh_news_gbk.html": (["十二点六公里", "直接乘坐地铁"],
+                         ["热点新闻", "关于我们"]),
+    "link_hub.html": ([], []),
+    "legacy_table.html": (["| 12:30 | 12:55 | Calls at Pier 3 |", "| 17:45 | 18:10 | Last crossing |", "Bicycles travel free", "replacement bus"],
+                          ["Accessibility", "Buses"]),
+    "webforms_page.html": (["# Library extension approved", "entrance moves to Mill Lane", "Read the full planning report"],
+                           ["Type your comment here", "Whole site", "Services"]),
+}
+
+
+def convert(variant: str, url: str, data: bytes, repeat: int = 20) -> tuple[str, float]:
+    """按 64 KB 分块喂入转换器（与下载时一致），返回 Markdown 与平均耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        converter = CONVERTERS[variant](url, "text/html", None)
+        for offset in range(0, len(data), 65536):
+            converter.feed_bytes(data[offset:offset + 65536])
+        markdown = converter.finish()
+    return markdown, (time.perf_counter() - start) / repeat
+
+
+def main():
+    rows = []
+    failures = []
+    for path in sorted(CORPUS.glob("*.html")):
+        data = path.read_bytes()
+        url = f"https://example.com/{path.stem}"
+        full, full_time = convert("full", url, data)
+        main_text, main_time = convert("main", url, data)
+        rows.append((path.name, len(data), len(full), len(main_text), main_time * 1000, full_time * 1000))
+        required, excluded = EXPECTED.get(path.name, ([], []))
+        failures += [f"{path.name}: missing {text!r}" for text in required if text not in main_text]
+        failures += [f"{path.name}: kept {text!r}" for text in excluded if text in main_text]
+
+    print(f"{'page':<22}{'html':>9}{'full':>9}{'main':>9}{'main/full':>11}{'main/html':>11}{'main ms':>10}{'full ms':>10}")
+    for name, html, full, main_size, main_ms, full_ms in rows:
+        print(f"{name:<22}{html:>9}{full:>9}{main_size:>9}{main_size / full:>11.1%}{main_size / html:>11.1%}{main_ms:>10.2f}{full_ms:>10.2f}")
+    total_full = sum(row[2] for row in rows)
+    total_main = sum(row[3] for row in rows)
+    print(f"\nmain/full overall: {total_main / total_full:.1%} ({total_full} -> {total_main} chars)")
+    print("checks:", "all passed" if not failures else "")
+    for failure in failures:
+        print("  " + failure)
+
+
+if __name__ == "__main__":
+    main()
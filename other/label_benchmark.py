@@ -0,0 +1,75 @@
+"""
+State-Tool 截图标注：标签重叠率与 LabelPlacer 耗时
+- 布局：1080p 屏幕上合成的三类元素框
+    * toolbar：20px 图标按 22px 间距排成多行（密集工具栏）
+    * links：分栏排列的短链接列表
+    * random：随机散布的大小不一的元素（20000 个时屏幕已被标签占满，用来看饱和时 place() 是否仍接近线性）
+- 旧做法：标签固定贴在元素框右上角的上方
+- 新做法：LabelPlacer（8 个候选位置 + SpatialGrid 碰撞检测）
+- 重叠率：按放置顺序，与之前已放置的标签有重叠的标签所占比例
+
+用法（在项目根目录执行）：
+    python other/label_benchmark.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.desktop  # noqa: E402,F401  src.tree 与 src.desktop 互相导入，需先导入 src.desktop
+from src.tree.labels import LabelPlacer, SpatialGrid  # noqa: E402
+
+WIDTH, HEIGHT = 1960, 1120
+CASES = [("toolbar", 400), ("links", 540), ("random", 1000), ("random", 5000), ("random", 20000)]
+
+
+def layout(kind: str, count: int) -> list[tuple[int, int, int, int]]:
+    rng = random.Random(0)
+    boxes = []
+    if kind == "toolbar":
+        per_row = 1900 // 22
+        for index in range(count):
+            row, column = divmod(index, per_row)
+            boxes.append((column * 22, 40 + row * 30, column * 22 + 20, 40 + row * 30 + 20))
+    elif kind == "links":
+        for index in range(count):
+            column, row = divmod(index, 45)
+            x, y = column * 160, row * 23
+            boxes.append((x, y, x + rng.randint(30, 150), y + 18))
+    else:
+        for _ in range(count):
+            x, y = rng.randint(0, 1880), rng.randint(0, 1050)
+            boxes.append((x, y, x + rng.randint(12, 60), y + rng.randint(12, 30)))
+    return boxes
+
+
+def overlap_rate(rects: list) -> float:
+    grid = SpatialGrid()
+    overlapping = 0
+    for rect in rects:
+        if grid.overlap_area(rect) > 0:
+            overlapping += 1
+        grid.insert(rect)
+    return overlapping / len(rects)
+
+
+def main():
+    print(f"{'layout':<16}{'legacy overlap':>16}{'new overlap':>14}{'place()':>12}")
+    for kind, count in CASES:
+        boxes = layout(kind, count)
+        labels = [str(index) for index in range(count)]
+        # 近似 annotated_screenshot 的标签尺寸（12px 字体：每个数字约 7px 宽，高 font_size + 4）
+        sizes = [(len(label) * 7 + 4, 16) for label in labels]
+        legacy = [(box[2] - size[0], box[1] - size[1], box[2], box[1]) for box, size in zip(boxes, sizes)]
+        start = time.perf_counter()
+        placements = LabelPlacer(WIDTH, HEIGHT).place(boxes, sizes, labels)
+        elapsed = time.perf_counter() - start
+        placed = overlap_rate([placement.rect for placement in placements])
+        print(f"{f'{kind}, {count}':<16}{overlap_rate(legacy):>16.1%}{placed:>14.1%}{elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
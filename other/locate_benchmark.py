@@ -0,0 +1,60 @@
+"""
+Locate-Image-Tool 模板匹配（src/desktop/locate.py）在 1920x1080 截图上的耗时与准确性
+- 截图：合成的类 UI 画面（浅色背景上 600 个带边框的色块 + 3000 处小字），固定随机种子
+- 模板：从截图中裁出的 4 个区域（48x48 图标、120x32 按钮、24x24 小图标、64x20 文本），
+  期望在原位置以 1.0 的得分找到
+- 每个模板匹配 7 次取中位数
+
+用法（在项目根目录执行）：
+    python other/locate_benchmark.py
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.desktop.locate import locate  # noqa: E402
+
+REPEAT = 7
+# (left, top, width, height)
+TEMPLATES = [(1500, 900, 48, 48), (300, 200, 120, 32), (700, 500, 24, 24), (1200, 300, 64, 20)]
+
+
+def synthetic_screen() -> Image.Image:
+    rng = np.random.default_rng(0)
+    image = Image.new("RGB", (1920, 1080), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for _ in range(600):
+        x, y = rng.integers(0, 1900), rng.integers(0, 1060)
+        fill = tuple(int(value) for value in rng.integers(0, 255, 3))
+        draw.rectangle([x, y, x + rng.integers(10, 120), y + rng.integers(8, 40)], fill=fill, outline=(0, 0, 0))
+    for _ in range(3000):
+        x, y = rng.integers(0, 1900), rng.integers(0, 1070)
+        draw.text((x, y), "ab", fill=(0, 0, 0))
+    return image
+
+
+def main():
+    screen = synthetic_screen()
+    print(f"{'template':<12}{'median':>10}   best match (left, top, score)   found")
+    for left, top, width, height in TEMPLATES:
+        template = screen.crop((left, top, left + width, top + height))
+        samples = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            matches = locate(screen, template)
+            samples.append(time.perf_counter() - start)
+        best = matches[0] if matches else None
+        found = best is not None and (best.left, best.top) == (left, top)
+        described = f"({best.left}, {best.top}, {best.score:.3f})" if best else "none"
+        print(f"{f'{width}x{height}':<12}{statistics.median(samples) * 1000:>7.1f} ms   {described:<30}{'yes' if found else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
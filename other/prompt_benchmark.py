@@ -0,0 +1,196 @@
+"""
+action prompt 的构建耗时与前缀稳定性（src/agent/prompt/builder.py：PromptBuilder）
+- 工具集：注册完整的 Windows 工具（register_windows_all_tools）后从 FastMCP 取出的 19 个工具的 inputSchema
+- 旧做法：改动前的 Prompt.action_prompt，每次调用都按 dict 顺序把每个工具的 inputSchema json.dumps 一遍，
+  模板带三引号 f-string 的缩进
+- 新做法：
+    * PromptBuilder（JSON 渲染，与引入前缀缓存时相同）
+    * Prompt.action_prompt（当前实现：紧凑签名渲染）
+- 统计：1000 次调用的平均构建耗时；每个工具集第一次构建（冷）的耗时；缓存命中 / 未命中次数；
+  不同用户输入的两个 prompt 共享的前缀长度；工具 dict 顺序打乱后与原 prompt 共享的前缀长度
+- 检查：同一工具集（任意顺序）得到逐字节相同的前缀；替换工具条目后前缀失效
+- prompt 体积：完整 prompt 与参数部分（inputSchema JSON / 紧凑签名）的字符数和近似 token 数
+  （这里没有模型的分词器，按英文单词、单个数字、单个中文字符、单个标点近似计数）
+- 参数还原（schema.map_arguments）：每个工具的示例参数分别按名称、字符串化取值、按位置给出，
+  都要还原为原值并通过 jsonschema 校验；不合法的参数给出带参数路径的 ValueError
+
+用法（在项目根目录执行）：
+    python other/prompt_benchmark.py
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import jsonschema  # noqa: E402
+from fastmcp import FastMCP  # noqa: E402
+from src.agent.prompt.builder import PromptBuilder  # noqa: E402
+from src.agent.prompt.schema import compact_signature, map_arguments  # noqa: E402
+from src.agent.prompt.service import Prompt  # noqa: E402
+from src.agent.tools.windows import register_windows_all_tools  # noqa: E402
+
+INPUTS = ["打开记事本", "把窗口最大化", "搜索今天的天气", "点击确定按钮"] * 250
+PRE_TOKENIZER = re.compile(r"[A-Za-z]+|\d|[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]|\S")
+# 示例参数（按 schema 类型取值）
+SAMPLES = {"integer": 3, "number": 1.5, "boolean": True, "string": "x"}
+# 不合法的参数：(工具, 参数)
+INVALID = [("Click-Tool", {"button": "top"}), ("Click-Tool", {"where": [1, 2]}), ("Move-Tool", {}), ("Wait-Tool", {"duration": "soon"})]
+
+
+def windows_tools() -> dict:
+    """与 MCP 客户端 list_tools 得到的工具字典相同：{名称: {desc, params(inputSchema)}}"""
+    mcp = FastMCP("prompt-benchmark")
+    register_windows_all_tools(mcp, None)
+    tools = asyncio.run(mcp._mcp_list_tools())
+    return {tool.name: {"desc": tool.description, "params": tool.inputSchema or {}} for tool in tools}
+
+
+def legacy_action_prompt(tools, user_input: str) -> str:
+    """改动前的 Prompt.action_prompt"""
+    tool_descriptions = "\n".join(
+        [
+            f"{name}: {{\n"
+            f"  desc: '{info['desc']}',\n"
+            f"  params: {json.dumps(info.get('params', {}), ensure_ascii=False)}\n"
+            f"}}"
+            for name, info in tools.items()
+        ]
+    )
+    examples = """
+        示例：
+        用户输入: 打开百度首页
+        输出:
+        {"tool_name": "open_browser", "tool_args": {"url": "https://www.baidu.com"}}
+
+        用户输入: 搜索天气
+        输出:
+        {"tool_name": "search_google", "tool_args": {"query": "北京天气"}}
+        """
+    return f"""
+        你是智能助理，根据用户指令判断是否需要调用工具。
+        如果需要调用工具，请严格输出 JSON:
+        {{
+            "tool_name": "工具名称",
+            "tool_args": {{}}
+        }}
+        如果不需要调用工具，直接输出答案:
+        {{
+            "tool_name": null,
+            "tool_args": {{}},
+            "answer":    答案
+        }}
+
+        可用工具列表：
+        {tool_descriptions}
+
+        {examples}
+
+        用户输入: {user_input}
+        """
+
+
+def per_call(build, tools) -> float:
+    """平均每次调用的耗时（微秒）"""
+    start = time.perf_counter()
+    for user_input in INPUTS:
+        build(tools, user_input)
+    return (time.perf_counter() - start) / len(INPUTS) * 1e6
+
+
+def shared(a: str, b: str) -> int:
+    return len(os.path.commonprefix([a, b]))
+
+
+def tokens(text: str) -> int:
+    return len(PRE_TOKENIZER.findall(text))
+
+
+def sample(schema: dict):
+    if "enum" in schema:
+        return schema["enum"][-1]
+    kind = schema.get("type")
+    if kind == "array":
+        return [sample(schema.get("items", {})) for _ in range(2)]
+    if kind == "object":
+        return {"action": "wait"}
+    return SAMPLES.get(kind, "x")
+
+
+def round_trips(tools: dict, failures: list) -> int:
+    """每个工具三种写法的参数都要还原为原值并通过 schema 校验，返回成功次数"""
+    passed = 0
+    for name, info in tools.items():
+        schema = info["params"]
+        args = {key: sample(value) for key, value in schema.get("properties", {}).items()}
+        stringified = {key: value if isinstance(value, str) else json.dumps(value) for key, value in args.items()}
+        for variant in (args, stringified, list(args.values())):
+            try:
+                mapped = map_arguments(schema, variant)
+                jsonschema.validate(mapped, schema)
+            except (ValueError, jsonschema.ValidationError) as ex:
+                failures.append(f"{name} {variant!r}: {ex}")
+                continue
+            if mapped != args:
+                failures.append(f"{name} {variant!r}: mapped to {mapped!r}")
+                continue
+            passed += 1
+    return passed
+
+
+def main():
+    tools = windows_tools()
+    items = list(tools.items())
+    random.Random(1).shuffle(items)
+    shuffled = dict(items)
+    failures = []
+    print(f"tools: {len(tools)}")
+
+    a, b = legacy_action_prompt(tools, INPUTS[0]), legacy_action_prompt(tools, INPUTS[3])
+    print(f"{'old action_prompt':<34}{per_call(legacy_action_prompt, tools):8.1f} us/call   {len(a):>6} chars   "
+          f"shared prefix: other input {shared(a, b)}, reordered tools {shared(a, legacy_action_prompt(shuffled, INPUTS[3]))}")
+
+    for name, builder in (("PromptBuilder, JSON renderer", PromptBuilder()), ("Prompt.action_prompt (compact)", Prompt.builder)):
+        start = time.perf_counter()
+        builder.build(tools, "x")
+        cold = (time.perf_counter() - start) * 1e6
+        warm = per_call(builder.build, tools)
+        a, b, c = builder.build(tools, INPUTS[0]), builder.build(tools, INPUTS[3]), builder.build(shuffled, INPUTS[3])
+        prefix = builder.prefix(tools)
+        print(f"{name:<34}{warm:8.1f} us/call   {len(a):>6} chars   shared prefix: other input {shared(a, b)}, reordered tools {shared(a, c)}   "
+              f"cold {cold:.0f} us, prefix {len(prefix)} chars, hits {builder.hits} misses {builder.misses}")
+        if not (a.startswith(prefix) and c.startswith(prefix)):
+            failures.append(f"{name}: prefix not byte-identical across inputs and tool order")
+
+        replaced = dict(tools)
+        before = builder.prefix(replaced)
+        replaced["Click-Tool"] = {**replaced["Click-Tool"], "desc": "changed"}
+        if builder.prefix(replaced) == before:
+            failures.append(f"{name}: replacing a tool entry did not invalidate the prefix")
+
+    old_prompt, new_prompt = legacy_action_prompt(tools, INPUTS[0]), Prompt.action_prompt(tools, INPUTS[0])
+    old_params = "\n".join(json.dumps(info["params"], ensure_ascii=False) for info in tools.values())
+    new_params = "\n".join(compact_signature(name, info["params"]) for name, info in tools.items())
+    print(f"whole prompt: {len(old_prompt)} -> {len(new_prompt)} chars, ~{tokens(old_prompt)} -> ~{tokens(new_prompt)} tokens")
+    print(f"parameters:   {len(old_params)} -> {len(new_params)} chars, ~{tokens(old_params)} -> ~{tokens(new_params)} tokens")
+
+    passed = round_trips(tools, failures)
+    print(f"argument round trips: {passed} of {3 * len(tools)} mapped back and validated")
+    for name, args in INVALID:
+        try:
+            map_arguments(tools[name]["params"], args)
+            failures.append(f"{name} {args!r} accepted")
+        except ValueError as ex:
+            print(f"  rejected {name} {args!r}: {ex}")
+
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
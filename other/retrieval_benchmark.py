@@ -0,0 +1,132 @@
+"""
+ToolRetriever（BM25 工具检索）在 500 个工具上的耗时、召回率与 prompt 体积
+- 工具集：按 25 个对象 × 20 个操作生成的 500 个工具（名称、英文描述、参数 schema 与 MCP 工具一致）
+- 查询：每个工具两条自然语言指令（不直接写工具名），期望该工具出现在 top-k 中
+    * 直述：沿用描述里的动词（"delete the file"）
+    * 改写：动词换成同义说法（"remove the file"），词法检索只能靠对象词命中，召回率是下限
+- 统计：建索引耗时、单次查询耗时（中位数 / p99）、recall@k、一个词都没命中而返回全部工具的次数、
+  完整 prompt 与检索后 prompt 的字符数
+
+用法（在项目根目录执行）：
+    python other/retrieval_benchmark.py
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.agent.prompt.retriever import ToolRetriever  # noqa: E402
+from src.agent.prompt.service import Prompt  # noqa: E402
+
+K = 8
+# 对象：名称用词, 描述用词, 查询用的说法
+OBJECTS = [
+    ("Window", "application window", "the app window"), ("File", "file on disk", "the file"),
+    ("Folder", "directory", "the folder"), ("Email", "email message", "the mail"),
+    ("Calendar", "calendar event", "the meeting"), ("Contact", "address book contact", "the contact"),
+    ("Browser-Tab", "browser tab", "the browser tab"), ("Bookmark", "browser bookmark", "the bookmark"),
+    ("Database", "database table", "the table in the database"), ("Image", "image file", "the picture"),
+    ("Audio", "audio track", "the audio track"), ("Video", "video clip", "the video"),
+    ("Printer", "printer queue", "the print queue"), ("Process", "running process", "the process"),
+    ("Service", "system service", "the windows service"), ("Registry", "registry key", "the registry key"),
+    ("Network", "network adapter", "the network adapter"), ("Bluetooth", "bluetooth device", "the bluetooth headset"),
+    ("Display", "display monitor", "the monitor"), ("Spreadsheet", "spreadsheet workbook", "the excel sheet"),
+    ("Document", "word document", "the report document"), ("Note", "sticky note", "my note"),
+    ("Task", "todo task", "the todo item"), ("Archive", "zip archive", "the zip"),
+    ("Font", "installed font", "the font"),
+]
+# 操作：名称用词, 描述用词, 改写查询用的同义说法, 参数名
+ACTIONS = [
+    ("Open", "Open", "bring up", ["name"]), ("Close", "Close", "shut", ["name", "force"]),
+    ("List", "List all", "show me every", ["filter", "limit"]), ("Create", "Create a new", "make a new", ["name", "template"]),
+    ("Delete", "Delete", "remove", ["name", "permanent"]), ("Rename", "Rename", "change the name of", ["name", "new_name"]),
+    ("Search", "Search for", "find", ["query", "limit"]), ("Export", "Export", "save out", ["name", "format", "path"]),
+    ("Import", "Import", "load in", ["path", "format"]), ("Copy", "Copy", "duplicate", ["name", "destination"]),
+    ("Move", "Move", "relocate", ["name", "destination"]), ("Share", "Share", "send a link to", ["name", "recipients"]),
+    ("Inspect", "Show the properties of", "tell me details about", ["name"]), ("Sort", "Sort", "reorder", ["key", "descending"]),
+    ("Backup", "Back up", "make a backup of", ["name", "path"]), ("Restore", "Restore", "bring back", ["name", "snapshot"]),
+    ("Lock", "Lock", "protect", ["name", "password"]), ("Unlock", "Unlock", "unprotect", ["name", "password"]),
+    ("Tag", "Add tags to", "label", ["name", "tags"]), ("Compare", "Compare two", "diff", ["first", "second"]),
+]
+FILLERS = ["please", "can you", "I need to", "quickly", "right now", "for me", ""]
+
+
+def build_tools() -> dict:
+    tools = {}
+    for object_name, object_desc, _ in OBJECTS:
+        for action_name, action_desc, _, params in ACTIONS:
+            tools[f"{action_name}-{object_name}-Tool"] = {
+                "desc": f"{action_desc} the {object_desc}. Returns the result as text.",
+                "params": {"type": "object", "properties": {param: {"type": "string"} for param in params}, "required": params[:1]},
+            }
+    tools["State-Tool"] = {"desc": "Capture the desktop state: focused window and interactive elements.",
+                           "params": {"type": "object", "properties": {"use_vision": {"type": "boolean", "default": False}}}}
+    return tools
+
+
+def build_queries(rng: random.Random) -> list[tuple[str, str, str]]:
+    """(查询, 期望的工具, 直述 / 改写)"""
+    queries = []
+    for object_name, _, object_query in OBJECTS:
+        for action_name, action_desc, action_query, _ in ACTIONS:
+            for kind, verb in (("direct", action_desc.lower()), ("paraphrase", action_query)):
+                query = f"{rng.choice(FILLERS)} {verb} {object_query} {rng.choice(FILLERS)}".strip()
+                queries.append((query, f"{action_name}-{object_name}-Tool", kind))
+    return queries
+
+
+def main():
+    rng = random.Random(0)
+    tools = build_tools()
+    queries = build_queries(rng)
+
+    start = time.perf_counter()
+    retriever = ToolRetriever(tools, k=K, pinned=("State-Tool",))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    hits = {"direct": 0, "paraphrase": 0}
+    fallbacks = 0
+    for query, expected, kind in queries:
+        start = time.perf_counter()
+        selection = retriever.select(query)
+        samples.append(time.perf_counter() - start)
+        hits[kind] += expected in selection and selection is not tools
+        fallbacks += selection is tools
+    # 重复测量查询耗时（结果子集已缓存，只剩打分与排序）
+    for _ in range(9):
+        for query, _, _ in queries:
+            start = time.perf_counter()
+            retriever.select(query)
+            samples.append(time.perf_counter() - start)
+    samples_us = sorted(sample * 1e6 for sample in samples)
+
+    query = queries[0][0]
+    full_prompt = Prompt.action_prompt(tools, query)
+    selected_prompt = Prompt.action_prompt(retriever.select(query), query)
+    sizes = [len(Prompt.action_prompt(retriever.select(query), query)) for query, _, _ in queries]
+    start = time.perf_counter()
+    for query, _, _ in queries:
+        Prompt.action_prompt(retriever.select(query), query)
+    prompt_us = (time.perf_counter() - start) / len(queries) * 1e6
+    start = time.perf_counter()
+    for _ in range(1000):
+        Prompt.action_prompt(retriever.select(query), query)
+    repeat_us = (time.perf_counter() - start) / 1000 * 1e6
+    total = len(queries) // 2
+
+    print(f"tools: {len(tools)}   queries: {len(queries)}   k: {K} (+ State-Tool)   index terms: {len(retriever.postings)}")
+    print(f"index build: {build_ms:.1f} ms")
+    print(f"select(): median {statistics.median(samples_us):.1f} us   p99 {samples_us[int(len(samples_us) * 0.99)]:.1f} us   max {samples_us[-1]:.1f} us")
+    print(f"recall@{K}: direct {hits['direct'] / total:.1%} ({hits['direct']}/{total})   paraphrase {hits['paraphrase'] / total:.1%} ({hits['paraphrase']}/{total})")
+    print(f"no term matched (all tools sent): {fallbacks}/{len(queries)}")
+    print(f"prompt chars: all tools {len(full_prompt)}   selected {len(selected_prompt)} (mean {statistics.mean(sizes):.0f} over all queries)")
+    print(f"select() + action_prompt(): {prompt_us:.1f} us per request over all queries, {repeat_us:.1f} us for a repeated query (prefix cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Scrape-Tool 大页面的流式转换（src/web/markdown.py + WebClient.document）内存峰值与耗时
+- 服务端：本机回环上的 ThreadingHTTPServer，返回约 6.8 MB 的 HTML 页面（40000 个带标题、链接、列表、
+  脚本的块，外加导航、样式与页脚），按 8 KB 分块写出，Cache-Control: max-age=60
+- 统计（内存峰值由 tracemalloc 记录，只含 Python 分配）：
+    * 新做法：2 MB 上限的流式下载 + 边下载边转换 + 分页，内存峰值与耗时、页数与最大页长
+    * 读取下一页（page token）的耗时；同一缓存目录下新建 WebClient 命中新鲜缓存的耗时
+    * 不设上限（默认 5 MB）的流式转换耗时（不跟踪内存）
+    * 旧做法：requests.get 下载整页后 markdownify（约 1.5 分钟，可用 --quick 跳过）
+- 检查：按 777 字节分块喂入转换器与一次性转换的结果完全一致；脚本、导航被去掉，非 ASCII 文本保留；
+  截断标记与每页长度上限
+
+用法（在项目根目录执行）：
+    python other/scrape_memory_benchmark.py [--quick]
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.web import WebClient  # noqa: E402
+from src.web.markdown import MarkdownConverter, html_to_markdown  # noqa: E402
+from src.web.pages import make_page_token, parse_page_token  # noqa: E402
+
+ROW = ('<div class="post"><h2>Item {index}</h2><p>Some <b>bold</b> text and <a href="/p/{index}">a link</a> with café.</p>'
+       '<ul><li>one</li><li>two</li></ul><script>var x={index};</script></div>')
+PAGE = ('<html><head><meta charset="utf-8"><title>Large page</title><style>p{{}}</style></head><body><nav><ul><li>menu</li></ul></nav>'
+        + "".join(ROW.format(index=index) for index in range(40000)) + "<footer>f</footer></body></html>").encode("utf-8")
+CAP = 2 * 1024 * 1024
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            # 客户端读到上限后直接关闭了连接
+            pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Cache-Control", "max-age=60")
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        try:
+            for offset in range(0, len(PAGE), 8192):
+                self.wfile.write(PAGE[offset:offset + 8192])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def traced(func):
+    """运行 func，返回 (结果, 耗时秒, tracemalloc 峰值字节)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        return result, time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="跳过旧做法（markdownify 整页，约 1.5 分钟）")
+    quick = parser.parse_args().quick
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/big"
+    failures = []
+    print(f"page: {len(PAGE) / 2**20:.1f} MB")
+
+    whole = html_to_markdown(PAGE.decode("utf-8"), base_url=url)
+    converter = MarkdownConverter(base_url=url)
+    for offset in range(0, len(PAGE), 777):
+        converter.feed_bytes(PAGE[offset:offset + 777])
+    if converter.finish() != whole:
+        failures.append("chunked conversion differs from whole-string conversion")
+    if "menu" in whole or "var x" in whole or "café" not in whole:
+        failures.append("navigation or scripts kept, or non-ASCII text lost")
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = WebClient(cache_path=Path(directory), max_bytes=CAP)
+        document, elapsed, peak = traced(lambda: client.document(url))
+        print(f"streaming, {CAP // 2**20} MB cap: {elapsed:.2f} s, {peak / 2**20:.1f} MB traced peak, "
+              f"{len(document.pages)} pages of at most {max(map(len, document.pages))} chars, truncated {document.fetch.truncated}")
+        if not document.fetch.truncated or len(document.fetch.body) != CAP or max(map(len, document.pages)) > client.page_size:
+            failures.append("cap or page size not respected")
+
+        digest, _ = parse_page_token(make_page_token(document.digest, 1))
+        start = time.perf_counter()
+        again = client.document(url, digest=digest)
+        print(f"next page from a token: {(time.perf_counter() - start) * 1000:.2f} ms, same document {again is document}")
+        if again is not document:
+            failures.append("page token did not reuse the converted document")
+
+        reopened = WebClient(cache_path=Path(directory), max_bytes=CAP)
+        start = time.perf_counter()
+        cached = reopened.document(url)
+        print(f"fresh cache hit in a new client: {(time.perf_counter() - start) * 1000:.1f} ms ({cached.fetch.cache}), "
+              f"same markdown {cached.digest == document.digest}")
+        if cached.fetch.cache != "fresh" or cached.digest != document.digest:
+            failures.append("cache hit did not return the same document")
+
+    start = time.perf_counter()
+    uncapped = WebClient(cache_path=None).document(url)
+    print(f"streaming, default cap: {time.perf_counter() - start:.2f} s, {len(uncapped.pages)} pages, truncated {uncapped.fetch.truncated}")
+
+    if not quick:
+        import requests
+        from markdownify import markdownify
+        legacy, elapsed, peak = traced(lambda: markdownify(html=requests.get(url).text))
+        print(f"old requests.get + markdownify: {elapsed:.1f} s, {peak / 2**20:.0f} MB traced peak, {len(legacy)} chars in one reply")
+
+    server.shutdown()
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
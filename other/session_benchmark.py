@@ -0,0 +1,104 @@
+"""
+GenericToolAgent MCP 会话复用前后的单次工具调用延迟对比
+- 服务端：other/stub_mcp_server.py（stdio，工具无副作用，排除工具本身耗时）
+- 之前：每次调用都 `async with client:`（旧 execute_tool 的写法）
+    * keep_alive=False：每次调用都启动新的服务进程并完成 initialize 握手
+    * keep_alive=True（fastmcp 默认）：进程保留，但每次调用仍重新建立会话并重新 initialize
+- 之后：GenericToolAgent 持有一个长连接会话，所有调用复用
+- 另外验证：服务进程崩溃后代理自动重连，下一次调用恢复正常
+- 另外验证：同步工具阻塞服务端期间保活检查不会 ping / 重连，进行中的调用正常返回
+
+用法（在项目根目录执行）：
+    python other/session_benchmark.py
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastmcp import Client  # noqa: E402
+from fastmcp.client.transports import PythonStdioTransport  # noqa: E402
+from src.agent.tool_agent.GenericToolAgent import GenericToolAgent  # noqa: E402
+
+STUB = Path(__file__).resolve().parent / "stub_mcp_server.py"
+CALLS = 20
+ECHO = {"tool_name": "Echo-Tool", "tool_args": {"text": "ping"}}
+
+
+def summary(name: str, samples: list[float]):
+    samples_ms = [sample * 1000 for sample in samples]
+    print(f"{name:<50}median {statistics.median(samples_ms):8.1f} ms   mean {statistics.mean(samples_ms):8.1f} ms   max {max(samples_ms):8.1f} ms")
+
+
+async def per_call_session(keep_alive: bool) -> list[float]:
+    """旧写法：每次工具调用都进入 / 退出一次 client 上下文"""
+    client = Client(PythonStdioTransport(str(STUB), keep_alive=keep_alive))
+    samples = []
+    try:
+        for _ in range(CALLS):
+            start = time.perf_counter()
+            async with client:
+                await client.call_tool(ECHO["tool_name"], ECHO["tool_args"])
+            samples.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+    return samples
+
+
+async def persistent_session() -> tuple[list[float], float]:
+    agent = GenericToolAgent(model=None, tools={}, client=Client(PythonStdioTransport(str(STUB))), debug=False)
+    samples = []
+    start = time.perf_counter()
+    await agent.open()
+    opened = time.perf_counter() - start
+    try:
+        for _ in range(CALLS):
+            start = time.perf_counter()
+            await agent.execute_tool(ECHO)
+            samples.append(time.perf_counter() - start)
+    finally:
+        await agent.close()
+    return samples, opened
+
+
+async def reconnect_check():
+    agent = GenericToolAgent(model=None, tools={}, client=Client(PythonStdioTransport(str(STUB))), debug=False)
+    async with agent:
+        before = (await agent.execute_tool({"tool_name": "Pid-Tool"})).data
+        crashed = await agent.execute_tool({"tool_name": "Crash-Tool"})
+        start = time.perf_counter()
+        after = (await agent.execute_tool({"tool_name": "Pid-Tool"})).data
+        print(f"崩溃后调用返回: {crashed}")
+        print(f"重连: 服务进程 {before} -> {after}，恢复后的首次调用 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+async def blocking_call_check():
+    """保活间隔远小于工具耗时：阻塞 3 秒的调用应正常返回，且服务进程不变（没有被保活检查重连）"""
+    agent = GenericToolAgent(model=None, tools={}, client=Client(PythonStdioTransport(str(STUB))), debug=False,
+                             keepalive_interval=0.5, ping_timeout=0.3)
+    async with agent:
+        before = (await agent.execute_tool({"tool_name": "Pid-Tool"})).data
+        start = time.perf_counter()
+        result = await asyncio.wait_for(agent.execute_tool({"tool_name": "Sleep-Tool", "tool_args": {"seconds": 3}}), timeout=10)
+        elapsed = time.perf_counter() - start
+        after = (await agent.execute_tool({"tool_name": "Pid-Tool"})).data
+        data = getattr(result, "data", result)
+        print(f"阻塞调用: 返回 {data}，耗时 {elapsed:.1f} s，服务进程 {before} -> {after}（{'未重连' if before == after else '被重连'}）")
+
+
+async def main():
+    summary("before: async with per call, keep_alive=False", await per_call_session(keep_alive=False))
+    summary("before: async with per call, keep_alive=True", await per_call_session(keep_alive=True))
+    samples, opened = await persistent_session()
+    summary("after: persistent agent session", samples)
+    print(f"{'after: open() once':<50}{opened * 1000:8.1f} ms")
+    await reconnect_check()
+    await blocking_call_check()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Powershell-Tool 的命令执行（src/desktop/shell.py：ShellPool / ShellSession）行为与耗时检查
+- 在 Windows 上使用 PowerShell 方言，其他平台使用 BASH 方言（同一套会话、哨兵与进程树管理，命令换成 bash 写法）
+- 检查：
+    * 流式输出：每隔 0.3 秒输出一行，回调按到达时间收到各行
+    * 输出上限：约 1.3 MB 的输出在 max_output=200 时只保留开头和结尾，并报告丢弃的字节数
+    * 单行超大输出（30 MB 且没有换行）同样受上限约束，不会整行读进内存
+    * 超时：sleep 10 在 0.5 秒超时后返回状态码 124
+    * 取消：取消正在运行的命令时结束整个进程树（包括后台子进程）
+    * 隔离：cd、变量、环境变量、set -e（$ErrorActionPreference）不会带到下一条命令；
+      exit 与 set -e 只结束当前命令，会话进程保持不变
+- 统计：空命令的往返耗时（复用会话）
+
+用法（在项目根目录执行）：
+    python other/shell_benchmark.py
+"""
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.desktop.shell import BASH, POWERSHELL, ShellPool  # noqa: E402
+
+WINDOWS = sys.platform == "win32"
+REPEAT = 30
+# 各项检查在两种方言下的命令
+COMMANDS = {
+    "lines": ("1..3 | % { $_; Start-Sleep -Milliseconds 300 }", "for i in 1 2 3; do echo $i; sleep 0.3; done"),
+    "many": ("1..200000 | % { $_ }", "seq 1 200000"),
+    "huge line": ("[Console]::Out.Write('a' * 30000000); 'tail'", "head -c 30000000 /dev/zero | tr '\\0' a; echo tail"),
+    "sleep": ("Start-Sleep 10", "sleep 10"),
+    "background": ("Start-Process -NoNewWindow ping '-n 300 127.0.0.1'; Start-Sleep 300", "sleep 302 & sleep 303"),
+    "leak": ("cd $env:TEMP; $x = 1; $env:MCP_Y = 2; $ErrorActionPreference = 'Stop'", "cd /tmp; x=1; export MCP_Y=2; set -e"),
+    "read back": ("\"$(Get-Location)|$x|$env:MCP_Y|$ErrorActionPreference\"", "echo \"$(pwd)|$x|$MCP_Y|$-\""),
+    "fail": ("$ErrorActionPreference = 'Stop'; Write-Error boom; 'unreachable'", "set -e; false; echo unreachable"),
+    "exit": ("exit 7", "exit 7"),
+    "pid": ("$PID", "echo $$"),
+    "noop": ("$null", "true"),
+}
+
+
+def command(name: str) -> str:
+    return COMMANDS[name][0 if WINDOWS else 1]
+
+
+def leftover_processes() -> list[str]:
+    if WINDOWS:
+        output = subprocess.run(["tasklist", "/FI", "IMAGENAME eq PING.EXE"], capture_output=True, text=True).stdout
+        return [line for line in output.splitlines() if line.lower().startswith("ping")]
+    output = subprocess.run(["ps", "-eo", "args"], capture_output=True, text=True).stdout
+    return [line for line in output.splitlines() if line.strip() in ("sleep 302", "sleep 303")]
+
+
+async def main():
+    pool = ShellPool(POWERSHELL if WINDOWS else BASH, size=1, timeout=5, max_output=1000)
+    failures = []
+    try:
+        start = time.perf_counter()
+        arrivals = []
+
+        async def on_output(text: str, total: int):
+            arrivals.append((time.perf_counter() - start, text.strip()))
+
+        await pool.stream(command("lines"), on_output=on_output)
+        print("streamed: " + ", ".join(f"{text!r} at {elapsed:.2f} s" for elapsed, text in arrivals))
+        if len(arrivals) < 3 or arrivals[-1][0] - arrivals[0][0] < 0.5:
+            failures.append("output was not streamed as it arrived")
+
+        result = await pool.stream(command("many"), max_output=200)
+        print(f"capped: {len(result.output)} chars kept, {result.truncated} bytes dropped, "
+              f"head {result.output[:20]!r} tail {result.output[-20:]!r}")
+        if not result.truncated or not result.output.startswith("1") or not result.output.rstrip().endswith("200000"):
+            failures.append("long output not cut to head and tail")
+
+        result = await pool.stream(command("huge line"), max_output=200, timeout=20)
+        print(f"huge line: {len(result.output)} chars kept, {result.truncated} bytes dropped, status {result.status}")
+        if result.truncated < 29_000_000 or not result.output.rstrip().endswith("tail"):
+            failures.append("single huge line not bounded")
+
+        result = await pool.stream(command("sleep"), timeout=0.5)
+        print(f"timeout: status {result.status} after {result.duration:.2f} s")
+        if result.status != 124 or result.duration > 1.5:
+            failures.append("timeout not enforced")
+
+        task = asyncio.create_task(pool.stream(command("background")))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.5)
+        leftover = leftover_processes()
+        print(f"cancelled: {len(leftover)} processes left behind")
+        if leftover:
+            failures.append("cancellation left processes behind")
+
+        session_pid = (await pool.stream(command("pid"))).output.strip()
+        before = (await pool.stream(command("read back"))).output.strip()
+        await pool.stream(command("leak"))
+        carried = (await pool.stream(command("read back"))).output.strip()
+        failed = await pool.stream(command("fail"))
+        exited = await pool.stream(command("exit"))
+        after_pid = (await pool.stream(command("pid"))).output.strip()
+        print(f"isolation: read back {before!r} -> {carried!r}; failing command status {failed.status}; exit status {exited.status}; "
+              f"session pid {session_pid} -> {after_pid}")
+        if carried != before:
+            failures.append("state carried over to the next command")
+        if "unreachable" in failed.output or failed.status == 0 or exited.status != 7 or session_pid != after_pid:
+            failures.append("a failing or exiting command took the session down")
+
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            await pool.stream(command("noop"))
+        print(f"round trip: {(time.perf_counter() - start) / REPEAT * 1000:.1f} ms per command")
+    finally:
+        pool.close()
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""
+Desktop.get_state 中顶层窗口枚举次数统计（计数用的假 uiautomation 后端，不需要 Windows）
+- 假后端：每次读取属性（Name、ClassName、BoundingRectangle 等）、列子元素、窗口状态查询都计数
+- 窗口：1 个有 40 个子元素的任务栏、15 个各有 200 个子元素的应用窗口、25 个没有子元素的覆盖层窗口
+- 按 get_state 的顺序执行窗口枚举、树遍历与应用列表（不截图；应用内部的遍历 get_nodes 置空，
+  与窗口枚举无关），统计后端调用次数
+- 进程信息查询与等待（settle）都被替换掉，只统计 UI Automation 调用
+
+用法（在项目根目录执行）：
+    python other/snapshot_benchmark.py
+对比改动前的代码：先 `git worktree add /tmp/before <提交>^`，再
+    python other/snapshot_benchmark.py --root /tmp/before
+"""
+import argparse
+import sys
+import time
+import types
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WINDOW_CONTROL = 50032
+PANE_CONTROL = 50033
+
+counts: Counter = Counter()
+
+
+class Rect:
+    def __init__(self, width: int, height: int):
+        self.left, self.top, self.right, self.bottom = 0, 0, width, height
+
+    def isempty(self) -> bool:
+        return self.right * self.bottom == 0
+
+    def width(self) -> int:
+        return self.right
+
+    def height(self) -> int:
+        return self.bottom
+
+
+class Control:
+    """只实现窗口枚举会用到的属性和方法，每次访问计数"""
+
+    def __init__(self, name: str, children: int = 0, class_name: str = "Window"):
+        self._name = name
+        self._class_name = class_name
+        self._children = children
+
+    def __getattr__(self, name):
+        raise AttributeError(name)
+
+    @property
+    def Name(self):
+        counts["Name"] += 1
+        return self._name
+
+    @property
+    def ClassName(self):
+        counts["ClassName"] += 1
+        return self._class_name
+
+    @property
+    def ControlType(self):
+        counts["ControlType"] += 1
+        return WINDOW_CONTROL
+
+    @property
+    def ProcessId(self):
+        counts["ProcessId"] += 1
+        return 1
+
+    @property
+    def NativeWindowHandle(self):
+        counts["NativeWindowHandle"] += 1
+        return id(self)
+
+    @property
+    def BoundingRectangle(self):
+        counts["BoundingRectangle"] += 1
+        return Rect(800, 600)
+
+    def GetChildren(self):
+        counts["GetChildren"] += 1
+        counts["child proxies"] += self._children
+        return [Control(f"Child {index}") for index in range(self._children)]
+
+    def GetFirstChildControl(self):
+        counts["GetFirstChildControl"] += 1
+        return Control("Child 0") if self._children else None
+
+
+class Root(Control):
+    def __init__(self, windows: list):
+        super().__init__("Desktop")
+        self.windows = windows
+
+    def GetChildren(self):
+        counts["GetChildren(root)"] += 1
+        return self.windows
+
+
+def fake_uiautomation(root: Root) -> types.ModuleType:
+    module = types.ModuleType("uiautomation")
+
+    def counted(name: str, value):
+        def call(*args, **kwargs):
+            counts[name] += 1
+            return value
+        return call
+
+    module.GetRootControl = lambda: root
+    module.IsIconic = counted("IsIconic", False)
+    module.IsZoomed = counted("IsZoomed", False)
+    module.IsWindowVisible = counted("IsWindowVisible", True)
+    for name in ("GetFocusedControl", "GetForegroundControl", "SetWindowTopmost", "IsTopLevelWindow", "ControlFromHandle"):
+        setattr(module, name, lambda *args, **kwargs: None)
+    module.Control = Control
+    module.ImageControl = type("ImageControl", (Control,), {})
+    module.ScrollPattern = object
+    module.PatternId = types.SimpleNamespace()
+    module.ControlType = types.SimpleNamespace(WindowControl=WINDOW_CONTROL, PaneControl=PANE_CONTROL)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", type=Path, default=ROOT, help="要测量的项目根目录（默认当前仓库）")
+    root_dir = parser.parse_args().root.resolve()
+
+    windows = [Control("Taskbar", 40, "Shell_TrayWnd")]
+    windows += [Control(f"App {index}", 200) for index in range(15)]
+    windows += [Control(f"Overlay {index}", 0) for index in range(25)]
+    sys.modules["uiautomation"] = fake_uiautomation(Root(windows))
+    sys.path.insert(0, str(root_dir))
+
+    import src.desktop as desktop_module
+    import src.tree as tree_module
+    desktop_module.sleep = tree_module.sleep = lambda seconds: None
+    tree_module.Tree.get_nodes = lambda self, node, is_browser=False: ([], [], [])
+    desktop = desktop_module.Desktop.__new__(desktop_module.Desktop)
+    desktop.get_process_info = lambda pid: None
+    tree = tree_module.Tree(desktop)
+
+    start = time.perf_counter()
+    # 与 get_state 相同的顺序；没有 get_windows 的旧代码由两边各自枚举
+    if hasattr(desktop, "get_windows"):
+        snapshot = desktop.get_windows()
+        tree.get_state(windows=snapshot)
+        apps = desktop.get_apps(windows=snapshot)
+    else:
+        tree.get_state()
+        apps = desktop.get_apps()
+    elapsed = time.perf_counter() - start
+
+    print(f"root: {root_dir}")
+    print(f"windows: {len(windows)}   apps listed: {len(apps)}   {elapsed * 1000:.1f} ms with the fake backend")
+    for name, count in sorted(counts.items()):
+        print(f"{name:<24}{count:>8}")
+    # 每个子元素代理都是一次跨进程的 COM 调用，计入总数
+    print(f"{'total backend calls':<24}{sum(counts.values()):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Launch-Tool 的开始菜单查找（src/desktop/start_menu.py：StartMenuIndex）耗时
+- 数据源：固定的 `Get-StartApps | ConvertTo-Csv` 输出（300 个应用，含重音字符的名称），
+  每次调用等待 200 ms 模拟启动 PowerShell 的开销，不需要 Windows
+- 旧做法：每次启动应用都调用数据源并解析 CSV
+- 新做法：
+    * 后台线程建立索引后的查找（warm lookup，取 200 次的中位数）
+    * 新实例从缓存文件冷启动后的第一次查找
+    * 查找不到且索引已过期时刷新一次后重试，能找到新安装的应用
+- 统计数据源调用次数
+
+用法（在项目根目录执行）：
+    python other/start_menu_benchmark.py
+"""
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.desktop.start_menu import StartMenuIndex, parse_start_apps  # noqa: E402
+
+PROVIDER_DELAY = 0.2
+REPEAT = 200
+QUERIES = ["notepad", "google chrome", "cafe unicode", "visual studio code"]
+
+
+class CannedProvider:
+    """返回固定 CSV 的数据源，记录调用次数"""
+
+    def __init__(self):
+        rows = [("Notepad", "Microsoft.WindowsNotepad_8wekyb3d8bbwe!App"), ("Google Chrome", "Chrome"),
+                ("Café Ünicode", "Cafe!App"), ("Visual Studio Code", "Microsoft.VisualStudioCode")]
+        rows += [(f"Tool {index} Utility", f"Vendor.Tool{index}!App") for index in range(296)]
+        self.csv = '"Name","AppID"\r\n' + "".join(f'"{name}","{app_id}"\r\n' for name, app_id in rows)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        time.sleep(PROVIDER_DELAY)
+        return self.csv
+
+
+def legacy_lookup(provider: CannedProvider, name: str):
+    """改动前的 launch_app：每次都启动 PowerShell 取完整列表"""
+    apps = parse_start_apps(provider())
+    return name.lower() in apps
+
+
+def main():
+    failures = []
+    provider = CannedProvider()
+    start = time.perf_counter()
+    for query in QUERIES:
+        legacy_lookup(provider, query)
+    print(f"old: {(time.perf_counter() - start) / len(QUERIES) * 1000:.0f} ms per launch ({provider.calls} provider calls)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = Path(directory) / "start_menu.json"
+        provider.calls = 0
+        index = StartMenuIndex(provider, cache_path=cache_path, refresh_interval=60)
+        index.start()
+        index.loaded.wait()
+        samples = []
+        for _ in range(REPEAT // len(QUERIES)):
+            for query in QUERIES:
+                start = time.perf_counter()
+                matched = index.lookup(query)
+                samples.append(time.perf_counter() - start)
+                if matched is None:
+                    failures.append(f"{query!r} not found")
+        index.stop()
+        print(f"warm lookup: {statistics.median(samples) * 1e6:.0f} us median ({provider.calls} provider calls for {len(samples)} lookups)")
+
+        calls = provider.calls
+        reopened = StartMenuIndex(provider, cache_path=cache_path)
+        start = time.perf_counter()
+        matched = reopened.lookup("chrome")
+        print(f"cold start from the cache file: {(time.perf_counter() - start) * 1000:.1f} ms -> {matched}, "
+              f"{provider.calls - calls} provider calls")
+        if matched is None or provider.calls != calls:
+            failures.append("cold start did not come from the cache file")
+
+        provider.csv += '"Paint","Microsoft.Paint!App"\r\n'
+        reopened.updated = 0.0
+        matched = reopened.lookup("paint")
+        print(f"miss on an old index: {matched}, {provider.calls - calls} provider call")
+        if matched is None:
+            failures.append("newly installed app not found after the refresh")
+
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
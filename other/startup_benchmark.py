@@ -0,0 +1,89 @@
+"""
+MCP 服务启动耗时分析
+- 导入耗时：每个模块在独立的新进程中用 `python -X importtime` 统计（冷启动，互不影响）
+- 初始化耗时：按 server.py 的顺序逐步计时（Desktop 构建、后台检测、工具注册），
+  并单独统计后台任务（语言 / 默认浏览器检测）真正完成所需时间
+
+用法（在项目根目录执行）：
+    python other/startup_benchmark.py
+"""
+import importlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "fastmcp",
+    "uiautomation",
+    "pyautogui",
+    "requests",
+    "markdownify",
+    "fuzzywuzzy",
+    "numpy",
+    "PIL.Image",
+    "psutil",
+    "src.desktop",
+    "src.agent.tools",
+    "server",
+]
+
+
+def import_time(module: str) -> float | None:
+    """在新进程中导入模块，返回累计导入耗时（秒），导入失败返回 None"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    # importtime 输出格式: "import time: self [us] | cumulative | imported package"
+    for line in reversed(result.stderr.splitlines()):
+        parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    return None
+
+
+def init_steps():
+    """按 server.py 的初始化顺序逐步计时"""
+    sys.path.insert(0, str(ROOT))
+    steps = []
+
+    def step(name, func):
+        start = time.perf_counter()
+        value = func()
+        steps.append((name, time.perf_counter() - start))
+        return value
+
+    from fastmcp import FastMCP
+    Desktop = step("import src.desktop", lambda: importlib.import_module("src.desktop").Desktop)
+    register_all_tools = step("import src.agent.tools", lambda: importlib.import_module("src.agent.tools").register_all_tools)
+    desktop = step("Desktop()", Desktop)
+    step("start_background_init()", desktop.start_background_init)
+    mcp = step("FastMCP()", lambda: FastMCP(name="windows-mcp"))
+    step("register_all_tools()", lambda: register_all_tools(mcp, desktop))
+    ready = sum(duration for _, duration in steps)
+    # 后台任务：首次真正需要结果时才会等待
+    start = time.perf_counter()
+    language = desktop.default_language
+    browser = desktop.default_browser
+    background = time.perf_counter() - start
+    desktop.shell.close()
+    return steps, ready, background, language, browser
+
+
+if __name__ == "__main__":
+    print("== Import time (fresh process per module) ==")
+    for module in MODULES:
+        duration = import_time(module)
+        print(f"{module:<20} {'failed' if duration is None else f'{duration * 1000:8.1f} ms'}")
+
+    print("\n== Initialization ==")
+    steps, ready, background, language, browser = init_steps()
+    for name, duration in steps:
+        print(f"{name:<28} {duration * 1000:8.1f} ms")
+    print(f"{'ready for handshake':<28} {ready * 1000:8.1f} ms")
+    print(f"{'background detection wait':<28} {background * 1000:8.1f} ms  (language={language!r}, browser={browser!r})")
@@ -0,0 +1,100 @@
+"""
+State-Tool 返回截图的两种方式：传输负载大小与调用耗时（进程内 FastMCP Client，不需要 Windows）
+- 新做法：注册真实的 State-Tool（register_system_tools），返回 [文本, Image(png)]，
+  PNG 字节作为 MCP 图片内容块由传输层编码一次，不生成 structuredContent
+- 旧做法：返回 {"text": ..., "screenshot": base64}（改动前的实现），base64 字符串同时出现在
+  文本内容块与 structuredContent 中
+- 桌面：假的 Desktop，get_state 返回固定的元素列表文本（约 20 KB）和一张 960x540 的噪声 PNG
+  （约 1.5 MB，接近 0.5 倍缩放的带标注截图且几乎不可压缩）
+- 统计：响应序列化为 JSON 后的字节数（content + structuredContent）、每次调用耗时的中位数（20 次）
+
+用法（在项目根目录执行）：
+    python other/state_payload_benchmark.py
+"""
+import asyncio
+import base64
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image as PILImage
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastmcp import Client, FastMCP  # noqa: E402
+from src.agent.tools.windows.system_tools import register_system_tools  # noqa: E402
+
+REPEAT = 20
+ELEMENTS = "\n".join(f"{index}|Button|Item {index}|({index % 1900},{index % 1000})" for index in range(800))
+
+
+def noise_png() -> bytes:
+    pixels = np.random.default_rng(0).integers(0, 256, (540, 960, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    PILImage.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakeDesktop:
+    default_language = "English (United States)"
+
+    def __init__(self, screenshot: bytes):
+        self.screenshot = screenshot
+
+    def get_state(self, use_vision: bool = False):
+        tree_state = SimpleNamespace(interactive_elements_to_string=lambda: ELEMENTS,
+                                     informative_elements_to_string=lambda: "",
+                                     scrollable_elements_to_string=lambda: "")
+        return SimpleNamespace(tree_state=tree_state, apps_to_string=lambda: "Notepad", active_app_to_string=lambda: "Notepad",
+                               screenshot=self.screenshot if use_vision else None)
+
+
+def legacy_server(desktop: FakeDesktop) -> FastMCP:
+    """改动前的 State-Tool：截图以 base64 放进返回的 dict"""
+    mcp = FastMCP("legacy")
+
+    @mcp.tool(name="State-Tool")
+    def state_tool(use_vision: bool = False) -> dict:
+        desktop_state = desktop.get_state(use_vision=use_vision)
+        result = {"text": desktop_state.tree_state.interactive_elements_to_string()}
+        if use_vision:
+            result["screenshot"] = base64.b64encode(desktop_state.screenshot).decode("utf-8")
+        return result
+
+    return mcp
+
+
+def current_server(desktop: FakeDesktop) -> FastMCP:
+    mcp = FastMCP("current")
+    register_system_tools(mcp, desktop)
+    return mcp
+
+
+async def measure(mcp: FastMCP) -> tuple[int, float, list[str]]:
+    async with Client(mcp) as client:
+        samples = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            result = await client.call_tool("State-Tool", {"use_vision": True})
+            samples.append(time.perf_counter() - start)
+    payload = json.dumps({"content": [block.model_dump(mode="json") for block in result.content],
+                          "structuredContent": result.structured_content})
+    return len(payload), statistics.median(samples), [block.type for block in result.content]
+
+
+async def main():
+    desktop = FakeDesktop(noise_png())
+    print(f"screenshot: {len(desktop.screenshot) / 1e6:.2f} MB PNG   element text: {len(ELEMENTS) / 1e3:.0f} KB")
+    for name, mcp in (("before (dict + base64)", legacy_server(desktop)), ("after (image content block)", current_server(desktop))):
+        size, median, blocks = await measure(mcp)
+        print(f"{name:<30}payload {size / 1e6:6.2f} MB   median {median * 1000:6.1f} ms   content {blocks}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
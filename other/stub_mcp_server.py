@@ -0,0 +1,34 @@
+"""
+轻量 MCP 桩服务（供 other/session_benchmark.py 使用）：只注册几个无副作用的工具，
+启动时不加载 Desktop / uiautomation，用来单独测量 MCP 会话本身的开销。
+"""
+import os
+import time
+from fastmcp import FastMCP
+
+mcp = FastMCP(name="stub-mcp")
+
+
+@mcp.tool(name="Echo-Tool", description="Return the given text.")
+def echo_tool(text: str) -> str:
+    return text
+
+
+@mcp.tool(name="Pid-Tool", description="Return the process id of the server.")
+def pid_tool() -> int:
+    return os.getpid()
+
+
+@mcp.tool(name="Sleep-Tool", description="Block the server for the given number of seconds (like a sync desktop tool).")
+def sleep_tool(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@mcp.tool(name="Crash-Tool", description="Terminate the server process (simulates a crashed server).")
+def crash_tool() -> str:
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    mcp.run(show_banner=False)
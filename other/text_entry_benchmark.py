@@ -0,0 +1,80 @@
+"""
+Type-Tool 文本输入策略（src/desktop/text_entry.py）的选择与模拟耗时
+- 后端：记录调用的假 InputBackend，不产生真实按键；耗时按模型累加，不受本机速度影响
+    * 逐键输入：每个字符 key_interval 秒（与 pg.typewrite(interval=...) 相同）
+    * Unicode SendInput：每个字符 0.2 ms
+    * 快捷键（Ctrl+V）：10 ms；等待（剪贴板恢复前的延迟）按实际秒数计
+- 文本：短 ASCII、2 KB ASCII（auto 与强制逐键各一次）、带重音字母、敏感短文本与敏感中文
+- 检查：auto 选出的策略、模拟耗时、后端调用序列，粘贴后剪贴板是否恢复为原内容，
+  敏感文本不经过剪贴板
+
+用法（在项目根目录执行）：
+    python other/text_entry_benchmark.py
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.desktop.text_entry import InputBackend, TextEntry  # noqa: E402
+
+UNICODE_COST = 0.0002
+HOTKEY_COST = 0.01
+CASES = [
+    ("hello", {}),
+    ("x" * 2048, {}),
+    ("héllo wörld", {}),
+    ("p@ss", {"sensitive": True}),
+    ("密码" * 150, {"sensitive": True}),
+    ("a" * 2048, {"strategy": "keys"}),
+]
+
+
+class RecordingBackend(InputBackend):
+    """记录每次调用，并按上面的代价模型累计耗时"""
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+        self.clipboard = "previous clipboard"
+        self.elapsed = 0.0
+
+    def type_keys(self, text: str, interval: float):
+        self.calls.append(("type_keys", len(text)))
+        self.elapsed += len(text) * interval
+
+    def send_unicode(self, text: str):
+        self.calls.append(("send_unicode", len(text)))
+        self.elapsed += len(text) * UNICODE_COST
+
+    def hotkey(self, *keys: str):
+        self.calls.append(("hotkey", "+".join(keys)))
+        self.elapsed += HOTKEY_COST
+
+    def get_clipboard(self) -> Optional[str]:
+        self.calls.append(("get_clipboard",))
+        return self.clipboard
+
+    def set_clipboard(self, text: str):
+        self.calls.append(("set_clipboard", len(text)))
+        self.clipboard = text
+
+    def sleep(self, seconds: float):
+        self.elapsed += seconds
+
+
+def main():
+    backend = RecordingBackend()
+    entry = TextEntry(backend)
+    for text, options in CASES:
+        backend.calls, backend.elapsed = [], 0.0
+        result = entry.enter(text, **options)
+        touched_clipboard = any(call[0] == "set_clipboard" for call in backend.calls)
+        print(f"{len(text):>5} chars {str(options or 'auto'):<22} -> {result.strategy:<8} modelled {backend.elapsed:8.2f} s   "
+              f"clipboard {'used' if touched_clipboard else 'untouched'}   calls {backend.calls[:4]}")
+    print(f"clipboard after all entries: {backend.clipboard!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Scrape-Tool 的连接复用与 HTTP 缓存（src/web：WebClient + HttpCache）效果与耗时
+- 服务端：本机回环上的 ThreadingHTTPServer，返回约 100 KB 的 HTML 页面，按路径给出不同的缓存头
+    * /max-age：Cache-Control: max-age=60（新鲜期内不发请求）
+    * /etag：ETag + Cache-Control: no-cache（每次都重新验证，If-None-Match 命中返回 304）
+    * /last-modified：只有 Last-Modified（刚修改过，启发式新鲜期接近 0，If-Modified-Since 命中返回 304；
+      按 RFC 9111 的启发式，之后的抓取也可能直接命中新鲜缓存）
+    * /no-store：Cache-Control: no-store（从不缓存）
+- 每个 URL 抓取三次（WebClient.markdown），记录每次耗时与缓存结果；
+  旧做法为每次 requests.get + markdownify，同样抓取三次
+- 检查：
+    * 304 复用缓存的正文与 Markdown，全部请求共用一条 TCP 连接
+    * 可缓存的条目被不可缓存的 200 响应替换后从缓存中删除
+    * LRU 上限：总大小不超过 cache_max_bytes，最久未用的条目先被淘汰
+    * 用同一目录重新创建 WebClient 后条目仍然新鲜
+
+用法（在项目根目录执行）：
+    python other/web_cache_benchmark.py
+"""
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.web import WebClient  # noqa: E402
+
+ROW = '<div class="post"><h2>Item {index}</h2><p>Some <b>bold</b> text and <a href="/p/{index}">a link</a> with café.</p></div>'
+PAGE = ("<html><head><meta charset='utf-8'><title>Cache test</title></head><body>"
+        + "".join(ROW.format(index=index) for index in range(900)) + "</body></html>").encode("utf-8")
+ETAG = '"v1"'
+LAST_MODIFIED = formatdate(time.time(), usegmt=True)
+REPEAT = 3
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = 0
+    connections: set = set()
+    # 路径 -> 覆盖默认缓存头的响应头（用于替换已缓存的条目）
+    overrides: dict = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        Handler.requests += 1
+        Handler.connections.add(self.client_address)
+        path = self.path.split("?")[0]
+        headers = Handler.overrides.get(self.path) or self.cache_headers(path)
+        if ("ETag" in headers and self.headers.get("If-None-Match") == headers["ETag"]) or \
+                ("Last-Modified" in headers and self.headers.get("If-Modified-Since") == headers["Last-Modified"]):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    @staticmethod
+    def cache_headers(path: str) -> dict:
+        return {
+            "/max-age": {"Cache-Control": "max-age=60"},
+            "/etag": {"ETag": ETAG, "Cache-Control": "no-cache"},
+            "/last-modified": {"Last-Modified": LAST_MODIFIED},
+            "/no-store": {"Cache-Control": "no-store"},
+        }.get(path, {"Cache-Control": "max-age=60"})
+
+
+def scrape(client: WebClient, url: str) -> tuple[float, str, str]:
+    start = time.perf_counter()
+    result, markdown = client.markdown(url)
+    return time.perf_counter() - start, result.cache, markdown
+
+
+def legacy_scrape(url: str) -> float:
+    """改动前 Scrape-Tool 的做法：每次新建连接下载并完整转换"""
+    import requests
+    from markdownify import markdownify
+    start = time.perf_counter()
+    markdownify(html=requests.get(url).text)
+    return time.perf_counter() - start
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    failures = []
+    print(f"page: {len(PAGE) / 1024:.0f} KB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = WebClient(cache_path=Path(directory) / "cache")
+        for path in ("/max-age", "/etag", "/last-modified", "/no-store"):
+            runs = [scrape(client, base + path) for _ in range(REPEAT)]
+            print(f"{path:<16}" + "   ".join(f"{elapsed * 1000:7.1f} ms {cache:<11}" for elapsed, cache, _ in runs))
+            if any(markdown != runs[0][2] for _, _, markdown in runs):
+                failures.append(f"{path}: markdown differs between scrapes")
+            expected = {"/max-age": {"fresh"}, "/etag": {"revalidated"}, "/last-modified": {"revalidated", "fresh"}, "/no-store": {"miss"}}[path]
+            if any(cache not in expected for _, cache, _ in runs[1:]) or (path == "/last-modified" and runs[1][1] != "revalidated"):
+                failures.append(f"{path}: expected {' or '.join(sorted(expected))} after the first scrape")
+        print(f"requests: {Handler.requests}   TCP connections: {len(Handler.connections)}")
+        if len(Handler.connections) != 1:
+            failures.append("requests did not share one connection")
+
+        legacy = [legacy_scrape(base + "/max-age") for _ in range(REPEAT)]
+        print(f"old requests.get + markdownify: {sum(legacy) * 1000:.0f} ms for {REPEAT} scrapes")
+
+        # 已缓存的 URL 改为返回 no-store：旧条目必须被删除，而不是继续当作新鲜内容返回
+        url = base + "/max-age?replaced"
+        scrape(client, url)
+        Handler.overrides["/max-age?replaced"] = {"Cache-Control": "no-store"}
+        client.cache.entries[client.cache.get(url)[0]].expires = 0.0
+        scrape(client, url)
+        key, entry = client.cache.get(url)
+        print(f"cached entry after an uncacheable 200: {'kept' if entry else 'removed'}")
+        if entry is not None or (Path(directory) / "cache" / f"{key}.body").exists():
+            failures.append("uncacheable 200 left the old entry in the cache")
+
+        # LRU：上限约为两个条目（正文 + Markdown），依次抓取五个 URL
+        limit = 2 * len(PAGE) + 2 * len(scrape(client, base + "/max-age")[2].encode("utf-8")) + 1024
+        small = WebClient(cache_path=Path(directory) / "small", cache_max_bytes=limit)
+        urls = [f"{base}/max-age?page={index}" for index in range(5)]
+        for url in urls:
+            scrape(small, url)
+        kept = [url[-1] for url in urls if small.cache.get(url)[1] is not None]
+        print(f"LRU: {small.cache.total} of {limit} bytes, pages kept {kept}")
+        if small.cache.total > limit or kept != ["3", "4"]:
+            failures.append("LRU bound not respected")
+        reopened = WebClient(cache_path=Path(directory) / "small", cache_max_bytes=limit)
+        _, cache, _ = scrape(reopened, urls[-1])
+        print(f"after reopening the cache directory: {cache}")
+        if cache != "fresh":
+            failures.append("entry not fresh after reopening the cache")
+
+    server.shutdown()
+    print("checks: " + ("all passed" if not failures else "; ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
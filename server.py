@@ -2,21 +2,20 @@ from fastmcp import FastMCP
 from contextlib import asynccontextmanager
 from platform import system, release
 from textwrap import dedent
-import asyncio
 import ctypes
-from live_inspect.watch_cursor import WatchCursor
-from humancursor import SystemCursor
 
 from src.agent.tools import register_all_tools
 from src.desktop import Desktop
+from src.desktop.capture import CaptureService
+from src.desktop.config import FRAME_CAPTURE_ENABLED, FRAME_CAPTURE_FPS, FRAME_CAPTURE_CAPACITY
 
 # ============ 初始化 ============ #
 os = system()
 version = release()
-desktop = Desktop()
-default_language = desktop.get_default_language()
-cursor = SystemCursor()
-watch_cursor = WatchCursor()
+capture = CaptureService(fps=FRAME_CAPTURE_FPS, capacity=FRAME_CAPTURE_CAPACITY) if FRAME_CAPTURE_ENABLED else None
+desktop = Desktop(capture=capture)
+# 语言与默认浏览器检测在后台并发执行，首次使用时才等待结果
+desktop.start_background_init()
 ctypes.windll.user32.SetProcessDPIAware()
 
 instructions = dedent(f"""
@@ -27,18 +26,27 @@ thus enabling to operate the desktop on the user's behalf.
 # 生命周期管理
 @asynccontextmanager
 async def lifespan(app: FastMCP):
+    from live_inspect.watch_cursor import WatchCursor
+    watch_cursor = WatchCursor()
     try:
         watch_cursor.start()
-        await asyncio.sleep(1)
+        desktop.start_menu.start()
+        if capture is not None:
+            capture.start()
         yield
     finally:
+        if capture is not None:
+            capture.stop()
+        desktop.start_menu.stop()
+        desktop.shell.close()
+        desktop.pacing.save()
         watch_cursor.stop()
 
 # 创建 MCP 实例
 mcp = FastMCP(name="windows-mcp", instructions=instructions, lifespan=lifespan)
 
 # 注册所有工具
-register_all_tools(mcp, desktop, default_language)
+register_all_tools(mcp, desktop)
 
 # 启动
 if __name__ == "__main__":
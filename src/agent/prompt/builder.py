@@ -0,0 +1,126 @@
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict
+
+ToolRenderer = Callable[[str, Dict[str, Any]], str]
+
+# 静态前缀：说明 + 工具列表 + few-shot 示例；{tools} 之外的内容对所有工具集都相同
+ACTION_PREFIX = """你是智能助理，根据用户指令判断是否需要调用工具。
+如果需要调用工具，请严格输出 JSON:
+{{
+    "tool_name": "工具名称",
+    "tool_args": {{}}
+}}
+如果不需要调用工具，直接输出答案:
+{{
+    "tool_name": null,
+    "tool_args": {{}},
+    "answer":    答案
+}}
+
+可用工具列表：
+{tools}
+
+示例：
+用户输入: 打开百度首页
+输出:
+{{"tool_name": "open_browser", "tool_args": {{"url": "https://www.baidu.com"}}}}
+
+用户输入: 搜索天气
+输出:
+{{"tool_name": "search_google", "tool_args": {{"query": "北京天气"}}}}
+
+"""
+
+# 动态后缀：每次调用只追加这一段
+ACTION_SUFFIX = "用户输入: {user_input}\n"
+
+
+def render_tool(name: str, info: Dict[str, Any]) -> str:
+    """工具描述（desc + 参数 JSON），参数按键排序，保证同一工具每次渲染结果相同"""
+    params = json.dumps(info.get("params", {}), ensure_ascii=False, sort_keys=True)
+    return f"{name}: {{\n  desc: '{info.get('desc', '')}',\n  params: {params}\n}}"
+
+
+def tools_key(tools: Dict[str, Dict[str, Any]]) -> str:
+    """
+    工具集指纹：只取名称、描述、参数（忽略 func 等不可序列化字段），规范化 JSON 后取 sha256。
+    内容相同的工具集（无论 dict 插入顺序）得到相同的指纹。
+    """
+    canonical = json.dumps(
+        {name: {"desc": info.get("desc", ""), "params": info.get("params", {})} for name, info in tools.items()},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PromptBuilder:
+    """
+    预编译的 action prompt：静态前缀按工具集渲染一次并缓存，每次调用只拼接用户输入后缀。
+
+    前缀对同一工具集逐字节相同（工具按名称排序、参数按键排序、模板无多余缩进），
+    Ollama / API 后端的 KV（prefix）缓存因此可以命中，只需计算用户输入部分。
+
+    缓存按工具集内容的指纹（tools_key）区分；最近用过的 tools 字典（例如 ToolRetriever 按查询选出的
+    各个子集）再次传入时，只比较各条目对象的身份即可复用，不必重新序列化。因此修改工具时请替换条目
+    （tools[name] = {...}），不要原地修改已有条目里的 desc / params。
+
+    Args:
+        renderer: 单个工具的渲染函数，默认 render_tool
+        legend: 放在工具列表前的说明（例如紧凑签名的写法）
+        max_entries: 缓存的工具集个数上限（LRU，前缀和按身份复用的 tools 字典各保留这么多）
+    """
+
+    def __init__(self, renderer: ToolRenderer = render_tool, legend: str = "", max_entries: int = 8):
+        self.renderer = renderer
+        self.legend = legend
+        self.max_entries = max_entries
+        self.lock = Lock()
+        self.prefixes: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # id(tools) -> (tools 字典, 条目对象列表, 前缀)；保留对象引用，身份比较不会因 id 复用而误判
+        self.recent: OrderedDict[int, tuple[Dict[str, Dict[str, Any]], list, str]] = OrderedDict()
+
+    @staticmethod
+    def entries(tools: Dict[str, Dict[str, Any]]) -> list:
+        return [item for name, info in tools.items() for item in (name, info, info.get("desc"), info.get("params"))]
+
+    def prefix(self, tools: Dict[str, Dict[str, Any]]) -> str:
+        entries = self.entries(tools)
+        with self.lock:
+            recent = self.recent.get(id(tools))
+            if recent is not None and recent[0] is tools and len(recent[1]) == len(entries) and all(a is b for a, b in zip(recent[1], entries)):
+                self.recent.move_to_end(id(tools))
+                self.hits += 1
+                return recent[2]
+        prefix = self.lookup(tools)
+        with self.lock:
+            self.recent[id(tools)] = (tools, entries, prefix)
+            self.recent.move_to_end(id(tools))
+            while len(self.recent) > self.max_entries:
+                self.recent.popitem(last=False)
+        return prefix
+
+    def lookup(self, tools: Dict[str, Dict[str, Any]]) -> str:
+        key = tools_key(tools)
+        with self.lock:
+            prefix = self.prefixes.get(key)
+            if prefix is not None:
+                self.prefixes.move_to_end(key)
+                self.hits += 1
+                return prefix
+        lines = [self.legend] if self.legend else []
+        tool_descriptions = "\n".join(lines + [self.renderer(name, tools[name]) for name in sorted(tools)])
+        prefix = ACTION_PREFIX.format(tools=tool_descriptions)
+        with self.lock:
+            self.misses += 1
+            self.prefixes[key] = prefix
+            while len(self.prefixes) > self.max_entries:
+                self.prefixes.popitem(last=False)
+        return prefix
+
+    def build(self, tools: Dict[str, Dict[str, Any]], user_input: str) -> str:
+        return self.prefix(tools) + ACTION_SUFFIX.format(user_input=user_input)
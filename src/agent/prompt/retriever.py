@@ -0,0 +1,151 @@
+import heapq
+import math
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 英文词 / 数字，驼峰与 snake_case 在正则之前拆开；中日韩文字单独处理（单字 + 相邻两字）
+WORD = re.compile(r"[a-z]+|[0-9]+|[぀-ヿ㐀-䶿一-鿿가-힯]+")
+CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+CJK = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+STOPWORDS = frozenset("a an and are as at be by e eg etc for from g i if in into is it its of on or the this to use used with".split())
+
+# 字段权重：名称 > 参数名 > 描述（相当于把词频按字段加倍，BM25F 的简化）
+NAME_WEIGHT = 3
+PARAM_WEIGHT = 2
+DESC_WEIGHT = 1
+
+
+def stem(word: str) -> str:
+    """极简词干：去掉常见英文词尾（clicks / clicking / clicked -> click），索引和查询用同一规则即可"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    切词：英文按词（拆开驼峰、连字符、下划线）并取词干，去掉停用词；
+    中日韩文字没有空格，取单字和相邻两字，使中文描述也能按词命中
+    """
+    tokens = []
+    for word in WORD.findall(CAMEL.sub(" ", text or "").lower()):
+        if CJK.match(word):
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif word not in STOPWORDS:
+            tokens.append(stem(word))
+    return tokens
+
+
+def param_names(params: Any) -> List[str]:
+    """工具参数名：inputSchema 的 properties，或简单工具字典里的参数名列表"""
+    if isinstance(params, dict):
+        return list(params.get("properties", {}))
+    if isinstance(params, (list, tuple)):
+        return [name for name in params if isinstance(name, str)]
+    return []
+
+
+class ToolRetriever:
+    """
+    按用户输入挑选相关工具的词法检索（BM25，内存倒排索引，不依赖向量 / 网络服务）。
+
+    索引工具名称、描述和参数名，每个词在各工具上的 BM25 分数建索引时就算好，
+    查询只需把命中词的倒排表相加再取前 k 个，500 个工具时单次查询在几十微秒以内。
+
+    - pinned 中的核心工具（如 State-Tool）总是返回，不占 top-k 名额
+    - 只返回得分大于 0 的工具，命中的少于 k 个就少返回
+    - 一个词都没命中时（例如中文指令对英文描述）词法检索无从判断，返回全部工具
+    - 工具数不超过 k + 固定工具数时不做筛选，直接返回全部工具
+
+    select 对同一组结果返回同一个字典对象，PromptBuilder 可以直接按身份复用已渲染的前缀。
+    索引基于创建时的工具集，工具变化后请重新创建。
+
+    Args:
+        tools: 工具字典 {name: {"desc": ..., "params": ...}}
+        k: 每次最多选出的工具数（不含固定工具）
+        pinned: 总是包含的工具名（工具集中不存在的会被忽略）
+        k1, b: BM25 参数
+        max_selections: 缓存的结果子集个数上限（LRU）
+    """
+
+    def __init__(
+        self,
+        tools: Dict[str, Dict[str, Any]],
+        k: int = 8,
+        pinned: Iterable[str] = ("State-Tool",),
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_selections: int = 64
+    ):
+        self.tools = tools
+        self.k = k
+        self.pinned = [name for name in pinned if name in tools]
+        self.k1 = k1
+        self.b = b
+        self.max_selections = max_selections
+        self.names = list(tools)
+        self.postings: Dict[str, List[Tuple[int, float]]] = self.index()
+        self.selections: OrderedDict[Tuple[str, ...], Dict[str, Dict[str, Any]]] = OrderedDict()
+
+    def index(self) -> Dict[str, List[Tuple[int, float]]]:
+        """倒排索引：词 -> [(工具序号, 该词对该工具的 BM25 分数)]"""
+        frequencies: List[Dict[str, int]] = []
+        for name in self.names:
+            info = self.tools[name]
+            counts: Dict[str, int] = {}
+            fields = ((name, NAME_WEIGHT), (" ".join(param_names(info.get("params"))), PARAM_WEIGHT), (info.get("desc", ""), DESC_WEIGHT))
+            for text, weight in fields:
+                for token in tokenize(text):
+                    counts[token] = counts.get(token, 0) + weight
+            frequencies.append(counts)
+        total = len(frequencies)
+        lengths = [sum(counts.values()) for counts in frequencies]
+        average = sum(lengths) / total if total else 0.0
+        documents: Dict[str, int] = {}
+        for counts in frequencies:
+            for token in counts:
+                documents[token] = documents.get(token, 0) + 1
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for position, counts in enumerate(frequencies):
+            norm = self.k1 * (1 - self.b + self.b * lengths[position] / average) if average else self.k1
+            for token, tf in counts.items():
+                idf = math.log(1 + (total - documents[token] + 0.5) / (documents[token] + 0.5))
+                postings.setdefault(token, []).append((position, idf * tf * (self.k1 + 1) / (tf + norm)))
+        return postings
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """查询中每个不同的词只计一次"""
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            for position, score in self.postings.get(token, ()):
+                scores[position] = scores.get(position, 0.0) + score
+        return scores
+
+    def retrieve(self, query: str, k: Optional[int] = None) -> List[str]:
+        """得分最高的至多 k 个工具名（不含固定工具），按得分从高到低"""
+        k = self.k if k is None else k
+        pinned = set(self.pinned)
+        scores = self.scores(query)
+        ranked = heapq.nlargest(k + len(pinned), scores.items(), key=lambda item: item[1])
+        return [self.names[position] for position, _ in ranked if self.names[position] not in pinned][:k]
+
+    def select(self, query: str) -> Dict[str, Dict[str, Any]]:
+        """用户输入对应的工具子集（固定工具 + 检索结果），条目与原工具字典共用同一对象"""
+        if len(self.names) <= self.k + len(self.pinned):
+            return self.tools
+        names = self.retrieve(query)
+        if not names:
+            return self.tools
+        key = tuple(sorted(self.pinned + names))
+        selection = self.selections.get(key)
+        if selection is None:
+            selection = {name: self.tools[name] for name in key}
+            self.selections[key] = selection
+            while len(self.selections) > self.max_selections:
+                self.selections.popitem(last=False)
+        else:
+            self.selections.move_to_end(key)
+        return selection
@@ -0,0 +1,208 @@
+import json
+import math
+import re
+from typing import Any, Dict, List, Union
+
+# JSON Schema 类型 -> 签名中的简写
+TYPE_NAMES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool", "object": "dict", "null": "null"}
+MISSING = object()
+# 不加引号也不会和签名语法（| , = ( ) 空格）或数字、true / false / null 混淆的枚举值
+PLAIN_ENUM = re.compile(r"[A-Za-z_][\w.\-/]*")
+
+
+def enum_signature(value: Any) -> str:
+    """枚举值在签名中的写法：普通标识符原样写出，其余（含空格、|、数字样的字符串等）按 JSON 加引号"""
+    if isinstance(value, str) and PLAIN_ENUM.fullmatch(value) and value not in ("true", "false", "null"):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def type_signature(schema: Dict[str, Any]) -> str:
+    """
+    单个参数 schema 的简写类型：
+    str / int / float / bool / dict，数组为 T[]，定长数组为 [T,T]，枚举为 a|b|c，联合类型为 A|B
+    """
+    if "enum" in schema:
+        return "|".join(enum_signature(value) for value in schema["enum"])
+    if "const" in schema:
+        return json.dumps(schema["const"], ensure_ascii=False)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return "|".join(type_signature(option) for option in options) or "null"
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        return "|".join(TYPE_NAMES.get(item, item) for item in kind if item != "null")
+    if kind == "array":
+        if "prefixItems" in schema:
+            return "[" + ",".join(type_signature(item) for item in schema["prefixItems"]) + "]"
+        item = type_signature(schema.get("items", {}))
+        if schema.get("minItems") is not None and schema.get("minItems") == schema.get("maxItems") and schema["minItems"] <= 4:
+            return "[" + ",".join([item] * schema["minItems"]) + "]"
+        return f"{item}[]"
+    if kind == "object" and schema.get("properties"):
+        return "{" + ", ".join(f"{name}:{type_signature(prop)}" for name, prop in schema["properties"].items()) + "}"
+    return TYPE_NAMES.get(kind, "any")
+
+
+def default_signature(schema: Dict[str, Any], value: Any) -> str:
+    if "enum" in schema:
+        return enum_signature(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def compact_signature(name: str, params: Union[Dict[str, Any], List[str], None]) -> str:
+    """
+    工具的一行签名，例如 Click-Tool(loc?:int[], label?:int, button:left|right|middle=left, clicks:int=1)
+    - 参数名与顺序和 inputSchema 的 properties 完全一致（map_arguments 依此还原参数）
+    - 必填参数不带默认值；默认值为 null 的可选参数写作 name?:type；其余可选参数写作 name:type=默认值
+    - 省略 title、additionalProperties 等不影响调用的字段
+    - params 为参数名列表（简单工具字典）时，直接列出参数名
+    """
+    if isinstance(params, list):
+        return f"{name}({', '.join(params)})"
+    properties = (params or {}).get("properties", {})
+    required = set((params or {}).get("required", []))
+    parts = []
+    for param, schema in properties.items():
+        kind = type_signature(schema)
+        default = schema.get("default", MISSING)
+        if param in required or default is MISSING:
+            parts.append(f"{param}:{kind}")
+        elif default is None:
+            parts.append(f"{param}?:{kind}")
+        else:
+            parts.append(f"{param}:{kind}={default_signature(schema, default)}")
+    return f"{name}({', '.join(parts)})"
+
+
+# 放在工具列表前，说明签名写法
+COMPACT_LEGEND = "（格式：工具名(参数:类型=默认值): 描述；参数名后带 ? 表示可选，a|b 表示取值之一（含空格等符号的取值带引号），T[] 表示列表）"
+
+
+def render_compact_tool(name: str, info: Dict[str, Any]) -> str:
+    """PromptBuilder 的工具渲染函数：一行签名 + 描述"""
+    return f"{compact_signature(name, info.get('params'))}: {info.get('desc', '')}"
+
+
+def coerce(schema: Dict[str, Any], value: Any, path: str) -> Any:
+    """
+    把模型给出的值还原为 schema 要求的类型（模型常把数字、布尔、列表写成字符串）。
+    无法还原时抛出 ValueError，错误信息指明参数路径与期望类型。
+    """
+    if "enum" in schema:
+        if value in schema["enum"]:
+            return value
+        # 大小写不同的枚举值（Left -> left），或照抄了签名里的引号（"right click"）
+        matches = [option for option in schema["enum"] if isinstance(option, str) and isinstance(value, str) and option.lower() in (value.strip().lower(), value.strip().strip('"').lower())]
+        if len(matches) == 1:
+            return matches[0]
+        raise ValueError(f"{path}: expected one of {type_signature(schema)}, got {value!r}")
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            if value is None and any(option.get("type") == "null" for option in schema[key]):
+                return None
+            errors = []
+            for option in schema[key]:
+                if option.get("type") == "null":
+                    continue
+                try:
+                    return coerce(option, value, path)
+                except ValueError as e:
+                    errors.append(str(e))
+            raise ValueError(errors[0] if errors else f"{path}: unexpected value {value!r}")
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        return coerce({**schema, "type": None, "anyOf": [{"type": item} for item in kind]}, value, path)
+    if value is None:
+        if schema.get("default", MISSING) is None:
+            return None
+        raise ValueError(f"{path}: expected {type_signature(schema)}, got null")
+    if kind == "string":
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    if kind == "boolean":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        if value in (0, 1):
+            return bool(value)
+        raise ValueError(f"{path}: expected bool, got {value!r}")
+    if kind in ("integer", "number"):
+        if isinstance(value, bool):
+            raise ValueError(f"{path}: expected {TYPE_NAMES[kind]}, got {value!r}")
+        try:
+            number = float(value) if isinstance(value, str) else value
+        except ValueError:
+            raise ValueError(f"{path}: expected {TYPE_NAMES[kind]}, got {value!r}") from None
+        if not isinstance(number, (int, float)):
+            raise ValueError(f"{path}: expected {TYPE_NAMES[kind]}, got {value!r}")
+        # inf / nan（"1e999"、"nan"）不是合法的参数值，int(inf) 还会抛出 OverflowError
+        if isinstance(number, float) and not math.isfinite(number):
+            raise ValueError(f"{path}: expected a finite {TYPE_NAMES[kind]}, got {value!r}")
+        if kind == "integer":
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError(f"{path}: expected int, got {value!r}")
+            return int(number)
+        return number
+    if kind == "array":
+        if isinstance(value, str):
+            value = parse_json(value, path, list)
+        if isinstance(value, tuple):
+            value = list(value)
+        if not isinstance(value, list):
+            raise ValueError(f"{path}: expected {type_signature(schema)}, got {value!r}")
+        if "prefixItems" in schema:
+            return [coerce(item, element, f"{path}[{index}]") for index, (item, element) in enumerate(zip(schema["prefixItems"], value))] + value[len(schema["prefixItems"]):]
+        items = schema.get("items", {})
+        return [coerce(items, element, f"{path}[{index}]") for index, element in enumerate(value)]
+    if kind == "object":
+        if isinstance(value, str):
+            value = parse_json(value, path, dict)
+        if not isinstance(value, dict):
+            raise ValueError(f"{path}: expected dict, got {value!r}")
+        properties = schema.get("properties", {})
+        return {key: coerce(properties[key], element, f"{path}.{key}") if key in properties else element for key, element in value.items()}
+    return value
+
+
+def parse_json(text: str, path: str, expected: type) -> Any:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        raise ValueError(f"{path}: expected {expected.__name__}, got {text!r}") from None
+    if not isinstance(value, expected):
+        raise ValueError(f"{path}: expected {expected.__name__}, got {text!r}")
+    return value
+
+
+def map_arguments(params: Union[Dict[str, Any], List[str], None], args: Union[Dict[str, Any], List[Any], None]) -> Dict[str, Any]:
+    """
+    把按紧凑签名写出的参数还原为符合 inputSchema 的参数字典
+    - args 为字典：参数名与签名一致（即 schema 的属性名），逐个按 schema 还原类型
+    - args 为列表：按签名中的参数顺序对应（位置参数）
+    - 未给出的可选参数不补默认值，由服务端按 schema 默认值处理
+    - 未知参数、缺少必填参数、类型无法还原时抛出 ValueError
+    """
+    args = args or {}
+    if isinstance(params, list):
+        names = params
+        properties: Dict[str, Any] = {name: {} for name in params}
+        required: set = set()
+    else:
+        properties = (params or {}).get("properties", {})
+        names = list(properties)
+        required = set((params or {}).get("required", []))
+    if isinstance(args, (list, tuple)):
+        if len(args) > len(names):
+            raise ValueError(f"expected at most {len(names)} arguments ({', '.join(names)}), got {len(args)}")
+        args = dict(zip(names, args))
+    if not isinstance(args, dict):
+        raise ValueError(f"arguments must be an object or a list, got {args!r}")
+    unknown = [name for name in args if name not in properties]
+    if unknown and not (isinstance(params, dict) and params.get("additionalProperties")):
+        raise ValueError(f"unknown argument(s) {', '.join(unknown)}; expected {', '.join(names) or 'none'}")
+    missing = [name for name in names if name in required and name not in args]
+    if missing:
+        raise ValueError(f"missing required argument(s) {', '.join(missing)}")
+    return {name: coerce(properties[name], value, name) if name in properties else value for name, value in args.items()}
@@ -1,4 +1,5 @@
-import json
+from src.agent.prompt.builder import PromptBuilder
+from src.agent.prompt.schema import render_compact_tool, COMPACT_LEGEND
 
 class Prompt:
     # tools工具模版
@@ -22,60 +23,17 @@ class Prompt:
             }
         }
 
+    # 预编译的 action prompt（按工具集缓存静态前缀），工具以一行紧凑签名列出；
+    # 使用 ToolRetriever 时每组检索结果各有一个前缀，缓存个数相应放大
+    builder = PromptBuilder(renderer=render_compact_tool, legend=COMPACT_LEGEND, max_entries=64)
+
     @staticmethod
     def action_prompt(tools, user_input: str) -> str:
         """
         构建用于 LLM 的 Prompt
-        - 包含工具列表及描述（带参数信息）
+        - 包含工具列表及描述（每个工具一行签名，见 schema.compact_signature）
         - Few-shot 示例（输入→JSON输出）帮助模型理解格式
         - 用户输入在最后作为上下文
+        工具列表和示例组成的前缀按工具集缓存，且逐字节稳定，便于模型后端复用 prefix 缓存
         """
-        # 拼接工具描述（包含 desc 和 params）
-        tool_descriptions = "\n".join(
-            [
-                f"{name}: {{\n"
-                f"  desc: '{info['desc']}',\n"
-                f"  params: {json.dumps(info.get('params', {}), ensure_ascii=False)}\n"
-                f"}}"
-                for name, info in tools.items()
-            ]
-        )
-
-        # Few-shot 示例，给模型参考，帮助模型输出 JSON 格式
-        examples = """
-        示例：
-        用户输入: 打开百度首页
-        输出:
-        {"tool_name": "open_browser", "tool_args": {"url": "https://www.baidu.com"}}
-
-        用户输入: 搜索天气
-        输出:
-        {"tool_name": "search_google", "tool_args": {"query": "北京天气"}}
-        """
-
-        # 完整 Prompt 模板
-        prompt = f"""
-        你是智能助理，根据用户指令判断是否需要调用工具。
-        如果需要调用工具，请严格输出 JSON:
-        {{
-            "tool_name": "工具名称",
-            "tool_args": {{}}
-        }}
-        如果不需要调用工具，直接输出答案:
-        {{
-            "tool_name": null,
-            "tool_args": {{}},
-            "answer":    答案
-        }}
-
-        可用工具列表：
-        {tool_descriptions}
-
-        {examples}
-
-        用户输入: {user_input}
-        """
-
-        return prompt
-
-    
+        return Prompt.builder.build(tools, user_input)
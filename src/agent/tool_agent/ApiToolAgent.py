@@ -1,6 +1,6 @@
 from fastmcp import Client
 from src.agent.tool_agent.GenericToolAgent import GenericToolAgent
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Iterable, Optional
 
 """
 用法：
@@ -29,7 +29,10 @@ class APIToolAgent(GenericToolAgent):
         api_callable: Callable[[str], str],
         tools: Optional[Dict[str, Dict[str, Any]]] = None,
         client: Optional[Client] = None,
-        debug: bool = True
+        debug: bool = True,
+        keepalive_interval: Optional[float] = 30.0,
+        tool_top_k: Optional[int] = None,
+        pinned_tools: Iterable[str] = ("State-Tool",)
     ):
         """
         初始化 API 工具代理
@@ -38,8 +41,12 @@ class APIToolAgent(GenericToolAgent):
             tools: 可选工具字典
             client: 可选 MCP 客户端
             debug: 是否打印调试信息
+            keepalive_interval: MCP 会话保活检查间隔（秒），None 表示不检查
+            tool_top_k: 每次 prompt 最多列出的检索工具数，None 表示列出全部工具
+            pinned_tools: 启用检索时总是列出的核心工具
         """
-        super().__init__(model=api_callable, tools=tools, client=client, debug=debug)
+        super().__init__(model=api_callable, tools=tools, client=client, debug=debug, keepalive_interval=keepalive_interval,
+                         tool_top_k=tool_top_k, pinned_tools=pinned_tools)
 
     # 如果需要，可覆盖 decide_action 或 parse 方法，实现特定 API 输出解析
     async def decide_action(self, user_input: str) -> Dict[str, Any]:
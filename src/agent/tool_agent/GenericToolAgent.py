@@ -2,10 +2,14 @@ from langchain_ollama import OllamaLLM
 import re
 import json
 import asyncio
-from typing import Dict, Any, Optional, Union, Callable
+from contextlib import suppress
+from time import monotonic
+from typing import Dict, Any, Optional, Union, Callable, Iterable
 from fastmcp import Client
 from fastmcp.exceptions import ToolError
 from src.agent.prompt.service import Prompt
+from src.agent.prompt.schema import map_arguments
+from src.agent.prompt.retriever import ToolRetriever
 from src.agent.tool_agent.ToolAgent import ToolAgent
 
 """
@@ -27,11 +31,22 @@ from src.agent.tool_agent.ToolAgent import ToolAgent
 class GenericToolAgent(ToolAgent):
     """
     通用工具代理类，支持 Ollama / API / 自定义模型 + MCP 工具调用。
+    MCP 会话是长连接：第一次工具调用（或 open()）时建立，之后所有调用复用同一会话，
+    直到 close()；会话失效时自动重连，空闲时定期 ping 做保活检查。
+    可用 `async with agent:` 管理会话生命周期。
+    设置 tool_top_k 后，每次只把与用户输入相关的工具（ToolRetriever 检索结果 + 固定工具）放进 prompt；
+    执行工具时仍按完整工具字典校验参数。
     Attributes:
         model: 可调用对象或模型实例，用于生成回答
         tools: 工具字典
         client: 可选 MCP 客户端
         debug: 是否开启调试输出
+        keepalive_interval: 空闲多少秒后 ping 一次服务端，None 表示不做保活检查
+        ping_timeout: 健康检查等待 ping 响应的秒数
+        tool_timeout: act 等待没有 timeout 参数的工具调用的秒数，None 表示一直等待
+        tool_timeout_margin: 工具自带 timeout 参数（如 Powershell-Tool）时，在其超时之上多等的秒数
+        tool_top_k: 每次 prompt 最多列出的检索工具数，None 表示列出全部工具
+        pinned_tools: 启用检索时总是列出的核心工具
     """
 
     def __init__(
@@ -39,12 +54,112 @@ class GenericToolAgent(ToolAgent):
         model: Optional[Union[OllamaLLM, Callable[[str], str]]] = None,  # 模型实例或可调用函数
         tools: Optional[Dict[str, Dict[str, Any]]] = None,               # 工具字典
         client: Optional[Client] = None,                                 # MCP客户端
-        debug: bool = True                                               # 是否打印调试信息
+        debug: bool = True,                                              # 是否打印调试信息
+        keepalive_interval: Optional[float] = 30.0,                      # 保活检查间隔（秒）
+        ping_timeout: float = 5.0,                                       # ping 超时（秒）
+        tool_timeout: Optional[float] = 10.0,                            # 工具调用超时（秒）
+        tool_timeout_margin: float = 5.0,                                # 工具自带超时之上的余量（秒）
+        tool_top_k: Optional[int] = None,                                # 每次 prompt 检索的工具数
+        pinned_tools: Iterable[str] = ("State-Tool",)                    # 总是列出的工具
     ):
         self.model = model
         self.tools: Dict[str, Dict[str, Any]] = tools or Prompt.get_tools_default()  # 初始化工具字典
         self.client: Optional[Client] = client
         self.debug = debug
+        self.keepalive_interval = keepalive_interval
+        self.ping_timeout = ping_timeout
+        self.tool_timeout = tool_timeout
+        self.tool_timeout_margin = tool_timeout_margin
+        self._session_lock = asyncio.Lock()                    # 串行化连接 / 重连 / 关闭
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._owns_session = False                             # 会话是否由本代理打开（close 时才关闭）
+        self._last_used = 0.0                                  # 最近一次调用开始 / 结束的时间，近期有调用则跳过 ping
+        self._in_flight = 0                                    # 进行中的工具调用数，不为 0 时不 ping、不重连
+        self.retriever: Optional[ToolRetriever] = ToolRetriever(self.tools, k=tool_top_k, pinned=pinned_tools) if tool_top_k else None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """
+        建立 MCP 会话（已连接则直接复用），并启动保活检查
+        - 对 stdio 客户端，只在这里启动一次服务进程并完成 initialize 握手
+        """
+        if not self.client:
+            return
+        async with self._session_lock:
+            if not self.client.is_connected():
+                await self.client.__aenter__()
+                self._owns_session = True
+        if self.keepalive_interval and (self._keepalive_task is None or self._keepalive_task.done()):
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def close(self):
+        """停止保活检查并关闭本代理打开的会话（stdio 服务进程随之退出）"""
+        task, self._keepalive_task = self._keepalive_task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if self.client and self._owns_session:
+            async with self._session_lock:
+                await self.client.close()
+                self._owns_session = False
+
+    async def reconnect(self):
+        """丢弃失效的会话并重新连接（stdio 客户端会重启服务进程）"""
+        async with self._session_lock:
+            with suppress(Exception):
+                await self.client.close()
+            await self.client.__aenter__()
+            self._owns_session = True
+        self.log("[INFO] MCP 会话已重新连接")
+
+    async def healthy(self) -> bool:
+        """健康检查：会话存在且能在 ping_timeout 内响应 ping"""
+        if not self.client or not self.client.is_connected():
+            return False
+        try:
+            return await asyncio.wait_for(self.client.ping(), timeout=self.ping_timeout)
+        except Exception:
+            return False
+
+    def _busy(self) -> bool:
+        """有工具调用进行中，或刚结束不久（说明会话可用）"""
+        return self._in_flight > 0 or monotonic() - self._last_used < self.keepalive_interval
+
+    async def _keepalive(self):
+        """
+        后台保活：空闲超过 keepalive_interval 时 ping 一次，失败则重连，避免下一次工具调用才发现会话已断开
+        - 有调用进行中时不 ping：服务端在事件循环里执行同步工具（Wait-Tool、State-Tool 等），
+          这期间 ping 得不到响应，据此重连会在调用中途关闭会话
+        """
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            if self._busy():
+                continue
+            if not await self.healthy() and not self._busy():
+                self.log("[WARN] MCP 会话保活检查失败，尝试重连")
+                try:
+                    await self.reconnect()
+                except Exception as e:
+                    self.log(f"[ERROR] 重连失败: {e}")
+
+    async def _recover(self):
+        """
+        调用异常后确认会话状态：ping 不通则重连，供下一次调用使用
+        - 其他调用仍在进行时不检查（ping 可能被正在执行的同步工具阻塞），由它们结束后各自处理
+        """
+        if self._in_flight or await self.healthy() or self._in_flight:
+            return
+        try:
+            await self.reconnect()
+        except Exception as e:
+            self.log(f"[ERROR] 重连失败: {e}")
 
     def log(self, *args, **kwargs):
         """统一打印调试信息，debug 为 True 才输出"""
@@ -93,7 +208,8 @@ class GenericToolAgent(ToolAgent):
         调用模型判断是否需要执行工具动作
         返回字典: {"tool_name": str|None, "tool_args": dict, "answer": str|None}
         """
-        prompt = Prompt.action_prompt(tools=self.tools, user_input=user_input)  # 构建 Prompt
+        tools = self.retriever.select(user_input) if self.retriever else self.tools  # 只列出相关工具
+        prompt = Prompt.action_prompt(tools=tools, user_input=user_input)  # 构建 Prompt
         self.log("【prompt】\n", prompt)
 
         output = await self.call_model(prompt)  # 调用模型
@@ -105,8 +221,11 @@ class GenericToolAgent(ToolAgent):
     async def execute_tool(self, tool: dict):
         """
         执行 MCP 工具
-        - 异步调用 client.call_tool
+        - 按工具的 inputSchema 还原参数（prompt 中只给出紧凑签名，见 schema.map_arguments）
+        - 复用长连接会话调用 client.call_tool（未连接时先建立会话）
         - 捕获 ToolError 或未知异常
+        - 未知异常后检查会话，失效则重连；本次调用不自动重放，避免有副作用的工具（点击、输入）被执行两次
+        - 调用进行中计入 _in_flight，保活检查在此期间不会 ping / 重连
         """
         if not tool:
             self.log("[INFO] tool is None, skip execution")
@@ -117,27 +236,62 @@ class GenericToolAgent(ToolAgent):
             return {"tool_args": tool.get("tool_args", {}), "simulated": True}
 
         try:
-            async with self.client:  # 确保异步上下文
-                result = await self.client.call_tool(
-                    tool["tool_name"], {**tool.get("tool_args", {})}  # 传递工具参数
+            info = self.tools.get(tool["tool_name"])
+            tool_args = map_arguments(info.get("params"), tool.get("tool_args")) if info else {**(tool.get("tool_args") or {})}
+        except ValueError as e:
+            self.log(f"[ERROR] 工具参数不符合签名: {e}")
+            return {"error": f"Invalid arguments for {tool['tool_name']}: {e}", "fallback": True}
+
+        try:
+            await self.open()
+            self._in_flight += 1
+            self._last_used = monotonic()
+            try:
+                return await self.client.call_tool(
+                    tool["tool_name"], tool_args  # 传递工具参数
                 )
-                return result
+            finally:
+                self._in_flight -= 1
+                self._last_used = monotonic()
         except ToolError as e:
             self.log(f"[ERROR] Tool call failed: {e}")
             return {"error": str(e), "fallback": True}
         except Exception as e:
             self.log(f"[ERROR] 未知异常: {e}")
+            await self._recover()
             return {"error": str(e), "fallback": True}
 
+    def call_timeout(self, tool: Dict[str, Any]) -> Optional[float]:
+        """
+        act 等待一次工具调用的秒数
+        - 工具有 timeout 参数时取本次实参（未给出则取 inputSchema 默认值）再加 tool_timeout_margin，
+          让服务端按自己的超时结束命令并返回结果，而不是被客户端在共享会话上中途取消
+        - 否则使用 tool_timeout
+        """
+        if self.tool_timeout is None:
+            return None
+        info = self.tools.get(tool["tool_name"]) or {}
+        params = info.get("params")
+        try:
+            args = map_arguments(params, tool.get("tool_args")) if info else tool.get("tool_args")
+        except ValueError:
+            return self.tool_timeout
+        value = args.get("timeout") if isinstance(args, dict) else None
+        if value is None and isinstance(params, dict):
+            value = params.get("properties", {}).get("timeout", {}).get("default")
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return max(self.tool_timeout, value + self.tool_timeout_margin)
+        return self.tool_timeout
+
     async def act(self, tool: Dict[str, Any], user_input: str):
         """
         根据解析出的 tool 执行动作
-        - 如果工具存在，执行工具
+        - 如果工具存在，执行工具（等待时长见 call_timeout）
         - 工具执行超时或异常，回退使用模型生成回答
         """
         if tool and tool.get("tool_name"):
             try:
-                return await asyncio.wait_for(self.execute_tool(tool), timeout=10.0)  # 设置超时
+                return await asyncio.wait_for(self.execute_tool(tool), timeout=self.call_timeout(tool))
             except asyncio.TimeoutError:
                 self.log("[WARN] 工具执行超时，回退为模型回答")
 
@@ -1,5 +1,5 @@
 from langchain_ollama import OllamaLLM
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from fastmcp import Client
 from src.agent.tool_agent.GenericToolAgent import GenericToolAgent
 
@@ -20,6 +20,9 @@ class OllamaToolAgent(GenericToolAgent):
         tools: Optional[Dict[str, Dict[str, Any]]] = None,
         client: Optional[Client] = None,
         debug: bool = True,
+        keepalive_interval: Optional[float] = 30.0,       # MCP 会话保活检查间隔（秒）
+        tool_top_k: Optional[int] = None,                 # 每次 prompt 检索的工具数，None 表示全部列出
+        pinned_tools: Iterable[str] = ("State-Tool",),    # 启用检索时总是列出的工具
         **kwargs                                         # 可传给 OllamaLLM 的额外参数
     ):
         ollama_model = OllamaLLM(model=model_name, **kwargs)  # 初始化 Ollama 模型
@@ -27,6 +30,9 @@ class OllamaToolAgent(GenericToolAgent):
             model=ollama_model,
             tools=tools,
             client=client,
-            debug=debug
+            debug=debug,
+            keepalive_interval=keepalive_interval,
+            tool_top_k=tool_top_k,
+            pinned_tools=pinned_tools
         )
 
@@ -1,5 +1,5 @@
 from src.agent.tools.windows import register_windows_all_tools
 
-def register_all_tools(mcp, desktop, default_language):
+def register_all_tools(mcp, desktop):
     # 注册windows工具
-    register_windows_all_tools(mcp, desktop, default_language)
+    register_windows_all_tools(mcp, desktop)
@@ -2,9 +2,13 @@ from .app_tools import register_app_tools
 from .input_tools import register_input_tools
 from .system_tools import register_system_tools
 from .web_tools import register_web_tools
+from .vision_tools import register_vision_tools
+from .batch_tools import register_batch_tools
 
-def register_windows_all_tools(mcp, desktop, default_language):
-    register_app_tools(mcp, desktop, default_language)
+def register_windows_all_tools(mcp, desktop):
+    register_app_tools(mcp, desktop)
     register_input_tools(mcp, desktop)
-    register_system_tools(mcp, desktop, default_language)
+    register_system_tools(mcp, desktop)
     register_web_tools(mcp)
+    register_vision_tools(mcp, desktop)
+    register_batch_tools(mcp, desktop)
@@ -1,5 +1,5 @@
 
-def register_app_tools(mcp, desktop, default_language):
+def register_app_tools(mcp, desktop):
     @mcp.tool(name='Launch-Tool',
               description='Launch an application from the Windows Start Menu by name (e.g., "notepad", "calculator", "chrome")')
     def launch_tool(name: str) -> str:
@@ -10,7 +10,7 @@ def register_app_tools(mcp, desktop, default_language):
         """
         response, status = desktop.launch_app(name)
         if status != 0:
-            return f'Failed to launch {name.title()}. Try to use the app name in the default language ({default_language}).'
+            return f'Failed to launch {name.title()}. Try to use the app name in the default language ({desktop.default_language}).'
         else:
             return response
 
@@ -23,7 +23,7 @@ def register_app_tools(mcp, desktop, default_language):
         """
         response, status = desktop.switch_app(name)
         if status != 0:
-            return f'Failed to switch to {name.title()} window. Try to use the app name in the default language ({default_language}).'
+            return f'Failed to switch to {name.title()} window. Try to use the app name in the default language ({desktop.default_language}).'
         else:
             return response
 
@@ -46,7 +46,7 @@ def register_app_tools(mcp, desktop, default_language):
 
         response, status = desktop.resize_app(name, size_tuple, loc_tuple)
         if status != 0:
-            return f'Failed to resize {name.title()} window. Try to use the app name in the default language ({default_language}).'
+            return f'Failed to resize {name.title()} window. Try to use the app name in the default language ({desktop.default_language}).'
         else:
             return response
 
@@ -0,0 +1,152 @@
+from time import perf_counter
+from src.desktop.watch import poll_until
+from src.agent.utils import PausedPyAutoGUI
+from src.agent.tools.windows.system_tools import watch_condition
+
+ACTIONS = ('click', 'type', 'key', 'shortcut', 'move', 'scroll', 'wait')
+
+
+def get_loc(step: dict, required: bool = True) -> tuple[int, int] | None:
+    loc = step.get('loc')
+    if loc is None and not required:
+        return None
+    if not isinstance(loc, (list, tuple)) or len(loc) != 2:
+        raise ValueError("loc must be a list of exactly 2 integers [x, y]")
+    return int(loc[0]), int(loc[1])
+
+
+def run_step(pg, desktop, step: dict) -> str:
+    """
+    执行单个步骤
+    :param pg: PausedPyAutoGUI（按批次的停顿时间调用 pyautogui）
+    :param desktop: Desktop 实例（文字输入策略）
+    :param step: 步骤字典，action 字段决定其余字段的含义
+    :return: 步骤结果描述
+    """
+    action = step.get('action')
+    match action:
+        case 'click':
+            button = step.get('button', 'left')
+            clicks = int(step.get('clicks', 1))
+            if step.get('label') is not None:
+                handle = desktop.get_element_handle(int(step['label']))
+                if button == 'left' and clicks == 1 and (pattern := handle.invoke()):
+                    return f'label {handle.label} via {pattern}'
+                x, y = handle.center.x, handle.center.y
+            else:
+                x, y = get_loc(step)
+            pg.click(x=x, y=y, button=button, clicks=clicks)
+            return f'{button} x{clicks} at ({x},{y})'
+        case 'type':
+            if step.get('label') is not None:
+                handle = desktop.get_element_handle(int(step['label']))
+                if step.get('strategy', 'auto') == 'auto' and handle.set_value(str(step.get('text', '')), clear=bool(step.get('clear', False))):
+                    if step.get('press_enter', False):
+                        handle.control.SetFocus()
+                        pg.press('enter')
+                    return f'label {handle.label} via Value pattern'
+                loc = handle.center.x, handle.center.y
+            else:
+                loc = get_loc(step, required=False)
+            if loc is not None:
+                pg.click(x=loc[0], y=loc[1])
+            if step.get('clear', False):
+                pg.hotkey('ctrl', 'a')
+                pg.press('backspace')
+            entry = desktop.type_text(str(step.get('text', '')), strategy=step.get('strategy', 'auto'),
+                                      sensitive=bool(step.get('sensitive', False)))
+            if step.get('press_enter', False):
+                pg.press('enter')
+            return entry.to_string()
+        case 'key':
+            key = step.get('key')
+            if not key:
+                raise ValueError("key step requires 'key'")
+            pg.press(key)
+            return key
+        case 'shortcut':
+            keys = step.get('keys')
+            if not keys:
+                raise ValueError("shortcut step requires 'keys', e.g. [\"ctrl\", \"s\"]")
+            pg.hotkey(*keys)
+            return '+'.join(keys)
+        case 'move':
+            x, y = get_loc(step)
+            pg.moveTo(x, y)
+            return f'({x},{y})'
+        case 'scroll':
+            import uiautomation as ua
+            loc = get_loc(step, required=False)
+            if loc is not None:
+                pg.moveTo(*loc)
+            direction = step.get('direction', 'down')
+            wheel_times = int(step.get('wheel_times', 1))
+            match direction:
+                case 'up':
+                    ua.WheelUp(wheel_times)
+                case 'down':
+                    ua.WheelDown(wheel_times)
+                case 'left' | 'right':
+                    pg.keyDown('shift')
+                    (ua.WheelUp if direction == 'left' else ua.WheelDown)(wheel_times)
+                    pg.keyUp('shift')
+                case _:
+                    raise ValueError('Invalid direction. Use "up", "down", "left" or "right".')
+            return f'{direction} x{wheel_times}'
+        case 'wait':
+            duration = float(step.get('duration', 1.0))
+            pg.sleep(duration)
+            return f'{duration}s'
+        case _:
+            raise ValueError(f'Invalid action {action!r}. Use one of {", ".join(ACTIONS)}.')
+
+
+def register_batch_tools(mcp, desktop):
+    @mcp.tool(name='Action-Batch-Tool',
+              description='Run an ordered list of input steps in one call, e.g. filling a form. Each step is an object with "action": '
+                          '"click" (label or loc, button, clicks), "type" (text, optional label or loc, clear, press_enter, strategy, sensitive), "key" (key), '
+                          '"shortcut" (keys), "move" (loc), "scroll" (optional loc, direction, wheel_times) or "wait" (duration). '
+                          'Any step may add "settle": {"condition": "pixels"|"appear"|"disappear"|"windows", "region", "name", '
+                          '"control_type", "timeout"} to wait for the UI to react before the next step. '
+                          'Steps without "settle" wait as long as the target app usually needs. pause is the delay after every input call (seconds). Stops at the first failing step unless stop_on_error is false.')
+    def action_batch_tool(steps: list[dict], pause: float = 0.05, stop_on_error: bool = True) -> str:
+        """
+        在一次调用中按顺序执行多个输入步骤（避免每个动作一次往返）
+        :param steps: 步骤列表，每个步骤为带 action 字段的字典
+        :param pause: 每次 pyautogui 调用后的停顿秒数，默认 0.05
+        :param stop_on_error: 某步失败时是否跳过剩余步骤
+        :return: 每个步骤一行的紧凑结果
+        """
+        if not steps:
+            raise ValueError("steps must contain at least one step")
+        results = []
+        start = perf_counter()
+        pg = PausedPyAutoGUI(max(pause, 0.0))
+        for index, step in enumerate(steps, start=1):
+            action = step.get('action') if isinstance(step, dict) else None
+            step_start = perf_counter()
+            try:
+                if not isinstance(step, dict):
+                    raise ValueError('step must be an object with an "action" field')
+                settle = step.get('settle')
+                # pixels/windows 条件的基线必须在动作之前记录
+                watch = watch_condition(desktop, settle.get('condition'), settle.get('region'), settle.get('name'),
+                                        settle.get('control_type')) if settle else None
+                detail = run_step(pg, desktop, step)
+                if watch is not None:
+                    predicate, target, event = watch
+                    waited = poll_until(predicate, timeout=float(settle.get('timeout', 5.0)))
+                    detail += f'; {target} {event} in {waited.elapsed:.2f}s' if waited.met else f'; {target} not {event} after {waited.elapsed:.2f}s'
+                elif action != 'wait':
+                    # 未指定等待条件时按目标应用学习到的响应时间等待
+                    desktop.settle_input()
+                results.append(f'{index}. {action} ok: {detail} ({perf_counter() - step_start:.2f}s)')
+            except Exception as ex:
+                results.append(f'{index}. {action} failed: {ex}')
+                if stop_on_error:
+                    skipped = len(steps) - index
+                    if skipped:
+                        results.append(f'Skipped the remaining {skipped} step(s).')
+                    break
+        results.append(f'Finished in {perf_counter() - start:.2f}s.')
+        return '\n'.join(results)
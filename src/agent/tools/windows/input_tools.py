@@ -1,30 +1,45 @@
-import pyautogui as pg
+from typing import Literal
+from src.agent.utils import get_pyautogui
 
 
-pg.FAILSAFE = False
-pg.PAUSE = 1.0
-
 def register_input_tools(mcp, desktop):
-    @mcp.tool(name='Type-Tool', description='Type text into input fields.')
-    def type_tool(loc: list[int], text: str, clear: bool = False, press_enter: bool = False) -> str:
+    @mcp.tool(name='Type-Tool', description='Type text into input fields. Target the field by its State-Tool label (preferred: the value is set directly through UI Automation when the field supports it) or by loc coordinates. Long text is pasted through the clipboard (its previous content is restored), other text is sent as unicode input or typed key by key. Set sensitive=True for passwords so the text never touches the clipboard.')
+    def type_tool(text: str, loc: list[int] = None, label: int = None, clear: bool = False, press_enter: bool = False,
+                  strategy: Literal['auto', 'paste', 'unicode', 'keys'] = 'auto', sensitive: bool = False) -> str:
         """
         在指定输入框或焦点位置输入文字
-        :param loc: [x, y] 坐标
         :param text: 要输入的文字
+        :param loc: [x, y] 坐标（未提供 label 时必填）
+        :param label: State-Tool 返回的元素标签，优先通过 UIA Value 模式直接写入，不支持时点击其中心后输入
         :param clear: True 清空原有文本, False 追加输入
         :param press_enter: 是否在输入后按下回车
-        :return: 操作结果提示
+        :param strategy: 输入方式，auto 按长度和字符集自动选择：paste 剪贴板粘贴, unicode 批量 unicode 输入, keys 逐键输入
+        :param sensitive: 敏感内容（如密码），不经过剪贴板
+        :return: 操作结果提示（含输入方式和速度）
         """
-        if len(loc) != 2:
-            raise ValueError("Location must be a list of exactly 2 integers [x, y]")
-        x, y = loc[0], loc[1]
+        pg = get_pyautogui()
+        typed = '*' * len(text) if sensitive else text
+        if label is not None:
+            handle = desktop.get_element_handle(label)
+            node = handle.node
+            if strategy == 'auto' and handle.set_value(text, clear=clear):
+                if press_enter:
+                    handle.control.SetFocus()
+                    pg.press('enter')
+                desktop.settle_input()
+                return f'Typed {typed} on {node.name} Element with ControlType {node.control_type} (label {label}) through the Value pattern.'
+            x, y = handle.center.x, handle.center.y
+        elif loc is None or len(loc) != 2:
+            raise ValueError("Provide a label or a location as a list of exactly 2 integers [x, y]")
+        else:
+            x, y = loc[0], loc[1]
         pg.click(x=x, y=y)
         control = desktop.get_element_under_cursor()
-        if clear == 'True':
+        if clear:
             pg.hotkey('ctrl', 'a')
             pg.press('backspace')
-        pg.typewrite(text, interval=0.1)
+        entry = desktop.type_text(text, strategy=strategy, sensitive=sensitive)
         if press_enter:
             pg.press('enter')
-        return f'Typed {text} on {control.Name} Element with ControlType {control.ControlTypeName} at ({x},{y}).'
-
+        desktop.settle_input()
+        return f'Typed {typed} on {control.Name} Element with ControlType {control.ControlTypeName} at ({x},{y}) [{entry.to_string()}].'
@@ -1,12 +1,10 @@
 from platform import system, release
 from textwrap import dedent
 from typing import Literal
-import uiautomation as ua
-import pyperclip as pc
-import pyautogui as pg
-
-pg.FAILSAFE = False
-pg.PAUSE = 1.0
+from fastmcp.utilities.types import Image
+from fastmcp import Context
+from src.desktop.watch import poll_until
+from src.agent.utils import get_pyautogui
 
 os = system()
 version = release()
@@ -17,7 +15,36 @@ thus enabling to operate the desktop on the user's behalf.
 ''')
 
 
-def register_system_tools(mcp, desktop, default_language):
+def watch_condition(desktop, condition: str, region: list[int] = None, name: str = None, control_type: str = None):
+    """
+    构造等待条件（pixels / windows 模式在调用时记录基线，因此需在触发变化的操作之前调用）
+    :return: (谓词函数, 描述对象, 事件名)
+    """
+    match condition:
+        case 'pixels':
+            if region is not None and len(region) != 4:
+                raise ValueError("Region must be a list of exactly 4 integers [x1, y1, x2, y2]")
+            region_tuple = tuple(region) if region is not None else None
+            baseline = desktop.get_region_fingerprint(region_tuple)
+            predicate = lambda: desktop.get_region_fingerprint(region_tuple) != baseline
+            target = f'pixels in region {region}' if region else 'screen pixels'
+            event = 'changed'
+        case 'appear' | 'disappear':
+            expected = condition == 'appear'
+            predicate = lambda: desktop.element_exists(name, control_type) == expected
+            target = f'element (name={name}, control_type={control_type})'
+            event = 'appeared' if expected else 'disappeared'
+        case 'windows':
+            baseline = desktop.get_windows_fingerprint()
+            predicate = lambda: desktop.get_windows_fingerprint() != baseline
+            target = 'window list'
+            event = 'changed'
+        case _:
+            raise ValueError('Invalid condition. Use "pixels", "appear", "disappear" or "windows".')
+    return predicate, target, event
+
+
+def register_system_tools(mcp, desktop):
     @mcp.tool(name='Clipboard-Tool', description='Copy text to clipboard or retrieve current clipboard content.')
     def clipboard_tool(mode: Literal['copy', 'paste'], text: str = None) -> str:
         """
@@ -26,6 +53,7 @@ def register_system_tools(mcp, desktop, default_language):
         :param text: 在 copy 模式下要复制的文本
         :return: 操作结果提示
         """
+        import pyperclip as pc
         if mode == 'copy':
             if text:
                 pc.copy(text)
@@ -45,10 +73,12 @@ def register_system_tools(mcp, desktop, default_language):
         :param to_loc: [x, y] 目标坐标
         :return: 操作结果提示
         """
+        pg = get_pyautogui()
         if len(to_loc) != 2:
             raise ValueError("to_loc must be a list of exactly 2 integers [x, y]")
         x, y = to_loc[0], to_loc[1]
         pg.moveTo(x, y)
+        desktop.settle_input()
         return f'Moved the mouse pointer to ({x},{y}).'
 
     @mcp.tool(name='Shortcut-Tool',description='Execute keyboard shortcuts using key combinations. Pass keys as list (e.g., ["ctrl", "c"] for copy, ["alt", "tab"] for app switching, ["win", "r"] for Run dialog).')
@@ -58,22 +88,30 @@ def register_system_tools(mcp, desktop, default_language):
         :param shortcut: 键位列表，例如 ["ctrl","c"] 或 ["alt","tab"]
         :return: 操作结果提示
         """
+        pg = get_pyautogui()
         pg.hotkey(*shortcut)
+        desktop.settle_input()
         return f"Pressed {'+'.join(shortcut)}."
 
-    @mcp.tool(name='Powershell-Tool', description='Execute PowerShell commands and return the output with status code')
-    def powershell_tool(command: str) -> str:
+    @mcp.tool(name='Powershell-Tool', description='Execute PowerShell commands and return the output with status code. Each call runs in a fresh scope: the working directory, variables, environment changes and $ErrorActionPreference do not carry over to the next call, and exit ends only that command. Output is streamed as progress while the command runs; long output keeps its beginning and end.')
+    async def powershell_tool(command: str, ctx: Context, timeout: float = 60.0) -> str:
         """
-        执行 PowerShell 命令并返回执行结果
+        执行 PowerShell 命令并返回执行结果（异步执行，输出以进度通知的形式增量推送）
         :param command: PowerShell 命令字符串
+        :param timeout: 超时时间（秒），超时或请求取消时结束整个进程树
         :return: 状态码和响应输出
         """
-        response, status = desktop.execute_command(command)
-        return f'Status Code: {status}\nResponse: {response}'
+        async def on_output(text: str, total: int):
+            await ctx.report_progress(progress=total, message=text[-1000:])
+
+        result = await desktop.execute_command_streaming(command, on_output=on_output, timeout=timeout)
+        if result.timed_out:
+            return f'Status Code: {result.status}\nResponse: Command timed out after {timeout} seconds.\n{result.output}'
+        return f'Status Code: {result.status}\nResponse: {result.output}'
 
     @mcp.tool(name='State-Tool',
               description='Capture comprehensive desktop state including default language used by user interface, focused/opened applications, interactive UI elements (buttons, text fields, menus), informative content (text, labels, status), and scrollable areas. Optionally includes visual screenshot when use_vision=True. Essential for understanding current desktop context and available UI interactions.')
-    def state_tool(use_vision: bool = False) -> dict:
+    def state_tool(use_vision: bool = False) -> list[str | Image]:
         """
         获取桌面状态，包括：
           - 默认语言
@@ -82,9 +120,9 @@ def register_system_tools(mcp, desktop, default_language):
           - 可交互元素（按钮、输入框等）
           - 信息性元素（文本、状态标签等）
           - 可滚动区域
-        可选：返回桌面截图 (base64)
+        可选：以 MCP 图片内容块返回桌面截图 (PNG)
         :param use_vision: 是否包含截图
-        :return: 包含桌面状态的 dict
+        :return: [文本状态] 或 [文本状态, 截图]
         """
         desktop_state = desktop.get_state(use_vision=use_vision)
         interactive_elements = desktop_state.tree_state.interactive_elements_to_string()
@@ -95,7 +133,7 @@ def register_system_tools(mcp, desktop, default_language):
 
         text_output = dedent(f'''
         Default Language of User Interface:
-        {default_language}
+        {desktop.default_language}
 
         Focused App:
         {active_app}
@@ -113,14 +151,11 @@ def register_system_tools(mcp, desktop, default_language):
         {scrollable_elements or 'No scrollable elements found.'}
         ''')
 
-        result = {"text": text_output}
+        result = [text_output]
 
-        # 如果需要截图，附加 base64 编码图像
+        # 如果需要截图，直接附加 PNG 字节作为图片内容块（由 MCP 传输层统一编码一次）
         if use_vision:
-            import base64
-            screenshot_bytes = desktop_state.screenshot
-            screenshot_b64 = base64.b64encode(screenshot_bytes).decode("utf-8")
-            result["screenshot"] = screenshot_b64
+            result.append(Image(data=desktop_state.screenshot, format='png'))
 
         return result
 
@@ -135,6 +170,8 @@ def register_system_tools(mcp, desktop, default_language):
         :param wheel_times: 滚动次数
         :return: 操作结果提示
         """
+        import uiautomation as ua
+        pg = get_pyautogui()
         if loc:
             if len(loc) != 2:
                 raise ValueError("Location must be a list of exactly 2 integers [x, y]")
@@ -168,6 +205,7 @@ def register_system_tools(mcp, desktop, default_language):
                         return 'Invalid direction. Use "left" or "right".'
             case _:
                 return 'Invalid type. Use "horizontal" or "vertical".'
+        desktop.settle_input()
         return f'Scrolled {type} {direction} by {wheel_times} wheel times.'
 
     @mcp.tool(name='Key-Tool',description='Press individual keyboard keys. Supports special keys like "enter", "escape", "tab", "space", "backspace", "delete", arrow keys ("up", "down", "left", "right"), function keys ("f1"-"f12").')
@@ -177,21 +215,35 @@ def register_system_tools(mcp, desktop, default_language):
         :param key: 键位名，例如 "enter","escape","tab"
         :return: 操作结果提示
         """
+        pg = get_pyautogui()
         pg.press(key)
+        desktop.settle_input()
         return f'Pressed the key {key}.'
 
-    @mcp.tool(name='Click-Tool', description='Click on UI elements at specific coordinates.')
-    def click_tool(loc: list[int], button: Literal['left', 'right', 'middle'] = 'left', clicks: int = 1) -> str:
+    @mcp.tool(name='Click-Tool', description='Click on UI elements by their State-Tool label (preferred: single left clicks are performed through UI Automation without moving the mouse) or at specific coordinates.')
+    def click_tool(loc: list[int] = None, label: int = None, button: Literal['left', 'right', 'middle'] = 'left', clicks: int = 1) -> str:
         """
-        在指定屏幕坐标点击鼠标
-        :param loc: [x, y] 坐标
+        点击元素：优先按 State-Tool 标签通过 UIA 模式（Invoke/Toggle/SelectionItem/ExpandCollapse）操作，否则在屏幕坐标点击鼠标
+        :param loc: [x, y] 坐标（未提供 label 时必填）
+        :param label: State-Tool 返回的元素标签
         :param button: 鼠标按钮类型（左/右/中）
         :param clicks: 点击次数（1/2/3）
         :return: 操作结果提示
         """
-        if len(loc) != 2:
-            raise ValueError("Location must be a list of exactly 2 integers [x, y]")
-        x, y = loc[0], loc[1]
+        num_clicks = {1: 'Single', 2: 'Double', 3: 'Triple'}
+        if label is not None:
+            handle = desktop.get_element_handle(label)
+            node = handle.node
+            if button == 'left' and clicks == 1 and (pattern := handle.invoke()):
+                desktop.settle_input()
+                return f'Clicked {node.name} Element with ControlType {node.control_type} (label {label}) through the {pattern} pattern.'
+            # 不支持的模式或右键/多击时回退到元素当前中心坐标
+            x, y = handle.center.x, handle.center.y
+        elif loc is None or len(loc) != 2:
+            raise ValueError("Provide a label or a location as a list of exactly 2 integers [x, y]")
+        else:
+            x, y = loc[0], loc[1]
+        pg = get_pyautogui()
         pg.moveTo(x, y)
         control = desktop.get_element_under_cursor()
         parent_control = control.GetParentControl()
@@ -203,13 +255,14 @@ def register_system_tools(mcp, desktop, default_language):
             pg.mouseDown()
             pg.click(button=button, clicks=clicks)
             pg.mouseUp()
+        desktop.settle_input()
 
-        num_clicks = {1: 'Single', 2: 'Double', 3: 'Triple'}
         return f'{num_clicks.get(clicks)} {button} Clicked on {control.Name} Element with ControlType {control.ControlTypeName} at ({x},{y}).'
 
     @mcp.tool(name='Drag-Tool',
               description='Drag and drop operation from source coordinates to destination coordinates. Useful for moving files, resizing windows, or drag-and-drop interactions.')
     def drag_tool(from_loc: list[int], to_loc: list[int]) -> str:
+        pg = get_pyautogui()
         if len(from_loc) != 2:
             raise ValueError("from_loc must be a list of exactly 2 integers [x, y]")
         if len(to_loc) != 2:
@@ -217,11 +270,32 @@ def register_system_tools(mcp, desktop, default_language):
         x1, y1 = from_loc[0], from_loc[1]
         x2, y2 = to_loc[0], to_loc[1]
         pg.drag(x1, y1, x2, y2, duration=0.5)
+        desktop.settle_input()
         control = desktop.get_element_under_cursor()
         return f'Dragged {control.Name} element with ControlType {control.ControlTypeName} from ({x1},{y1}) to ({x2},{y2}).'
 
     @mcp.tool(name='Wait-Tool',
               description='Pause execution for specified duration in seconds. Useful for waiting for applications to load, animations to complete, or adding delays between actions.')
     def wait_tool(duration: int) -> str:
+        pg = get_pyautogui()
         pg.sleep(duration)
-        return f'Waited for {duration} seconds.'
\ No newline at end of file
+        return f'Waited for {duration} seconds.'
+
+    @mcp.tool(name='Watch-Tool',
+              description='Wait until the screen or UI changes instead of sleeping for a fixed time. Conditions: "pixels" (the region [x1, y1, x2, y2] or whole screen changes), "appear"/"disappear" (an element with the given name and/or control_type, e.g. "Button", in the focused window), "windows" (the list of open windows changes). Returns as soon as the condition is met or after timeout seconds.')
+    def watch_tool(condition: Literal['pixels', 'appear', 'disappear', 'windows'], region: list[int] = None,
+                   name: str = None, control_type: str = None, timeout: float = 10.0) -> str:
+        """
+        阻塞等待直到条件满足或超时（采样哈希 + 指数退避轮询）
+        :param condition: 'pixels' 区域像素变化, 'appear'/'disappear' 元素出现/消失, 'windows' 窗口列表变化
+        :param region: [x1, y1, x2, y2] 区域（仅 pixels 模式，可选，默认全屏）
+        :param name: 元素名（appear/disappear 模式）
+        :param control_type: 元素控件类型，例如 "Button"（appear/disappear 模式）
+        :param timeout: 最长等待秒数
+        :return: 是否满足条件及耗时
+        """
+        predicate, target, event = watch_condition(desktop, condition, region, name, control_type)
+        result = poll_until(predicate, timeout=timeout)
+        if result.met:
+            return f'The {target} {event} after {result.elapsed:.2f} seconds.'
+        return f'Timed out after {result.elapsed:.2f} seconds: the {target} has not {event}.'
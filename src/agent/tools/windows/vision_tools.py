@@ -0,0 +1,46 @@
+from pathlib import Path
+from io import BytesIO
+import binascii
+import base64
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+def load_template(image: str) -> 'Image.Image':
+    """
+    读取参考图片：支持本地文件路径或 base64 编码的图片数据
+    :param image: 图片路径或 base64 字符串
+    :return: PIL 图片
+    """
+    from PIL import Image
+    path = Path(image)
+    if len(image) < 1024 and path.is_file():
+        return Image.open(path).convert('RGB')
+    try:
+        data = base64.b64decode(image, validate=True)
+        return Image.open(BytesIO(data)).convert('RGB')
+    except (binascii.Error, OSError):
+        raise ValueError("image must be an existing file path or base64 encoded image data")
+
+
+def register_vision_tools(mcp, desktop):
+    @mcp.tool(name='Locate-Image-Tool',
+              description='Find a reference image (file path or base64 PNG/JPEG) on the current screen and return the coordinates and match scores. Useful for apps that expose no accessible UI elements (legacy Win32, games, canvas UIs).')
+    def locate_image_tool(image: str, threshold: float = 0.8, max_results: int = 5) -> str:
+        """
+        在当前屏幕截图中查找参考图片（归一化互相关 + 图像金字塔由粗到细搜索，纯 CPU）
+        :param image: 参考图片的文件路径或 base64 编码数据
+        :param threshold: 匹配分数阈值（0~1）
+        :param max_results: 最多返回的匹配数量
+        :return: 匹配结果（中心坐标、边框、分数）
+        """
+        from src.desktop.locate import locate
+        template = load_template(image)
+        screenshot = desktop.get_screenshot(scale=1.0)
+        matches = locate(screenshot, template, threshold=threshold, max_results=max_results)
+        if not matches:
+            return f'No match found for the reference image (threshold {threshold}).'
+        lines = '\n'.join([f'Match: {index} {match.to_string()}' for index, match in enumerate(matches)])
+        return f'Found {len(matches)} match(es) for the reference image:\n{lines}'
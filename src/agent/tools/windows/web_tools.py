@@ -1,17 +1,66 @@
-import requests
-from markdownify import markdownify
+from typing import Literal
+from fastmcp import Context
+from src.web import WebClient
+from src.web.batch import scrape_many
+from src.web.pages import make_page_token, parse_page_token
+
 
 def register_web_tools(mcp):
-    @mcp.tool(name='Scrape-Tool',description='Fetch and convert webpage content to markdown format. Provide full URL including protocol (http/https). Returns structured text content suitable for analysis.')
-    def scrape_tool(url: str) -> str:
+    client = WebClient()
+
+    @mcp.tool(name='Scrape-Tool',description='Fetch and convert webpage content to markdown format. Provide full URL including protocol (http/https). mode="main" (default) returns only the main article or content block without menus, cookie banners, sidebars, comments and footers; mode="full" converts the whole page. Long pages are split into pages: pass the returned page_token with the same url and mode to read the next one.')
+    def scrape_tool(url: str, page_token: str = None, mode: Literal['main', 'full'] = 'main') -> str:
         """
-        抓取网页内容并转换为 Markdown 文本
+        抓取网页内容并转换为 Markdown 文本（边下载边转换，正文大小有上限；结果按页返回）
         :param url: 完整 URL (http/https)
-        :return: Markdown 格式网页内容
+        :param page_token: 上一次返回的分页令牌，读取后续页面
+        :param mode: main 仅提取正文（按文本密度与链接密度打分）；full 转换整个页面
+        :return: Markdown 格式网页内容（当前页）及下一页令牌
+        """
+        digest, index = parse_page_token(page_token) if page_token else (None, 0)
+        document = client.document(url, variant=mode, digest=digest)
+        notes = []
+        if digest is not None and document.digest != digest:
+            notes.append('The page changed since the page token was issued; its current content is shown.')
+        if index >= len(document.pages):
+            raise ValueError(f'Page token out of range: the page has {len(document.pages)} page(s).')
+        if document.fetch.truncated:
+            notes.append(f'Only the first {len(document.fetch.body)} bytes of the page were read.')
+        content = document.pages[index]
+        header = f'Scraped the contents of the webpage (page {index + 1} of {len(document.pages)}):'
+        if index + 1 < len(document.pages):
+            notes.append(f'Next page token: {make_page_token(document.digest, index + 1)}')
+        return '\n'.join([header, content, *notes])
+
+    @mcp.tool(name='Scrape-Batch-Tool',description='Fetch several webpages concurrently and convert each to markdown, with per-host rate limits. Results come back in input order with status, timing or error per URL. mode works as in Scrape-Tool. Only the first page of each long page is returned: read the rest with Scrape-Tool and the given page_token.')
+    async def scrape_batch_tool(urls: list[str], ctx: Context, mode: Literal['main', 'full'] = 'main') -> str:
+        """
+        并发抓取多个网页并转换为 Markdown（全局并发上限、同一主机限速；单个 URL 失败不影响其他结果）
+        :param urls: 完整 URL 列表 (http/https)，结果按输入顺序返回
+        :param mode: main 仅提取正文；full 转换整个页面
+        :return: 每个 URL 的状态、耗时及第一页内容或错误信息
         """
-        response = requests.get(url, timeout=10)
-        html = response.text
-        content = markdownify(html=html)
-        return f'Scraped the contents of the entire webpage:\n{content}'
+        if not urls:
+            raise ValueError('urls must contain at least one URL')
 
+        async def on_progress(finished: int, total: int, result):
+            await ctx.report_progress(progress=finished, total=total, message=result.url)
 
+        results = await scrape_many(client, urls, variant=mode, on_progress=on_progress)
+        sections = []
+        for position, result in enumerate(results, start=1):
+            timing = f'queued {result.waited:.2f}s, fetched in {result.elapsed:.2f}s'
+            if result.error is not None:
+                sections.append(f'## [{position}] {result.url}\nError ({timing}): {result.error}')
+                continue
+            document = result.document
+            lines = [f'## [{position}] {result.url}',
+                     f'Status {document.fetch.status}, cache {document.fetch.cache}, {timing}, page 1 of {len(document.pages)}',
+                     document.pages[0]]
+            if document.fetch.truncated:
+                lines.append(f'Only the first {len(document.fetch.body)} bytes of the page were read.')
+            if len(document.pages) > 1:
+                lines.append(f'Next page token: {make_page_token(document.digest, 1)}')
+            sections.append('\n'.join(lines))
+        failed = sum(result.error is not None for result in results)
+        return f'Scraped {len(results) - failed} of {len(results)} webpages:\n\n' + '\n\n'.join(sections)
@@ -1 +1,43 @@
-# 函数文件
\ No newline at end of file
+# 函数文件
+from functools import cache
+from time import sleep
+
+
+@cache
+def get_pyautogui():
+    """
+    首次使用时才导入 pyautogui（导入耗时较长，避免拖慢服务启动），并统一设置全局参数
+    每次调用后只做很短的固定停顿，等待应用响应由 Desktop.settle_input 按应用自适应完成
+    :return: pyautogui 模块
+    """
+    import pyautogui as pg
+    from src.desktop.config import INPUT_BASE_PAUSE
+    pg.FAILSAFE = False
+    pg.PAUSE = INPUT_BASE_PAUSE
+    return pg
+
+
+class PausedPyAutoGUI:
+    """
+    按调用指定停顿时间的 pyautogui：带 pyautogui 停顿机制的函数（click、press、hotkey、moveTo 等）
+    以 _pause=False 调用，之后只停顿 pause 秒；全局 pyautogui.PAUSE 不变，并发执行的其他工具不受影响
+    其余属性（sleep、size 等）原样返回
+    :param pause: 每次输入调用后的停顿秒数
+    """
+
+    def __init__(self, pause: float):
+        self.pg = get_pyautogui()
+        self.pause = pause
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.pg, name)
+        # 只有经 pyautogui 内部装饰器包装的函数才接受 _pause 参数
+        if not callable(attribute) or not hasattr(attribute, '__wrapped__') or attribute.__module__ != self.pg.__name__:
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, _pause=False, **kwargs)
+            if self.pause > 0:
+                sleep(self.pause)
+            return result
+        return call
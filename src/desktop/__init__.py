@@ -1,55 +1,164 @@
-from uiautomation import Control, GetRootControl, ControlType, GetFocusedControl, SetWindowTopmost, IsTopLevelWindow, IsZoomed, IsIconic, IsWindowVisible, ControlFromHandle
-from src.desktop.config import EXCLUDED_CLASSNAMES,BROWSER_NAMES, AVOIDED_APPS
-from src.desktop.views import DesktopState,App,Size
-from fuzzywuzzy import process
-from psutil import Process
+from src.desktop.config import EXCLUDED_CLASSNAMES,BROWSER_NAMES, AVOIDED_APPS, FRAME_MAX_AGE, START_MENU_CACHE_PATH, START_MENU_REFRESH_INTERVAL, SHELL_POOL_SIZE, SHELL_TIMEOUT, SHELL_MAX_OUTPUT, APP_ALIASES, PROCESS_CACHE_SIZE, PROCESS_CACHE_TTL, TEXT_PASTE_THRESHOLD, TEXT_KEYS_THRESHOLD, TEXT_KEY_INTERVAL, CLIPBOARD_RESTORE_DELAY, PACING_PROFILE_PATH, PACING_MIN_PAUSE, PACING_MAX_PAUSE
+from src.desktop.capture import CaptureService
+from src.desktop.watch import PixelSample, sampled_hash, sequence_hash
+from src.desktop.start_menu import StartMenuIndex
+from src.desktop.app_index import AppNameIndex
+from src.desktop.processes import ProcessCache, ProcessInfo
+from src.desktop.pacing import PacingController, SettleResult
+from src.desktop.text_entry import TextEntry, InputBackend, PyAutoGUIBackend, EntryResult, Strategy
+from src.desktop.shell import ShellPool, POWERSHELL
+from src.desktop.stream import CommandResult, OutputCallback
+from src.desktop.views import DesktopState,App,Size,Window
 from src.tree import Tree
-from time import sleep
+from src.tree.handles import ElementHandles, ElementHandle
+from time import sleep, perf_counter, monotonic
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import TYPE_CHECKING
 from PIL import Image
-import subprocess
-import pyautogui
 import csv
 import io
+import os
+
+if TYPE_CHECKING:
+    # uiautomation is imported where it is used: loading it takes longer than the MCP handshake should wait
+    from uiautomation import Control
 
 class Desktop:
-    def __init__(self):
+    def __init__(self,capture:CaptureService|None=None,input_backend:InputBackend|None=None):
         self.desktop_state=None
+        self.handles=ElementHandles()
+        self.capture=capture
+        self.processes=ProcessCache(max_size=PROCESS_CACHE_SIZE,ttl=PROCESS_CACHE_TTL)
+        self.text_entry=TextEntry(backend=input_backend or PyAutoGUIBackend(),paste_threshold=TEXT_PASTE_THRESHOLD,keys_threshold=TEXT_KEYS_THRESHOLD,key_interval=TEXT_KEY_INTERVAL,restore_delay=CLIPBOARD_RESTORE_DELAY)
+        self.pacing=PacingController(path=PACING_PROFILE_PATH,min_pause=PACING_MIN_PAUSE,max_pause=PACING_MAX_PAUSE)
+        self.shell=ShellPool(dialect=POWERSHELL,size=SHELL_POOL_SIZE,timeout=SHELL_TIMEOUT,max_output=SHELL_MAX_OUTPUT)
+        self.background=ThreadPoolExecutor(max_workers=2,thread_name_prefix='desktop-init')
+        self.pipeline=ThreadPoolExecutor(max_workers=2,thread_name_prefix='desktop-state')
+        self.language_future:Future[str]|None=None
+        self.browser_future:Future[str|None]|None=None
+        self.aliases={alias:canonical for aliases in APP_ALIASES.values() for alias,canonical in aliases.items()}
+        self.app_index:AppNameIndex[App]|None=None
+        self.app_index_key:tuple|None=None
+        self.start_menu=StartMenuIndex(provider=self.get_start_menu_csv,cache_path=START_MENU_CACHE_PATH,refresh_interval=START_MENU_REFRESH_INTERVAL,aliases=self.aliases)
         
+    def start_background_init(self):
+        """Detect the UI language and default browser concurrently; results are awaited on first use."""
+        if self.language_future is None:
+            self.language_future=self.background.submit(self.get_default_language)
+        if self.browser_future is None:
+            self.browser_future=self.background.submit(self.get_default_browser)
+
+    @property
+    def default_language(self)->str:
+        self.start_background_init()
+        return self.language_future.result()
+
+    @property
+    def default_browser(self)->str|None:
+        self.start_background_init()
+        return self.browser_future.result()
+
     def get_state(self,use_vision:bool=False)->DesktopState:
+        """
+        Assemble the desktop state as a small pipeline instead of stage after stage.
+
+        After one settle delay the screenshot is captured on a worker thread while the windows are
+        enumerated and traversed, and the app list is built from the same window snapshot on a
+        second worker during the traversal; annotation and PNG encoding start once both the nodes and the
+        frame are available. With the background capture service a buffered frame captured since the
+        tree snapshot began is preferred once the traversal ends, so labels are never drawn over an
+        older screen; the worker's capture is only waited for when no such frame exists. Per-stage
+        durations (seconds) are returned in DesktopState.timings.
+        """
+        timings:dict[str,float]={}
+        def timed(stage:str,func,*args,**kwargs):
+            start=perf_counter()
+            try:
+                return func(*args,**kwargs)
+            finally:
+                timings[stage]=perf_counter()-start
+        start=perf_counter()
+        timed('settle',sleep,0.5)
+        snapshot_time=monotonic()
+        # Buffered frames predate the snapshot here, so the fallback capture starts with the traversal
+        screenshot_future=self.pipeline.submit(timed,'capture',self.take_screenshot,scale=0.5) if use_vision else None
         tree=Tree(self)
-        tree_state=tree.get_state()
+        # One enumeration of the top-level windows serves both the traversal and the app list
+        windows=timed('windows',self.get_windows)
+        # With a snapshot get_apps only reads its fields and the process cache, so no UI Automation call leaves this thread
+        apps_future=self.pipeline.submit(timed,'apps',self.get_apps,windows=windows)
+        tree_state=timed('tree',tree.get_state,windows=windows)
+        self.handles.update(tree_state)
+        apps=apps_future.result()
         if use_vision:
+            # One captured by the background service during the traversal is free; otherwise wait for the worker
+            frame=timed('frame',self.get_buffered_screenshot,scale=0.5,not_before=snapshot_time)
+            if frame is None:
+                frame=screenshot_future.result()
+            else:
+                screenshot_future.cancel()
             nodes=tree_state.interactive_nodes
-            annotated_screenshot=tree.annotated_screenshot(nodes=nodes,scale=0.5)
-            screenshot=self.screenshot_in_bytes(screenshot=annotated_screenshot)
+            annotated_screenshot=timed('annotate',tree.annotated_screenshot,nodes=nodes,scale=0.5,screenshot=frame)
+            screenshot=timed('encode',self.screenshot_in_bytes,screenshot=annotated_screenshot)
         else:
             screenshot=None
-        apps=self.get_apps()
+        timings['total']=perf_counter()-start
         active_app,apps=(apps[0],apps[1:]) if len(apps)>0 else (None,[])
-        self.desktop_state=DesktopState(apps=apps,active_app=active_app,screenshot=screenshot,tree_state=tree_state)
+        self.desktop_state=DesktopState(apps=apps,active_app=active_app,screenshot=screenshot,tree_state=tree_state,timings=timings)
         return self.desktop_state
     
     
-    def get_app_status(self,control:Control)->str:
-        if IsIconic(control.NativeWindowHandle):
+    def get_app_status(self,control:'Control')->str:
+        import uiautomation as ua
+        if ua.IsIconic(control.NativeWindowHandle):
             return 'Minimized'
-        elif IsZoomed(control.NativeWindowHandle):
+        elif ua.IsZoomed(control.NativeWindowHandle):
             return 'Maximized'
-        elif IsWindowVisible(control.NativeWindowHandle):
+        elif ua.IsWindowVisible(control.NativeWindowHandle):
             return 'Normal'
         else:
             return 'Hidden'
     
-    def get_window_element_from_element(self,element:Control)->Control|None:
+    def get_window_element_from_element(self,element:'Control')->'Control|None':
+        import uiautomation as ua
         while element is not None:
-            if IsTopLevelWindow(element.NativeWindowHandle):
+            if ua.IsTopLevelWindow(element.NativeWindowHandle):
                 return element
             element = element.GetParentControl()
         return None
 
-    def get_element_under_cursor(self)->Control:
-        return GetFocusedControl()
+    def type_text(self,text:str,strategy:Strategy='auto',sensitive:bool=False)->EntryResult:
+        return self.text_entry.enter(text,strategy=strategy,sensitive=sensitive)
+
+    def get_element_handle(self,label:int)->ElementHandle:
+        """Live element behind a State-Tool label, revalidated; raises ValueError for unknown or stale labels."""
+        return self.handles.get(label)
+
+    def get_foreground_target(self)->tuple[str,tuple[int,int,int,int]|None]:
+        """Pacing key (process name) and on-screen rectangle of the foreground window."""
+        import uiautomation as ua
+        try:
+            window=ua.GetForegroundControl()
+            info=self.get_process_info(window.ProcessId)
+            rect=window.BoundingRectangle
+            # Maximized windows extend a few pixels past the screen edges
+            region=(max(rect.left,0),max(rect.top,0),rect.right,rect.bottom) if not rect.isempty() else None
+            return (info.name.lower() if info is not None else window.ClassName or 'unknown'),region
+        except Exception:
+            return 'unknown',None
+
+    def settle_input(self)->SettleResult:
+        """
+        Wait after an input for as long as the foreground app has been observed to need. Its window is
+        compared with a tolerance, so a blinking caret does not count as the app still repainting.
+        """
+        app,region=self.get_foreground_target()
+        return self.pacing.settle(app,lambda:self.get_region_sample(region))
+
+    def get_element_under_cursor(self)->'Control':
+        import uiautomation as ua
+        return ua.GetFocusedControl()
     
     def get_default_browser(self):
         mapping = {
@@ -71,31 +180,35 @@ class Desktop:
         reader=csv.DictReader(io.StringIO(response))
         return "".join([row.get('DisplayName') for row in reader])
     
-    def get_apps_from_start_menu(self)->dict[str,str]:
+    def get_start_menu_csv(self)->str:
         command='Get-StartApps | ConvertTo-Csv -NoTypeInformation'
         apps_info,_=self.execute_command(command)
-        reader=csv.DictReader(io.StringIO(apps_info))
-        return {row.get('Name').lower():row.get('AppID') for row in reader}
+        return apps_info
+
+    def get_apps_from_start_menu(self)->dict[str,str]:
+        return self.start_menu.get_apps()
     
-    def execute_command(self,command:str)->tuple[str,int]:
-        try:
-            result = subprocess.run(['powershell', '-Command']+command.split(), 
-            capture_output=True, check=True)
-            return (result.stdout.decode('latin1'),result.returncode)
-        except subprocess.CalledProcessError as e:
-            return (e.stdout.decode('latin1'),e.returncode)
+    def execute_command(self,command:str,timeout:float|None=None)->tuple[str,int]:
+        return self.shell.execute(command,timeout=timeout)
+
+    async def execute_command_streaming(self,command:str,on_output:OutputCallback|None=None,timeout:float=60.0,max_output:int=100_000)->CommandResult:
+        return await self.shell.stream(command,on_output=on_output,timeout=timeout,max_output=max_output)
         
-    def is_app_browser(self,node:Control):
-        process=Process(node.ProcessId)
-        return process.name() in BROWSER_NAMES
+    def get_process_info(self,pid:int)->ProcessInfo|None:
+        return self.processes.get(pid)
+
+    def is_app_browser(self,process_id:int)->bool:
+        info=self.get_process_info(process_id)
+        return info is not None and info.name in BROWSER_NAMES
     
     def resize_app(self,name:str,size:tuple[int,int]=None,loc:tuple[int,int]=None)->tuple[str,int]:
         apps=self.get_apps()
-        matched_app:tuple[App,int]|None=process.extractOne(name,apps,score_cutoff=70)
+        matched_app=self.get_app_index(apps).match(name,score_cutoff=70)
         if matched_app is None:
             return (f'Application {name.title()} not open.',1)
-        app,_=matched_app
-        app_control=ControlFromHandle(app.handle)
+        _,app,_=matched_app
+        import uiautomation as ua
+        app_control=ua.ControlFromHandle(app.handle)
         if loc is None:
             x=app_control.BoundingRectangle.left
             y=app_control.BoundingRectangle.top
@@ -110,14 +223,13 @@ class Desktop:
         return (f'Application {name.title()} resized to {width}x{height} at {x},{y}.',0)
         
     def launch_app(self,name:str)->tuple[str,int]:
-        apps_map=self.get_apps_from_start_menu()
-        matched_app=process.extractOne(name,apps_map,score_cutoff=80)
+        matched_app=self.start_menu.lookup(name)
 
         # TODO: Handle the case of understanding the language of the app name
 
         if matched_app is None:
             return (f'Application {name.title()} not found in start menu.',1)
-        app_id,_,app_name=matched_app
+        app_name,app_id=matched_app
         if app_id.endswith('.exe'):
             _,status=self.execute_command(f'Start-Process "{app_id}"')
         else:
@@ -126,48 +238,89 @@ class Desktop:
         return response,status
     
     def switch_app(self,name:str)->tuple[str,int]:
-        apps={app.name:app for app in self.desktop_state.apps}
-        matched_app:tuple[str,float]=process.extractOne(name,apps,score_cutoff=70)
+        apps=self.desktop_state.apps if self.desktop_state is not None else self.get_apps()
+        matched_app=self.get_app_index(apps).match(name,score_cutoff=70)
         if matched_app is None:
             return (f'Application {name.title()} not found.',1)
-        app_name,_=matched_app
-        app=apps.get(app_name)
-        if SetWindowTopmost(app.handle,isTopmost=True):
+        app_name,app,_=matched_app
+        import uiautomation as ua
+        if ua.SetWindowTopmost(app.handle,isTopmost=True):
             return (f'{app_name.title()} switched to foreground.',0)
         else:
             return (f'Failed to switch to {app_name.title()}.',1)
     
-    def get_app_size(self,control:Control):
+    def get_app_index(self,apps:list[App])->AppNameIndex[App]:
+        # Rebuild only when the set of windows changed since the last lookup
+        key=tuple((app.name,app.handle) for app in apps)
+        if self.app_index is None or self.app_index_key!=key:
+            self.app_index=AppNameIndex([(app.name,app) for app in apps],aliases=self.aliases)
+            # The executable name finds windows whose title does not mention the app (msedge, cmd, explorer)
+            for app in apps:
+                if app.process_name:
+                    self.app_index.add(os.path.splitext(app.process_name)[0],app,canonical=app.name)
+            self.app_index_key=key
+        return self.app_index
+
+    def get_app_size(self,control:'Control'):
         window=control.BoundingRectangle
         if window.isempty():
             return Size(width=0,height=0)
         return Size(width=window.width(),height=window.height())
     
-    def is_app_visible(self,app)->bool:
-        is_minimized=self.get_app_status(app)!='Minimized'
-        size=self.get_app_size(app)
-        area=size.width*size.height
-        is_overlay=self.is_overlay_app(app)
+    def get_windows(self,settle:float=0.0)->list[Window]:
+        """
+        Snapshot of the top-level windows in z-order, enumerated once.
+
+        Name, class, status, size and pid are read a single time per window and emptiness is
+        checked with GetFirstChildControl instead of listing every child.
+        """
+        import uiautomation as ua
+        if settle>0:
+            sleep(settle)
+        windows=[]
+        for depth,element in enumerate(ua.GetRootControl().GetChildren()):
+            try:
+                windows.append(Window(
+                    control=element,
+                    name=element.Name,
+                    class_name=element.ClassName,
+                    control_type=element.ControlType,
+                    depth=depth,
+                    status=self.get_app_status(element),
+                    size=self.get_app_size(element),
+                    process_id=element.ProcessId,
+                    handle=element.NativeWindowHandle,
+                    has_children=element.GetFirstChildControl() is not None
+                ))
+            except Exception as ex:
+                # The window closed while it was being read
+                print(f"Error: {ex}")
+        return windows
+
+    def is_app_visible(self,window:Window)->bool:
+        is_minimized=window.status!='Minimized'
+        area=window.size.width*window.size.height
+        is_overlay=self.is_overlay_app(window)
         return not is_overlay and is_minimized and area>10
     
-    def is_overlay_app(self,element:Control) -> bool:
-        no_children = len(element.GetChildren()) == 0
-        is_name = "Overlay" in element.Name.strip()
+    def is_overlay_app(self,window:Window) -> bool:
+        no_children = not window.has_children
+        is_name = "Overlay" in window.name.strip()
         return no_children or is_name
         
-    def get_apps(self) -> list[App]:
+    def get_apps(self,windows:list[Window]|None=None) -> list[App]:
+        import uiautomation as ua
         try:
-            sleep(0.75)
-            desktop = GetRootControl()  # Get the desktop control
-            elements = desktop.GetChildren()
+            if windows is None:
+                windows=self.get_windows(settle=0.75)
             apps = []
-            for depth, element in enumerate(elements):
-                if element.ClassName in EXCLUDED_CLASSNAMES or element.Name in AVOIDED_APPS or self.is_overlay_app(element):
+            for window in windows:
+                if window.class_name in EXCLUDED_CLASSNAMES or window.name in AVOIDED_APPS or self.is_overlay_app(window):
                     continue
-                if element.ControlType in [ControlType.WindowControl, ControlType.PaneControl]:
-                    status = self.get_app_status(element)
-                    size=self.get_app_size(element)
-                    apps.append(App(name=element.Name, depth=depth, status=status, size=size, process_id=element.ProcessId, handle=element.NativeWindowHandle))
+                if window.control_type in [ua.ControlType.WindowControl, ua.ControlType.PaneControl]:
+                    # Same (pid, create_time) cache as the tree's browser check, so each process is resolved once per state
+                    info=self.get_process_info(window.process_id)
+                    apps.append(App(name=window.name, depth=window.depth, status=window.status, size=window.size, process_id=window.process_id, handle=window.handle, process_name=info.name if info is not None else ''))
         except Exception as ex:
             print(f"Error: {ex}")
             apps = []
@@ -179,8 +332,56 @@ class Desktop:
         bytes=io.getvalue()
         return bytes
 
-    def get_screenshot(self,scale:float=0.7)->Image.Image:
-        screenshot=pyautogui.screenshot()
+    def get_screenshot(self,scale:float=0.7,not_before:float|None=None)->Image.Image:
+        screenshot=self.get_buffered_screenshot(scale=scale,not_before=not_before)
+        return screenshot if screenshot is not None else self.take_screenshot(scale=scale)
+
+    def get_buffered_screenshot(self,scale:float=0.7,not_before:float|None=None)->Image.Image|None:
+        frame=self.capture.latest(max_age=FRAME_MAX_AGE,not_before=not_before) if self.capture is not None else None
+        return self.scale_screenshot(frame.image,scale) if frame is not None else None
+
+    def take_screenshot(self,scale:float=0.7)->Image.Image:
+        import pyautogui
+        return self.scale_screenshot(pyautogui.screenshot(),scale)
+
+    def scale_screenshot(self,screenshot:Image.Image,scale:float)->Image.Image:
         size=(screenshot.width*scale, screenshot.height*scale)
         screenshot.thumbnail(size=size, resample=Image.Resampling.LANCZOS)
-        return screenshot
\ No newline at end of file
+        return screenshot
+
+    def get_region_screenshot(self,region:tuple[int,int,int,int]|None=None)->Image.Image:
+        import pyautogui
+        if region is None:
+            return pyautogui.screenshot()
+        left,top,right,bottom=region
+        return pyautogui.screenshot(region=(left,top,right-left,bottom-top))
+
+    def get_region_fingerprint(self,region:tuple[int,int,int,int]|None=None)->int:
+        return sampled_hash(self.get_region_screenshot(region))
+
+    def get_region_sample(self,region:tuple[int,int,int,int]|None=None)->PixelSample:
+        return PixelSample(self.get_region_screenshot(region))
+
+    def get_windows_fingerprint(self)->int:
+        import uiautomation as ua
+        windows=[(element.NativeWindowHandle,element.Name) for element in ua.GetRootControl().GetChildren()]
+        return sequence_hash(windows)
+
+    def element_exists(self,name:str|None=None,control_type:str|None=None)->bool:
+        import uiautomation as ua
+        search_properties={}
+        if name:
+            search_properties['SubName']=name
+        if control_type:
+            control_type_name=control_type if control_type.endswith('Control') else f'{control_type.title()}Control'
+            control_type_id=getattr(ua.ControlType,control_type_name,None)
+            if control_type_id is None:
+                raise ValueError(f'Unknown control type {control_type}.')
+            search_properties['ControlType']=control_type_id
+        if not search_properties:
+            raise ValueError('Provide a name and/or a control type to look for.')
+        root=ua.GetForegroundControl() or ua.GetRootControl()
+        try:
+            return ua.Control(searchFromControl=root,**search_properties).Exists(maxSearchSeconds=0)
+        except Exception:
+            return False
@@ -0,0 +1,96 @@
+from typing import Generic, Iterable, Optional, TypeVar
+from collections import Counter
+from dataclasses import dataclass
+import unicodedata
+import re
+
+T=TypeVar('T')
+
+def normalize_name(name:str)->str:
+    """Case-fold, strip accents/punctuation and collapse whitespace so lookups ignore cosmetic differences."""
+    name=unicodedata.normalize('NFKD',name).casefold()
+    name=''.join(char for char in name if not unicodedata.combining(char))
+    name=re.sub(r'[^\w\s]',' ',name)
+    return ' '.join(name.split())
+
+def ngrams(text:str,n:int=3)->set[str]:
+    padded=f' {text} '
+    if len(padded)<=n:
+        return {padded}
+    return {padded[i:i+n] for i in range(len(padded)-n+1)}
+
+@dataclass
+class AppNameEntry(Generic[T]):
+    name:str
+    normalized:str
+    tokens:frozenset[str]
+    value:T
+
+class AppNameIndex(Generic[T]):
+    """
+    Fuzzy name -> value index for app names (start menu entries, open windows).
+
+    Names are normalized, tokenized and split into character n-grams once, when the index is built.
+    A query first tries an exact normalized/alias hit, then uses an n-gram inverted index to keep
+    only the few entries sharing the most n-grams with it, and runs the (slow) fuzzywuzzy WRatio
+    scorer on those alone instead of on every name.
+
+    Args:
+        items (Iterable[tuple[str, T]]): (display name, value) pairs
+        aliases (dict[str, str], optional): alias -> canonical name, e.g. localized app names
+        n (int, optional): n-gram size. Defaults to 3.
+        max_candidates (int, optional): Entries scored exactly per query. Defaults to 32.
+    """
+    def __init__(self,items:Iterable[tuple[str,T]],aliases:Optional[dict[str,str]]=None,n:int=3,max_candidates:int=32):
+        self.n=n
+        self.max_candidates=max_candidates
+        self.entries:list[AppNameEntry[T]]=[]
+        self.exact:dict[str,int]={}
+        self.inverted:dict[str,list[int]]={}
+        for name,value in items:
+            self.add(name,value)
+        for alias,canonical in (aliases or {}).items():
+            index=self.exact.get(normalize_name(canonical))
+            if index is not None:
+                self.add(alias,self.entries[index].value,canonical=self.entries[index].name)
+
+    def __len__(self)->int:
+        return len(self.entries)
+
+    def add(self,name:str,value:T,canonical:str|None=None):
+        normalized=normalize_name(name)
+        index=len(self.entries)
+        # Aliases resolve to the canonical entry's display name
+        self.entries.append(AppNameEntry(name=canonical or name,normalized=normalized,tokens=frozenset(normalized.split()),value=value))
+        self.exact.setdefault(normalized,index)
+        for gram in ngrams(normalized,self.n):
+            self.inverted.setdefault(gram,[]).append(index)
+
+    def candidates(self,normalized:str)->list[int]:
+        counts:Counter[int]=Counter()
+        for gram in ngrams(normalized,self.n):
+            for index in self.inverted.get(gram,()):
+                counts[index]+=1
+        tokens=set(normalized.split())
+        # Shared n-grams first, shared whole tokens break ties
+        ranked=sorted(counts.items(),key=lambda item:(item[1],len(tokens&self.entries[item[0]].tokens)),reverse=True)
+        return [index for index,_ in ranked[:self.max_candidates]]
+
+    def match(self,query:str,score_cutoff:int=70)->Optional[tuple[str,T,int]]:
+        """
+        Returns:
+            tuple[str, T, int] | None: (display name, value, score 0-100) of the best entry, or None below score_cutoff
+        """
+        from fuzzywuzzy import fuzz
+        normalized=normalize_name(query)
+        index=self.exact.get(normalized)
+        if index is not None:
+            entry=self.entries[index]
+            return entry.name,entry.value,100
+        best:Optional[tuple[str,T,int]]=None
+        for index in self.candidates(normalized):
+            entry=self.entries[index]
+            score=fuzz.WRatio(normalized,entry.normalized,force_ascii=False,full_process=False)
+            if score>=score_cutoff and (best is None or score>best[2]):
+                best=(entry.name,entry.value,score)
+        return best
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Callable,Optional
+from threading import Thread,Event,Lock
+from time import monotonic
+from PIL import Image
+
+FrameSource=Callable[[],Image.Image]
+
+@dataclass
+class Frame:
+    index:int
+    timestamp:float
+    image:Image.Image
+
+    def age(self)->float:
+        return monotonic()-self.timestamp
+
+class FrameRingBuffer:
+    """
+    Fixed number of preallocated images reused across frames.
+
+    Pixels are pasted straight into the oldest slot on write (no intermediate bytes copy of the
+    frame) and copied out of the newest slot on read, so memory stays at capacity frames no matter
+    how long the capture runs. Slots are only reallocated when the frame geometry or mode changes
+    (e.g. resolution switch).
+    """
+    def __init__(self,capacity:int=3):
+        if capacity<1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity=capacity
+        self.lock=Lock()
+        self.slots:list[Image.Image]=[]
+        self.timestamps:list[float]=[0.0]*capacity
+        self.indices:list[int]=[-1]*capacity
+        self.mode:str|None=None
+        self.size:tuple[int,int]|None=None
+        self.count=0
+
+    def _allocate(self,mode:str,size:tuple[int,int]):
+        self.slots=[Image.new(mode,size) for _ in range(self.capacity)]
+        self.timestamps=[0.0]*self.capacity
+        self.indices=[-1]*self.capacity
+        self.mode,self.size=mode,size
+
+    def write(self,image:Image.Image,timestamp:float)->int:
+        with self.lock:
+            if image.mode!=self.mode or image.size!=self.size:
+                self._allocate(image.mode,image.size)
+            slot=self.count%self.capacity
+            self.slots[slot].paste(image,(0,0))
+            self.timestamps[slot]=timestamp
+            self.indices[slot]=self.count
+            self.count+=1
+            return self.count-1
+
+    def latest(self)->Optional[Frame]:
+        with self.lock:
+            if self.count==0:
+                return None
+            slot=(self.count-1)%self.capacity
+            return Frame(index=self.indices[slot],timestamp=self.timestamps[slot],image=self.slots[slot].copy())
+
+    def frames(self)->list[Frame]:
+        """All buffered frames, oldest first."""
+        with self.lock:
+            start=max(0,self.count-self.capacity)
+            result=[]
+            for index in range(start,self.count):
+                slot=index%self.capacity
+                if self.indices[slot]!=index:
+                    continue
+                result.append(Frame(index=index,timestamp=self.timestamps[slot],image=self.slots[slot].copy()))
+            return result
+
+class CaptureService:
+    """
+    Background thread that keeps the most recent screen frames in a FrameRingBuffer.
+
+    The frame source is pluggable: it defaults to pyautogui.screenshot but any callable returning
+    a PIL image works, which is how a synthetic frame generator can drive it off Windows.
+    """
+    def __init__(self,source:FrameSource|None=None,fps:float=2.0,capacity:int=3):
+        if fps<=0:
+            raise ValueError("fps must be positive")
+        if source is None:
+            import pyautogui
+            source=pyautogui.screenshot
+        self.source=source
+        self.interval=1.0/fps
+        self.buffer=FrameRingBuffer(capacity=capacity)
+        self.stop_event=Event()
+        self.thread:Thread|None=None
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread=Thread(target=self.run,name='frame-capture',daemon=True)
+        self.thread.start()
+
+    def stop(self,timeout:float=2.0):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+            self.thread=None
+
+    def is_running(self)->bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            started=monotonic()
+            try:
+                # Stamped with the time the capture began: the pixels are at least that new
+                self.buffer.write(self.source(),timestamp=started)
+            except Exception as ex:
+                print(f"Error capturing frame: {ex}")
+            self.stop_event.wait(max(0.0,self.interval-(monotonic()-started)))
+
+    def latest(self,max_age:float|None=None,not_before:float|None=None)->Optional[Frame]:
+        """
+        Freshest buffered frame, or None if nothing was captured yet, it is older than max_age seconds
+        or its capture began before not_before (a monotonic() time, e.g. when a UI tree snapshot was taken).
+        """
+        frame=self.buffer.latest()
+        if frame is None or (max_age is not None and frame.age()>max_age):
+            return None
+        if not_before is not None and frame.timestamp<not_before:
+            return None
+        return frame
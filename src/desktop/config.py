@@ -1,4 +1,6 @@
 from typing import Set
+from pathlib import Path
+import os
 
 BROWSER_NAMES=set(['msedge.exe','chrome.exe','firefox.exe'])
 
@@ -8,4 +10,49 @@ AVOIDED_APPS:Set[str]=set([
 
 EXCLUDED_CLASSNAMES:Set[str]=set([
     'Progman','Shell_TrayWnd','Microsoft.UI.Content.PopupWindowSiteBridge','Windows.UI.Core.CoreWindow'
-])
\ No newline at end of file
+])
+
+# Background frame capture (optional): keeps a ring buffer of recent screenshots so vision calls
+# can reuse the freshest frame instead of capturing on the request path.
+FRAME_CAPTURE_ENABLED:bool=False
+FRAME_CAPTURE_FPS:float=2.0
+FRAME_CAPTURE_CAPACITY:int=3
+FRAME_MAX_AGE:float=1.0
+
+
+# Start Menu app index used by Launch-Tool: cached on disk and refreshed in the background.
+START_MENU_CACHE_PATH:Path=Path(os.environ.get('LOCALAPPDATA',Path.home()))/'windows-mcp'/'start_apps.json'
+START_MENU_REFRESH_INTERVAL:float=600.0
+
+# Persistent PowerShell sessions used by Desktop.execute_command.
+SHELL_POOL_SIZE:int=2
+SHELL_TIMEOUT:float=30.0
+SHELL_MAX_OUTPUT:int=1_000_000
+
+# Optional per-locale app name aliases (alias -> canonical app name) used when resolving app names.
+APP_ALIASES:dict[str,dict[str,str]]={
+    'zh-CN':{
+        '记事本':'notepad',
+        '计算器':'calculator',
+        '画图':'paint',
+        '文件资源管理器':'file explorer',
+        '设置':'settings',
+    }
+}
+
+# Process metadata cache shared by tree traversal and app listing.
+PROCESS_CACHE_SIZE:int=512
+PROCESS_CACHE_TTL:float=2.0
+
+# Type-Tool text entry: long text is pasted, short ASCII text typed key by key, the rest sent as unicode input.
+TEXT_PASTE_THRESHOLD:int=200
+TEXT_KEYS_THRESHOLD:int=32
+TEXT_KEY_INTERVAL:float=0.1
+CLIPBOARD_RESTORE_DELAY:float=0.15
+
+# Input pacing: pyautogui pauses INPUT_BASE_PAUSE after each call and the input tools then wait as long as the
+# target app was observed to need (learned per app, persisted in PACING_PROFILE_PATH).
+INPUT_BASE_PAUSE:float=0.05
+PACING_PROFILE_PATH:Path=Path(os.environ.get('LOCALAPPDATA',Path.home()))/'windows-mcp'/'pacing.json'
+PACING_MIN_PAUSE:float=0.05
+PACING_MAX_PAUSE:float=2.0
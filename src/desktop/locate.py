@@ -0,0 +1,132 @@
+from numpy.lib.stride_tricks import sliding_window_view
+from dataclasses import dataclass
+from PIL import Image
+import numpy as np
+
+@dataclass
+class Match:
+    left:int
+    top:int
+    width:int
+    height:int
+    score:float
+
+    @property
+    def center(self)->tuple[int,int]:
+        return (self.left+self.width//2,self.top+self.height//2)
+
+    def to_string(self)->str:
+        x,y=self.center
+        return f'Center: ({x},{y}) BoundingBox: ({self.left},{self.top},{self.left+self.width},{self.top+self.height}) Score: {self.score:.3f}'
+
+def to_gray(image:Image.Image)->np.ndarray:
+    return np.asarray(image.convert('L'),dtype=np.float32)
+
+def downsample(array:np.ndarray)->np.ndarray:
+    """Halve both dimensions with a 2x2 box filter."""
+    h,w=array.shape[0]//2,array.shape[1]//2
+    array=array[:h*2,:w*2]
+    return (array[0::2,0::2]+array[1::2,0::2]+array[0::2,1::2]+array[1::2,1::2])*np.float32(0.25)
+
+def window_sums(array:np.ndarray,h:int,w:int)->np.ndarray:
+    """Sum of every h*w window (valid positions only) using an integral image."""
+    integral=np.zeros((array.shape[0]+1,array.shape[1]+1),dtype=np.float64)
+    np.cumsum(np.cumsum(array,axis=0,dtype=np.float64),axis=1,out=integral[1:,1:])
+    return integral[h:,w:]-integral[:-h,w:]-integral[h:,:-w]+integral[:-h,:-w]
+
+def ncc_full(image:np.ndarray,template:np.ndarray)->np.ndarray:
+    """
+    Zero-mean normalized cross-correlation of template at every valid position of image.
+
+    The numerator is one FFT cross-correlation against the zero-mean template; the per-window
+    energy comes from integral images, so the cost is independent of the template size.
+    """
+    h,w=template.shape
+    H,W=image.shape
+    t=template-template.mean()
+    t_norm=np.sqrt(np.sum(t*t))
+    shape=(H,W)
+    numerator=np.fft.irfft2(np.fft.rfft2(image,shape)*np.conj(np.fft.rfft2(t,shape)),shape)[:H-h+1,:W-w+1]
+    n=h*w
+    s1=window_sums(image,h,w)
+    s2=window_sums(image*image,h,w)
+    variance=np.maximum(s2-(s1*s1)/n,0.0)
+    denominator=np.sqrt(variance)*t_norm
+    return np.where(denominator>1e-6,numerator/np.maximum(denominator,1e-6),0.0)
+
+def ncc_window(image:np.ndarray,template:np.ndarray,top:int,left:int,radius:int)->tuple[int,int,float]:
+    """Best NCC position within +/-radius pixels of (top, left), computed directly."""
+    h,w=template.shape
+    H,W=image.shape
+    y0,x0=max(0,top-radius),max(0,left-radius)
+    y1,x1=min(H-h,top+radius),min(W-w,left+radius)
+    if y1<y0 or x1<x0:
+        return top,left,-1.0
+    patch=image[y0:y1+h,x0:x1+w]
+    windows=sliding_window_view(patch,(h,w))
+    t=template-template.mean()
+    t_norm=np.sqrt(np.sum(t*t))
+    means=windows.mean(axis=(2,3),keepdims=True)
+    centered=windows-means
+    numerator=np.einsum('ijkl,kl->ij',centered,t)
+    denominator=np.sqrt(np.einsum('ijkl,ijkl->ij',centered,centered))*t_norm
+    scores=np.where(denominator>1e-6,numerator/np.maximum(denominator,1e-6),0.0)
+    dy,dx=np.unravel_index(np.argmax(scores),scores.shape)
+    return y0+int(dy),x0+int(dx),float(scores[dy,dx])
+
+def peaks(scores:np.ndarray,h:int,w:int,threshold:float,limit:int)->list[tuple[int,int,float]]:
+    """Greedy non-maximum suppression: repeatedly take the best score and blank its neighbourhood."""
+    scores=scores.copy()
+    result=[]
+    for _ in range(limit):
+        y,x=np.unravel_index(np.argmax(scores),scores.shape)
+        score=float(scores[y,x])
+        if score<threshold:
+            break
+        result.append((int(y),int(x),score))
+        scores[max(0,y-h//2):y+h//2+1,max(0,x-w//2):x+w//2+1]=-1.0
+    return result
+
+def locate(image:Image.Image,template:Image.Image,threshold:float=0.8,max_results:int=5,min_size:int=8,max_levels:int=4)->list[Match]:
+    """
+    Find template on image using coarse-to-fine normalized cross-correlation.
+
+    Both images are reduced with a 2x box-filter pyramid until the template's shorter side would
+    drop below min_size. The full NCC map is only computed at the coarsest level; the best
+    candidates are then refined level by level in a small neighbourhood, which keeps a 1080p
+    search in the tens of milliseconds on the CPU.
+
+    Args:
+        image (Image.Image): Image to search, e.g. a screenshot
+        template (Image.Image): Reference patch to find
+        threshold (float, optional): Minimum NCC score in [-1, 1] for a match. Defaults to 0.8.
+        max_results (int, optional): Maximum number of matches returned. Defaults to 5.
+        min_size (int, optional): Smallest template side allowed at the coarsest level. Defaults to 8.
+        max_levels (int, optional): Maximum number of pyramid reductions. Defaults to 4.
+
+    Returns:
+        list[Match]: Matches in image coordinates sorted by descending score
+    """
+    haystack,needle=to_gray(image),to_gray(template)
+    h,w=needle.shape
+    if h>haystack.shape[0] or w>haystack.shape[1]:
+        return []
+    images,templates=[haystack],[needle]
+    while len(images)<=max_levels and min(templates[-1].shape)//2>=min_size:
+        images.append(downsample(images[-1]))
+        templates.append(downsample(templates[-1]))
+    # Coarse scores are blurrier and lower, so keep more candidates with a looser threshold
+    level=len(images)-1
+    th,tw=templates[level].shape
+    coarse_threshold=threshold-0.2 if level>0 else threshold
+    candidates=peaks(ncc_full(images[level],templates[level]),th,tw,coarse_threshold,limit=max_results*4)
+    for level in range(level-1,-1,-1):
+        candidates=[ncc_window(images[level],templates[level],y*2,x*2,radius=2) for y,x,_ in candidates]
+    matches:list[Match]=[]
+    for y,x,score in sorted(candidates,key=lambda c:c[2],reverse=True):
+        if score<threshold or len(matches)>=max_results:
+            continue
+        if any(abs(m.top-y)<h//2 and abs(m.left-x)<w//2 for m in matches):
+            continue
+        matches.append(Match(left=x,top=y,width=w,height=h,score=score))
+    return matches
@@ -0,0 +1,153 @@
+from dataclasses import dataclass, asdict
+from typing import Any, Callable
+from threading import Lock
+from time import monotonic, sleep
+from pathlib import Path
+import json
+
+# Compared with ==: an exact hash, or a sample whose equality tolerates small changes (watch.PixelSample)
+Fingerprint=Callable[[],Any]
+
+@dataclass
+class PacingProfile:
+    estimate:float
+    deviation:float
+    samples:int=0
+
+@dataclass
+class SettleResult:
+    app:str
+    waited:float
+    measured:bool
+    settled:bool=True
+
+class PacingController:
+    """
+    Per-app wait after an input, learned from how long the app actually takes to settle.
+
+    While an app has fewer than warmup samples, and then every sample_every-th input, settle()
+    measures: it polls a fingerprint of the app (pixels of its window, or its tree) until it has
+    not changed for a quiet period and records when the last change happened. The estimate and
+    its mean deviation are exponential moving averages, and the other inputs just sleep
+    estimate + 2 * deviation + margin (clamped to [min_pause, max_pause]), so fast apps run near
+    full speed while slow ones keep a safe wait. Profiles are kept in a JSON file between runs.
+
+    Args:
+        path (Path, optional): Profile file; None keeps profiles in memory only
+        alpha (float, optional): Weight of a new sample in the moving averages. Defaults to 0.3.
+        margin (float, optional): Seconds added to every learned wait. Defaults to 0.05.
+        min_pause (float, optional): Lower bound of a wait. Defaults to 0.05.
+        max_pause (float, optional): Upper bound of a wait and of a measurement. Defaults to 2.0.
+        quiet (float, optional): Minimum unchanged time that counts as settled. Defaults to 0.15.
+        warmup (int, optional): Samples measured before an app's estimate is trusted. Defaults to 3.
+        sample_every (int, optional): Measure every n-th input afterwards. Defaults to 5.
+        poll_interval (float, optional): Delay between fingerprints while measuring. Defaults to 0.03.
+        save_interval (float, optional): Minimum seconds between profile writes. Defaults to 10.
+    """
+    def __init__(self,path:Path|None=None,alpha:float=0.3,margin:float=0.05,min_pause:float=0.05,max_pause:float=2.0,quiet:float=0.15,
+                 warmup:int=3,sample_every:int=5,poll_interval:float=0.03,save_interval:float=10.0):
+        self.path=path
+        self.alpha=alpha
+        self.margin=margin
+        self.min_pause=min_pause
+        self.max_pause=max_pause
+        self.quiet=quiet
+        self.warmup=warmup
+        self.sample_every=sample_every
+        self.poll_interval=poll_interval
+        self.save_interval=save_interval
+        self.lock=Lock()
+        self.profiles:dict[str,PacingProfile]={}
+        self.inputs:dict[str,int]={}
+        self.dirty=False
+        self.saved=monotonic()
+        self.load()
+
+    def pause_for(self,app:str)->float:
+        profile=self.profiles.get(app)
+        if profile is None:
+            return self.max_pause
+        return min(max(profile.estimate+2*profile.deviation+self.margin,self.min_pause),self.max_pause)
+
+    def should_measure(self,app:str)->bool:
+        profile=self.profiles.get(app)
+        if profile is None or profile.samples<self.warmup:
+            return True
+        return self.inputs.get(app,0)%self.sample_every==0
+
+    def settle(self,app:str,fingerprint:Fingerprint)->SettleResult:
+        """Wait until app is ready for the next input: measure and learn, or sleep the learned pause."""
+        with self.lock:
+            self.inputs[app]=self.inputs.get(app,0)+1
+            measure=self.should_measure(app)
+            pause=self.pause_for(app)
+        if not measure:
+            sleep(pause)
+            return SettleResult(app=app,waited=pause,measured=False)
+        start=monotonic()
+        settle_time,settled=self.measure(fingerprint)
+        self.record(app,settle_time)
+        return SettleResult(app=app,waited=monotonic()-start,measured=True,settled=settled)
+
+    def measure(self,fingerprint:Fingerprint)->tuple[float,bool]:
+        """
+        Returns:
+            tuple[float, bool]: (seconds until the last observed change, whether it went quiet before max_pause)
+        """
+        quiet=self.quiet
+        start=monotonic()
+        previous=fingerprint()
+        last_change=0.0
+        while True:
+            elapsed=monotonic()-start
+            if elapsed>=self.max_pause:
+                return self.max_pause,False
+            sleep(self.poll_interval)
+            current=fingerprint()
+            now=monotonic()-start
+            if current!=previous:
+                previous=current
+                last_change=now
+                # An app that repaints in steps needs a longer quiet window before it counts as settled
+                quiet=max(self.quiet,last_change/2)
+            elif now-last_change>=quiet:
+                return last_change,True
+
+    def record(self,app:str,settle_time:float):
+        with self.lock:
+            profile=self.profiles.get(app)
+            if profile is None:
+                profile=self.profiles[app]=PacingProfile(estimate=settle_time,deviation=settle_time/2)
+            else:
+                error=settle_time-profile.estimate
+                profile.estimate+=self.alpha*error
+                profile.deviation+=self.alpha*(abs(error)-profile.deviation)
+            profile.samples+=1
+            self.dirty=True
+            due=monotonic()-self.saved>=self.save_interval
+        if due:
+            self.save()
+
+    def load(self):
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            data=json.loads(self.path.read_text(encoding='utf-8'))
+            self.profiles={app:PacingProfile(**profile) for app,profile in data['apps'].items()}
+        except (OSError,ValueError,KeyError,TypeError) as ex:
+            print(f"Error loading pacing profiles: {ex}")
+
+    def save(self):
+        with self.lock:
+            if self.path is None or not self.dirty:
+                return
+            data={'apps':{app:asdict(profile) for app,profile in self.profiles.items()}}
+            self.dirty=False
+            self.saved=monotonic()
+        try:
+            self.path.parent.mkdir(parents=True,exist_ok=True)
+            temp_path=self.path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps(data,ensure_ascii=False),encoding='utf-8')
+            temp_path.replace(self.path)
+        except OSError as ex:
+            print(f"Error saving pacing profiles: {ex}")
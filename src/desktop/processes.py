@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+import psutil
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid:int
+    name:str
+    exe:str
+    create_time:float
+
+class ProcessCache:
+    """
+    Name/exe/create-time of processes, keyed by (pid, create_time) so a reused PID never returns
+    the metadata of the process that used to own it.
+
+    Within ttl seconds of a lookup a pid is answered from memory without any syscall; after that
+    only the create time is read to revalidate the entry. The cache is an LRU bounded to max_size
+    and entries of processes that have exited are pruned when it fills up.
+    """
+    def __init__(self,max_size:int=512,ttl:float=2.0):
+        self.max_size=max_size
+        self.ttl=ttl
+        self.lock=Lock()
+        self.entries:OrderedDict[tuple[int,float],ProcessInfo]=OrderedDict()
+        self.recent:dict[int,tuple[float,ProcessInfo]]={}
+
+    def get(self,pid:int)->ProcessInfo|None:
+        now=monotonic()
+        recent=self.recent.get(pid)
+        if recent is not None and now-recent[0]<self.ttl:
+            return recent[1]
+        try:
+            process=psutil.Process(pid)
+            key=(pid,process.create_time())
+            with self.lock:
+                info=self.entries.get(key)
+                if info is not None:
+                    self.entries.move_to_end(key)
+            if info is None:
+                with process.oneshot():
+                    try:
+                        exe=process.exe()
+                    except psutil.AccessDenied:
+                        exe=''
+                    info=ProcessInfo(pid=pid,name=process.name(),exe=exe,create_time=key[1])
+                with self.lock:
+                    self.entries[key]=info
+                    if len(self.entries)>self.max_size:
+                        self.prune()
+        except (psutil.NoSuchProcess,psutil.AccessDenied,psutil.ZombieProcess,ValueError):
+            with self.lock:
+                self.recent.pop(pid,None)
+            return None
+        with self.lock:
+            self.recent[pid]=(now,info)
+        return info
+
+    def prune(self):
+        """Drop entries of dead (or PID-reused) processes, then the least recently used ones. Caller holds the lock."""
+        for key in list(self.entries):
+            pid,create_time=key
+            try:
+                alive=psutil.Process(pid).create_time()==create_time
+            except (psutil.NoSuchProcess,psutil.AccessDenied,psutil.ZombieProcess,ValueError):
+                alive=False
+            if not alive:
+                del self.entries[key]
+        # Trim below the bound so the next full scan is amortized over many inserts
+        while len(self.entries)>self.max_size*3//4:
+            self.entries.popitem(last=False)
+        live={pid for pid,_ in self.entries}
+        self.recent={pid:value for pid,value in self.recent.items() if pid in live}
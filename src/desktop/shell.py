@@ -0,0 +1,348 @@
+from src.desktop.stream import CommandResult, HeadTailBuffer, OutputCallback, OutputDecoder, new_process_group_options, kill_process_tree
+from typing import Callable
+from threading import Thread, Lock
+from dataclasses import dataclass
+from queue import Queue, Empty
+from time import monotonic
+from uuid import uuid4
+import subprocess
+import asyncio
+import socket
+import base64
+
+# Seconds a new interpreter has to connect back to its command channel
+START_TIMEOUT=20.0
+# Largest read from the interpreter's stdout; a command printing one huge line is still read in pieces
+READ_SIZE=65536
+
+@dataclass
+class ShellDialect:
+    """
+    How to talk to an interpreter: the command line that starts it (given the port of the local
+    command channel and a token it sends back first), and how to wrap a command so that it is
+    followed by a sentinel line on stdout that carries the exit status. Commands are shipped base64
+    encoded on a single line, so quotes, newlines and non-ASCII text reach the interpreter untouched.
+
+    Commands arrive over a loopback socket rather than stdin. The interpreter's stdin is the null
+    device, so a command that reads input (cat, Read-Host, a native tool waiting for a key) sees
+    end of file at once instead of consuming the protocol.
+
+    Every command runs isolated, as it would in a fresh process: its working directory, variables,
+    error preferences and environment changes are discarded afterwards, and exit / set -e end only
+    the command, not the session.
+    """
+    launch:Callable[[int,str],list[str]]
+    template:str
+
+    def wrap(self,command:str,sentinel:str)->str:
+        encoded=base64.b64encode(command.encode('utf-8')).decode('ascii')
+        return self.template.format(encoded=encoded,sentinel=sentinel)
+
+def powershell_args(command:str)->list[str]:
+    """Command line for a one-shot PowerShell run; -EncodedCommand keeps quoting intact."""
+    script=f"[Console]::OutputEncoding=[Text.Encoding]::UTF8; $ProgressPreference='SilentlyContinue'; {command}"
+    encoded=base64.b64encode(script.encode('utf-16-le')).decode('ascii')
+    return ['powershell','-NoLogo','-NoProfile','-NonInteractive','-EncodedCommand',encoded]
+
+# Runs one command in a runspace of its own, so locations, variables, preferences and `exit` stay
+# inside it; process environment variables are restored afterwards. The next runspace is opened in
+# the background while the session is idle.
+POWERSHELL_RUNNER=r"""
+function __NewRunspace {
+    $runspace=[RunspaceFactory]::CreateRunspace([Management.Automation.Runspaces.InitialSessionState]::CreateDefault2())
+    $runspace.OpenAsync()
+    $runspace
+}
+$global:__next=__NewRunspace
+function __Run($encoded,$sentinel) {
+    $environment=@{}
+    foreach ($item in [Environment]::GetEnvironmentVariables().GetEnumerator()) { $environment[$item.Key]=$item.Value }
+    $runspace=$global:__next
+    while ($runspace.RunspaceStateInfo.State -eq 'Opening' -or $runspace.RunspaceStateInfo.State -eq 'BeforeOpen') { Start-Sleep -Milliseconds 5 }
+    $ps=[PowerShell]::Create()
+    $ps.Runspace=$runspace
+    $status=0
+    try {
+        $script=[Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($encoded))
+        [void]$ps.AddScript($script).AddCommand('Out-String').AddParameter('Stream',$true).AddParameter('Width',4096)
+        $inputs=New-Object 'Management.Automation.PSDataCollection[psobject]'
+        $inputs.Complete()
+        $outputs=New-Object 'Management.Automation.PSDataCollection[psobject]'
+        $handle=$ps.BeginInvoke($inputs,$outputs)
+        do {
+            $done=$handle.AsyncWaitHandle.WaitOne(25)
+            foreach ($item in $outputs.ReadAll()) { [Console]::Out.WriteLine($item) }
+            foreach ($item in $ps.Streams.Error.ReadAll()) { [Console]::Out.WriteLine(($item | Out-String).TrimEnd()) }
+        } until ($done)
+        [void]$ps.EndInvoke($handle)
+        $code=$runspace.SessionStateProxy.GetVariable('LASTEXITCODE')
+        if ($code) { $status=$code } elseif ($ps.HadErrors) { $status=1 }
+    } catch {
+        $exception=$_.Exception
+        if ($exception.InnerException) { $exception=$exception.InnerException }
+        if ($exception -is [Management.Automation.ExitException]) { $status=[int]$exception.Argument }
+        else { [Console]::Out.WriteLine($exception.Message); $status=1 }
+    } finally {
+        $ps.Dispose()
+        $runspace.Dispose()
+        foreach ($name in @([Environment]::GetEnvironmentVariables().Keys)) { if (-not $environment.ContainsKey($name)) { [Environment]::SetEnvironmentVariable($name,$null) } }
+        foreach ($name in $environment.Keys) { [Environment]::SetEnvironmentVariable($name,$environment[$name]) }
+        $global:__next=__NewRunspace
+    }
+    [Console]::Out.WriteLine("$sentinel $status")
+}
+"""
+
+# Connects to the command channel, sends the token, then runs every line it receives
+POWERSHELL_LOOP=(
+    "$__client=New-Object Net.Sockets.TcpClient('127.0.0.1',{port}); $__stream=$__client.GetStream(); "
+    "$__hello=[Text.Encoding]::ASCII.GetBytes(\"{token}`n\"); $__stream.Write($__hello,0,$__hello.Length); "
+    "$__reader=New-Object IO.StreamReader($__stream,(New-Object Text.UTF8Encoding $false)); "
+    "while ($null -ne ($__line=$__reader.ReadLine())) {{ Invoke-Expression $__line }}"
+)
+
+POWERSHELL=ShellDialect(
+    launch=lambda port,token:powershell_args(POWERSHELL_RUNNER+POWERSHELL_LOOP.format(port=port,token=token)),
+    template="__Run '{encoded}' '{sentinel}'"
+)
+
+BASH=ShellDialect(
+    launch=lambda port,token:['bash','--noprofile','--norc','-c',
+                              f"exec 3<>/dev/tcp/127.0.0.1/{port} && echo {token} >&3 && while IFS= read -r __line <&3; do eval \"$__line\"; done"],
+    # The subshell keeps cd, variables, set -e and exit inside the command; 3<&- keeps the channel away from it
+    template="( eval \"$(printf %s '{encoded}' | base64 -d)\" ) 2>&1 3<&-; echo \"{sentinel} $?\""
+)
+
+def partial_marker(data:bytes,marker:bytes)->int:
+    """Length of the longest end of data that is a start of marker (0 when the output cannot be the sentinel yet)."""
+    for length in range(min(len(marker)-1,len(data)),0,-1):
+        if data.endswith(marker[:length]):
+            return length
+    return 0
+
+class ShellSession:
+    """
+    One long-lived interpreter process. A reader thread drains stdout into a queue in chunks of at
+    most READ_SIZE bytes so that reads can time out on every platform (Windows pipes do not support
+    select) and no single line has to be held in memory whole. The interpreter runs in
+    its own process group, so closing the session also kills whatever a command started.
+    """
+    def __init__(self,dialect:ShellDialect):
+        self.dialect=dialect
+        self.process:subprocess.Popen|None=None
+        self.channel:socket.socket|None=None
+        self.chunks:Queue[bytes|None]=Queue()
+
+    def is_alive(self)->bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        token=uuid4().hex
+        with socket.create_server(('127.0.0.1',0)) as listener:
+            listener.settimeout(0.5)
+            self.process=subprocess.Popen(self.dialect.launch(listener.getsockname()[1],token),stdin=subprocess.DEVNULL,stdout=subprocess.PIPE,
+                                          stderr=subprocess.STDOUT,**new_process_group_options())
+            self.chunks=Queue()
+            Thread(target=self.read,args=(self.process.stdout,self.chunks),daemon=True).start()
+            deadline=monotonic()+START_TIMEOUT
+            while self.channel is None:
+                if self.process.poll() is not None or monotonic()>deadline:
+                    self.close()
+                    raise OSError('Shell session did not connect to its command channel.')
+                try:
+                    connection,_=listener.accept()
+                except TimeoutError:
+                    continue
+                # Anything else on the loopback interface could have connected first
+                if self.receive_line(connection)==token.encode('ascii'):
+                    connection.settimeout(None)
+                    self.channel=connection
+                else:
+                    connection.close()
+
+    def receive_line(self,connection:socket.socket)->bytes:
+        connection.settimeout(START_TIMEOUT)
+        data=b''
+        try:
+            while not data.endswith(b'\n') and len(data)<128:
+                chunk=connection.recv(128-len(data))
+                if not chunk:
+                    break
+                data+=chunk
+        except OSError:
+            pass
+        return data.strip()
+
+    def read(self,stream,chunks:Queue):
+        for chunk in iter(lambda:stream.read1(READ_SIZE),b''):
+            chunks.put(chunk)
+        chunks.put(None)
+
+    def write(self,line:str):
+        self.channel.sendall(line.encode('utf-8')+b'\n')
+
+    def close(self):
+        if self.channel is not None:
+            self.channel.close()
+            self.channel=None
+        if self.process is None:
+            return
+        kill_process_tree(self.process.pid)
+        try:
+            self.process.wait(timeout=2)
+        except Exception:
+            pass
+        self.process=None
+
+    def cancel(self):
+        """Kill the interpreter and its children from another thread; run() then returns."""
+        process=self.process
+        if process is not None:
+            kill_process_tree(process.pid)
+
+    def run(self,command:str,timeout:float,max_output:int,on_output:Callable[[bytes],None]|None=None)->CommandResult:
+        """
+        Run one command. Its output is passed chunk by chunk to on_output as it arrives, and the
+        result keeps the first and last max_output/2 bytes of it (HeadTailBuffer). On timeout or
+        interpreter crash the session and every process the command started are killed, and the
+        session is restarted on next use; the status is then 124 (timeout) or the interpreter's
+        exit code.
+        """
+        start=monotonic()
+        if not self.is_alive():
+            self.close()
+            try:
+                self.start()
+            except OSError as e:
+                return CommandResult(output=f'Shell session could not be started: {e}',status=-1,duration=monotonic()-start)
+        sentinel=f'__MCP_END_{uuid4().hex}__'
+        marker=sentinel.encode('ascii')
+        buffer=HeadTailBuffer(max_output)
+        def append(data:bytes):
+            buffer.append(data)
+            if on_output is not None and data:
+                on_output(data)
+        try:
+            self.write(self.dialect.wrap(command,sentinel))
+        except OSError:
+            self.close()
+            return CommandResult(output='Shell session crashed before the command could be sent.',status=-1,duration=monotonic()-start)
+        deadline=start+timeout
+        # Output not yet passed on: a tail that could be the start of the sentinel, or the sentinel line itself
+        pending=b''
+        while True:
+            try:
+                chunk=self.chunks.get(timeout=max(0.0,deadline-monotonic()))
+            except Empty:
+                self.close()
+                append(pending)
+                return CommandResult(output=buffer.render(),status=124,duration=monotonic()-start,truncated=buffer.dropped,timed_out=True)
+            if chunk is None:
+                try:
+                    status=self.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    status=-1
+                self.close()
+                append(pending)
+                output=buffer.render()+f'\nShell session exited with code {status}.'
+                return CommandResult(output=output,status=status or -1,duration=monotonic()-start,truncated=buffer.dropped)
+            data=pending+chunk
+            index=data.find(marker)
+            if index==-1:
+                keep=partial_marker(data,marker)
+                append(data[:len(data)-keep])
+                pending=data[len(data)-keep:]
+                continue
+            append(data[:index])
+            pending=data[index:]
+            end=pending.find(b'\n')
+            if end==-1:
+                continue
+            try:
+                status=int(pending[len(marker):end].strip() or 0)
+            except ValueError:
+                status=1
+            return CommandResult(output=buffer.render(),status=status,duration=monotonic()-start,truncated=buffer.dropped)
+
+    def execute(self,command:str,timeout:float,max_output:int)->tuple[str,int]:
+        """run() for callers that only need (output, status); a timeout is noted in the output."""
+        result=self.run(command,timeout=timeout,max_output=max_output)
+        if result.timed_out:
+            return (result.output+f'\nCommand timed out after {timeout} seconds.',result.status)
+        return (result.output,result.status)
+
+class ShellPool:
+    """
+    Pool of persistent ShellSessions shared by all tools. Sessions are created lazily up to size
+    and handed out one command at a time, so concurrent callers never interleave on one session.
+    """
+    def __init__(self,dialect:ShellDialect=POWERSHELL,size:int=2,timeout:float=30.0,max_output:int=1_000_000):
+        self.dialect=dialect
+        self.size=size
+        self.timeout=timeout
+        self.max_output=max_output
+        self.idle:Queue[ShellSession]=Queue()
+        self.created=0
+        self.lock=Lock()
+        self.sessions:list[ShellSession]=[]
+
+    def acquire(self)->ShellSession:
+        try:
+            return self.idle.get_nowait()
+        except Empty:
+            pass
+        with self.lock:
+            if self.created<self.size:
+                self.created+=1
+                session=ShellSession(self.dialect)
+                self.sessions.append(session)
+                return session
+        return self.idle.get()
+
+    def release(self,session:ShellSession):
+        self.idle.put(session)
+
+    def execute(self,command:str,timeout:float|None=None,max_output:int|None=None)->tuple[str,int]:
+        session=self.acquire()
+        try:
+            return session.execute(command,timeout=timeout or self.timeout,max_output=max_output or self.max_output)
+        finally:
+            self.release(session)
+
+    async def stream(self,command:str,on_output:OutputCallback|None=None,timeout:float|None=None,max_output:int|None=None)->CommandResult:
+        """
+        Run a command on a pooled session without blocking the event loop, awaiting on_output with
+        (text, total bytes so far) for every chunk of output as it arrives. Cancelling the caller kills the
+        command's process tree; the session restarts on next use.
+        """
+        loop=asyncio.get_running_loop()
+        acquiring=loop.run_in_executor(None,self.acquire)
+        try:
+            session=await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            acquiring.add_done_callback(lambda future:self.release(future.result()))
+            raise
+        chunks:asyncio.Queue[bytes|None]=asyncio.Queue()
+        def on_chunk(data:bytes):
+            loop.call_soon_threadsafe(chunks.put_nowait,data)
+        def run()->CommandResult:
+            try:
+                return session.run(command,timeout=timeout or self.timeout,max_output=max_output or self.max_output,on_output=on_chunk if on_output else None)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait,None)
+                self.release(session)
+        running=loop.run_in_executor(None,run)
+        decoder=OutputDecoder()
+        total=0
+        try:
+            while (data:=await chunks.get()) is not None:
+                total+=len(data)
+                await on_output(decoder.decode(data),total)
+            return await running
+        except asyncio.CancelledError:
+            session.cancel()
+            raise
+
+    def close(self):
+        for session in self.sessions:
+            session.close()
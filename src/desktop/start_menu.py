@@ -0,0 +1,133 @@
+from threading import Thread, Event, Lock
+from typing import Callable, Optional
+from time import time
+from pathlib import Path
+from src.desktop.app_index import AppNameIndex
+import json
+import csv
+import io
+
+StartMenuProvider=Callable[[],str]
+
+def parse_start_apps(csv_text:str)->dict[str,str]:
+    """Parse `Get-StartApps | ConvertTo-Csv` output into {lower-cased name: AppID}."""
+    reader=csv.DictReader(io.StringIO(csv_text))
+    return {row.get('Name').lower():row.get('AppID') for row in reader if row.get('Name') and row.get('AppID')}
+
+class StartMenuIndex:
+    """
+    In-memory index of the Start Menu apps, persisted to a JSON cache file.
+
+    The provider returns the raw CSV of `Get-StartApps`; it is the only part that talks to
+    PowerShell, so the index can be driven by a canned CSV. The cache is loaded at start() and a
+    background thread refreshes it right away and then every refresh_interval seconds. Lookups
+    never spawn a process unless the name is missing and the index is older than min_refresh_age.
+    """
+    def __init__(self,provider:StartMenuProvider,cache_path:Path|None=None,refresh_interval:float=600.0,min_refresh_age:float=30.0,aliases:dict[str,str]|None=None):
+        self.provider=provider
+        self.aliases=aliases
+        self.cache_path=cache_path
+        self.refresh_interval=refresh_interval
+        self.min_refresh_age=min_refresh_age
+        self.apps:dict[str,str]={}
+        self.index:AppNameIndex[str]=AppNameIndex([])
+        self.updated:float=0.0
+        self.loaded=Event()
+        self.refresh_lock=Lock()
+        self.stop_event=Event()
+        self.wake_event=Event()
+        self.thread:Thread|None=None
+
+    def set_apps(self,apps:dict[str,str],updated:float):
+        # Build the new tables first and swap references, so readers never see a half-built index
+        index=AppNameIndex(apps.items(),aliases=self.aliases)
+        self.apps,self.index,self.updated=apps,index,updated
+        self.loaded.set()
+
+    def load_cache(self)->bool:
+        if self.cache_path is None or not self.cache_path.is_file():
+            return False
+        try:
+            data=json.loads(self.cache_path.read_text(encoding='utf-8'))
+            self.set_apps(dict(data['apps']),float(data['updated']))
+            return True
+        except (OSError,ValueError,KeyError,TypeError) as ex:
+            print(f"Error loading start menu cache: {ex}")
+            return False
+
+    def save_cache(self):
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True,exist_ok=True)
+            temp_path=self.cache_path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps({'updated':self.updated,'apps':self.apps},ensure_ascii=False),encoding='utf-8')
+            temp_path.replace(self.cache_path)
+        except OSError as ex:
+            print(f"Error saving start menu cache: {ex}")
+
+    def refresh(self)->bool:
+        with self.refresh_lock:
+            return self._refresh()
+
+    def _refresh(self)->bool:
+        try:
+            apps=parse_start_apps(self.provider())
+        except Exception as ex:
+            print(f"Error refreshing start menu index: {ex}")
+            return False
+        if not apps:
+            return False
+        self.set_apps(apps,time())
+        self.save_cache()
+        return True
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.load_cache()
+        self.stop_event.clear()
+        self.thread=Thread(target=self.run,name='start-menu-index',daemon=True)
+        self.thread.start()
+
+    def stop(self,timeout:float=2.0):
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+            self.thread=None
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.refresh()
+            self.wake_event.wait(self.refresh_interval)
+            self.wake_event.clear()
+
+    def get_apps(self)->dict[str,str]:
+        if not self.loaded.is_set() and not self.load_cache():
+            # Not started yet, or the first background build is still running: build or wait for it once
+            with self.refresh_lock:
+                if not self.loaded.is_set():
+                    self._refresh()
+        return self.apps
+
+    def match(self,name:str)->Optional[tuple[str,str]]:
+        self.get_apps()
+        matched_app=self.index.match(name,score_cutoff=80)
+        if matched_app is None:
+            return None
+        app_name,app_id,_=matched_app
+        return app_name,app_id
+
+    def lookup(self,name:str)->Optional[tuple[str,str]]:
+        """
+        Resolve an app name to (start menu name, AppID).
+
+        A miss on an index older than min_refresh_age refreshes it once and retries, so apps
+        installed after the last refresh are still found.
+        """
+        matched_app=self.match(name)
+        if matched_app is None and time()-self.updated>self.min_refresh_age:
+            if self.refresh():
+                matched_app=self.match(name)
+        return matched_app
@@ -0,0 +1,148 @@
+from typing import Awaitable, Callable
+from dataclasses import dataclass
+import subprocess
+import codecs
+import locale
+import signal
+import os
+
+OutputCallback=Callable[[str,int],Awaitable[None]]
+
+@dataclass
+class CommandResult:
+    output:str
+    status:int
+    duration:float
+    truncated:int=0
+    timed_out:bool=False
+
+class HeadTailBuffer:
+    """
+    Keeps the first and the last max_bytes/2 bytes of a stream and counts what falls in between,
+    so a chatty command can never grow the result past max_bytes while both the start (usually
+    the interesting part) and the end (errors, summary) survive.
+    """
+    def __init__(self,max_bytes:int):
+        self.head_limit=max_bytes//2
+        self.tail_limit=max_bytes-self.head_limit
+        self.head=bytearray()
+        self.tail=bytearray()
+        self.dropped=0
+
+    def append(self,data:bytes):
+        room=self.head_limit-len(self.head)
+        if room>0:
+            self.head+=data[:room]
+            data=data[room:]
+        if not data:
+            return
+        self.tail+=data
+        overflow=len(self.tail)-self.tail_limit
+        if overflow>0:
+            del self.tail[:overflow]
+            self.dropped+=overflow
+
+    def render(self)->str:
+        if not self.dropped:
+            return decode_output(bytes(self.head+self.tail))
+        # Both parts come from one stream: one encoding, and cut points moved to character boundaries
+        head=bytes(self.head)
+        tail=character_boundary(bytes(self.tail),len(self.head)+self.dropped,output_encoding(head))
+        encoding=output_encoding(head,tail)
+        head_text=codecs.getincrementaldecoder(encoding)(errors='replace').decode(head)
+        tail_text=tail.decode(continuation_encoding(encoding,head),errors='replace')
+        return head_text+f'\n... [{self.dropped} bytes truncated] ...\n'+tail_text
+
+BOMS=((codecs.BOM_UTF8,'utf-8-sig'),(codecs.BOM_UTF16_LE,'utf-16'),(codecs.BOM_UTF16_BE,'utf-16'))
+
+def fallback_encoding()->str:
+    """The console (OEM) code page on Windows, the locale encoding elsewhere."""
+    encoding='oem' if os.name=='nt' else locale.getpreferredencoding(False)
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return 'latin1'
+    return encoding
+
+def is_utf8(data:bytes)->bool:
+    """Valid UTF-8, allowing a character cut off at the end."""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def output_encoding(head:bytes,*rest:bytes)->str:
+    """
+    Encoding of a whole output stream, chosen once from what is kept of it (head first): a BOM,
+    else UTF-8 if every part is valid UTF-8, else the fallback encoding.
+    """
+    for bom,encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    if is_utf8(head) and all(is_utf8(part) for part in rest):
+        return 'utf-8'
+    return fallback_encoding()
+
+def continuation_encoding(encoding:str,head:bytes)->str:
+    """Codec for a part that starts mid-stream, past the BOM at the start of head."""
+    if encoding=='utf-8-sig':
+        return 'utf-8'
+    if encoding=='utf-16':
+        return 'utf-16-le' if head.startswith(codecs.BOM_UTF16_LE) else 'utf-16-be'
+    return encoding
+
+def character_boundary(data:bytes,offset:int,encoding:str)->bytes:
+    """Drop the bytes of a character cut at the start of data, which begins at offset in the stream."""
+    if encoding.startswith('utf-8'):
+        skip=0
+        while skip<min(3,len(data)) and 0x80<=data[skip]<0xC0:
+            skip+=1
+        return data[skip:]
+    if encoding=='utf-16' and offset%2:
+        return data[1:]
+    return data
+
+def decode_output(data:bytes)->str:
+    """Decode a complete process output with output_encoding."""
+    return data.decode(output_encoding(data),errors='replace')
+
+class OutputDecoder:
+    """
+    Incremental decoding of a process output stream as it arrives: the BOM's encoding, else
+    UTF-8, switching to the fallback encoding for the rest of the stream at the first byte that
+    is not UTF-8 (instead of replacing characters chunk by chunk).
+    """
+    def __init__(self):
+        self.decoder:codecs.IncrementalDecoder|None=None
+        self.strict=False
+
+    def decode(self,data:bytes)->str:
+        if self.decoder is None:
+            encoding=next((encoding for bom,encoding in BOMS if data.startswith(bom)),None)
+            self.strict=encoding is None
+            self.decoder=codecs.getincrementaldecoder(encoding or 'utf-8')(errors='strict' if self.strict else 'replace')
+        if not self.strict:
+            return self.decoder.decode(data)
+        try:
+            return self.decoder.decode(data)
+        except UnicodeDecodeError:
+            buffered,_=self.decoder.getstate()
+            self.strict=False
+            self.decoder=codecs.getincrementaldecoder(fallback_encoding())(errors='replace')
+            return self.decoder.decode(buffered+data)
+
+def new_process_group_options()->dict:
+    """Start the child in its own process group so the whole tree can be killed at once."""
+    if os.name=='nt':
+        return {'creationflags':subprocess.CREATE_NEW_PROCESS_GROUP|subprocess.CREATE_NO_WINDOW}
+    return {'start_new_session':True}
+
+def kill_process_tree(pid:int):
+    try:
+        if os.name=='nt':
+            subprocess.run(['taskkill','/F','/T','/PID',str(pid)],capture_output=True)
+        else:
+            os.killpg(pid,signal.SIGKILL)
+    except (OSError,ProcessLookupError):
+        pass
@@ -0,0 +1,167 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Literal, Optional
+from time import perf_counter, sleep
+import string
+
+Strategy=Literal['auto','paste','unicode','keys']
+
+# Characters pyautogui.typewrite can produce with plain key presses; anything else is silently dropped by it
+TYPEABLE=frozenset(string.ascii_letters+string.digits+string.punctuation+' \n\t')
+
+class InputBackend(ABC):
+    """The primitive input operations TextEntry is built on; swap in a fake to observe or time entry."""
+    @abstractmethod
+    def type_keys(self,text:str,interval:float):
+        """Press one key per character, waiting interval seconds between presses."""
+
+    @abstractmethod
+    def send_unicode(self,text:str):
+        """Inject the text as unicode character events, independent of the keyboard layout."""
+
+    @abstractmethod
+    def hotkey(self,*keys:str):
+        ...
+
+    @abstractmethod
+    def get_clipboard(self)->Optional[str]:
+        """Current clipboard text, or None when it holds no text."""
+
+    @abstractmethod
+    def set_clipboard(self,text:str):
+        ...
+
+    def sleep(self,seconds:float):
+        sleep(seconds)
+
+class PyAutoGUIBackend(InputBackend):
+    """Keys through pyautogui, unicode through user32 SendInput, clipboard through pyperclip."""
+    def __init__(self,chunk_size:int=64):
+        self.chunk_size=chunk_size
+
+    def type_keys(self,text:str,interval:float):
+        import pyautogui
+        pyautogui.typewrite(text,interval=interval)
+
+    def hotkey(self,*keys:str):
+        import pyautogui
+        pyautogui.hotkey(*keys)
+
+    def get_clipboard(self)->Optional[str]:
+        import pyperclip
+        try:
+            return pyperclip.paste()
+        except pyperclip.PyperclipException:
+            return None
+
+    def set_clipboard(self,text:str):
+        import pyperclip
+        pyperclip.copy(text)
+
+    def send_unicode(self,text:str):
+        import ctypes
+        from ctypes import wintypes
+        INPUT_KEYBOARD,KEYEVENTF_KEYUP,KEYEVENTF_UNICODE,VK_RETURN=1,0x0002,0x0004,0x0D
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_=[('wVk',wintypes.WORD),('wScan',wintypes.WORD),('dwFlags',wintypes.DWORD),('time',wintypes.DWORD),('dwExtraInfo',ctypes.c_size_t)]
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_=[('dx',wintypes.LONG),('dy',wintypes.LONG),('mouseData',wintypes.DWORD),('dwFlags',wintypes.DWORD),('time',wintypes.DWORD),('dwExtraInfo',ctypes.c_size_t)]
+        class INPUTUNION(ctypes.Union):
+            _fields_=[('ki',KEYBDINPUT),('mi',MOUSEINPUT)]
+        class INPUT(ctypes.Structure):
+            _fields_=[('type',wintypes.DWORD),('union',INPUTUNION)]
+        events=[]
+        for char in text.replace('\r\n','\n'):
+            if char=='\n':
+                # Many controls ignore a unicode line feed; Enter is what a user would press
+                events.append((VK_RETURN,0,0))
+                events.append((VK_RETURN,0,KEYEVENTF_KEYUP))
+                continue
+            data=char.encode('utf-16-le')
+            # Characters outside the BMP are sent as their two surrogate code units
+            for index in range(0,len(data),2):
+                unit=int.from_bytes(data[index:index+2],'little')
+                events.append((0,unit,KEYEVENTF_UNICODE))
+                events.append((0,unit,KEYEVENTF_UNICODE|KEYEVENTF_KEYUP))
+        send_input=ctypes.windll.user32.SendInput
+        for start in range(0,len(events),self.chunk_size*2):
+            chunk=events[start:start+self.chunk_size*2]
+            inputs=(INPUT*len(chunk))(*[INPUT(type=INPUT_KEYBOARD,union=INPUTUNION(ki=KEYBDINPUT(wVk=vk,wScan=scan,dwFlags=flags))) for vk,scan,flags in chunk])
+            send_input(len(chunk),inputs,ctypes.sizeof(INPUT))
+
+@dataclass
+class EntryResult:
+    strategy:Literal['paste','unicode','keys']
+    chars:int
+    duration:float
+
+    @property
+    def throughput(self)->float:
+        """Characters per second."""
+        return self.chars/self.duration if self.duration>0 else float('inf')
+
+    def to_string(self)->str:
+        return f'{self.chars} chars via {self.strategy} in {self.duration:.2f}s ({self.throughput:.0f} chars/s)'
+
+class TextEntry:
+    """
+    Picks how to enter a piece of text into the focused control.
+
+    - keys: one key press per character; kept for short text and for sensitive fields
+    - unicode: the whole text injected as unicode events; works for any script and layout
+    - paste: through the clipboard, whose previous text is restored afterwards; fastest for long text
+
+    Sensitive text never touches the clipboard. Text pyautogui cannot type (non-ASCII) never uses keys.
+
+    Args:
+        backend (InputBackend): Input primitives
+        paste_threshold (int, optional): Length from which auto uses the clipboard. Defaults to 200.
+        keys_threshold (int, optional): Length up to which auto types key by key. Defaults to 32.
+        key_interval (float, optional): Delay between key presses in keys mode. Defaults to 0.1.
+        restore_delay (float, optional): Time given to the target to read the clipboard before it is restored. Defaults to 0.15.
+    """
+    def __init__(self,backend:InputBackend,paste_threshold:int=200,keys_threshold:int=32,key_interval:float=0.1,restore_delay:float=0.15):
+        self.backend=backend
+        self.paste_threshold=paste_threshold
+        self.keys_threshold=keys_threshold
+        self.key_interval=key_interval
+        self.restore_delay=restore_delay
+
+    def choose(self,text:str,sensitive:bool=False)->Literal['paste','unicode','keys']:
+        typeable=all(char in TYPEABLE for char in text)
+        if sensitive:
+            return 'keys' if typeable else 'unicode'
+        if len(text)>=self.paste_threshold:
+            return 'paste'
+        if typeable and len(text)<=self.keys_threshold:
+            return 'keys'
+        return 'unicode'
+
+    def enter(self,text:str,strategy:Strategy='auto',sensitive:bool=False)->EntryResult:
+        if strategy=='auto':
+            strategy=self.choose(text,sensitive=sensitive)
+        elif strategy=='paste' and sensitive:
+            raise ValueError('Sensitive text cannot be entered through the clipboard')
+        start=perf_counter()
+        match strategy:
+            case 'paste':
+                self.paste(text)
+            case 'unicode':
+                self.backend.send_unicode(text)
+            case 'keys':
+                self.backend.type_keys(text,interval=self.key_interval)
+            case _:
+                raise ValueError('Invalid strategy. Use "auto", "paste", "unicode" or "keys".')
+        return EntryResult(strategy=strategy,chars=len(text),duration=perf_counter()-start)
+
+    def paste(self,text:str):
+        previous=self.backend.get_clipboard()
+        self.backend.set_clipboard(text)
+        try:
+            self.backend.hotkey('ctrl','v')
+            # The target reads the clipboard asynchronously while handling the paste
+            self.backend.sleep(self.restore_delay)
+        finally:
+            # Only text contents can be restored; anything else is left replaced
+            if previous is not None:
+                self.backend.set_clipboard(previous)
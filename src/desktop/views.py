@@ -1,6 +1,9 @@
 from src.tree.views import TreeState
-from dataclasses import dataclass
-from typing import Literal,Optional
+from dataclasses import dataclass,field
+from typing import Literal,Optional,TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uiautomation import Control
 
 @dataclass
 class App:
@@ -10,6 +13,7 @@ class App:
     size:'Size'
     process_id:int
     handle:int
+    process_name:str=''
 
     def to_string(self):
         return f'Name: {self.name} Depth: {self.depth} Status: {self.status} Size: {self.size.to_string()}'
@@ -22,12 +26,26 @@ class Size:
     def to_string(self):
         return f'({self.width},{self.height})'
 
+@dataclass
+class Window:
+    control:'Control'
+    name:str
+    class_name:str
+    control_type:int
+    depth:int
+    status:Literal['Maximized','Minimized','Normal','Hidden']
+    size:Size
+    process_id:int
+    handle:int
+    has_children:bool
+
 @dataclass
 class DesktopState:
     apps:list[App]
     active_app:Optional[App]
     screenshot:bytes|None
     tree_state:TreeState
+    timings:dict[str,float]=field(default_factory=dict)
 
     def active_app_to_string(self):
         if self.active_app is None:
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Callable, TYPE_CHECKING
+from time import monotonic, sleep
+from zlib import crc32
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+@dataclass
+class WatchResult:
+    met:bool
+    elapsed:float
+    polls:int
+
+def poll_until(predicate:Callable[[],bool],timeout:float,initial_interval:float=0.05,factor:float=1.5,max_interval:float=1.0)->WatchResult:
+    """
+    Call predicate until it returns True or timeout seconds pass.
+
+    The delay between polls starts at initial_interval and grows by factor up to max_interval,
+    so fast transitions are caught within tens of milliseconds while long waits stay cheap.
+    The last sleep is clipped to the deadline, so the call never overruns the timeout by a poll.
+    """
+    start=monotonic()
+    deadline=start+timeout
+    interval=initial_interval
+    polls=0
+    while True:
+        polls+=1
+        if predicate():
+            return WatchResult(met=True,elapsed=monotonic()-start,polls=polls)
+        remaining=deadline-monotonic()
+        if remaining<=0:
+            return WatchResult(met=False,elapsed=monotonic()-start,polls=polls)
+        sleep(min(interval,remaining))
+        interval=min(interval*factor,max_interval)
+
+def sampled_hash(image:'Image.Image',step:int=4)->int:
+    """Hash of every step-th pixel in both directions; cheap enough to run on each poll."""
+    import numpy as np
+    pixels=np.asarray(image)[::step,::step]
+    return crc32(np.ascontiguousarray(pixels).tobytes())
+
+class PixelSample:
+    """
+    Every step-th pixel of a capture, compared with a tolerance instead of hashed.
+
+    Two samples are equal when no more than max(min_changed, changed_fraction of the samples)
+    pixels differ by more than threshold in a channel. A blinking caret or a small animation then
+    does not keep an app looking busy, while a menu, a dialog or a repainted page still counts.
+    """
+    def __init__(self,image:'Image.Image',step:int=4,threshold:int=24,changed_fraction:float=0.002,min_changed:int=12):
+        import numpy as np
+        self.pixels=np.asarray(image)[::step,::step]
+        self.threshold=threshold
+        self.limit=max(min_changed,int(changed_fraction*self.pixels.shape[0]*self.pixels.shape[1]))
+
+    def changed(self,other:'PixelSample')->int:
+        """Number of sampled pixels that differ by more than threshold."""
+        import numpy as np
+        if self.pixels.shape!=other.pixels.shape:
+            return self.pixels.shape[0]*self.pixels.shape[1]
+        difference=np.abs(self.pixels.astype(np.int16)-other.pixels)
+        if difference.ndim==3:
+            difference=difference.max(axis=2)
+        return int(np.count_nonzero(difference>self.threshold))
+
+    def __eq__(self,other)->bool:
+        if not isinstance(other,PixelSample):
+            return NotImplemented
+        return self.changed(other)<=self.limit
+
+    __hash__=None
+
+def sequence_hash(items:list)->int:
+    return crc32(repr(items).encode('utf-8','replace'))
@@ -1,44 +1,43 @@
 from src.tree.views import TreeElementNode, TextElementNode, ScrollElementNode, Center, BoundingBox, TreeState
 from src.tree.config import INTERACTIVE_CONTROL_TYPE_NAMES,INFORMATIVE_CONTROL_TYPE_NAMES, DEFAULT_ACTIONS
-from uiautomation import GetRootControl,Control,ImageControl,ScrollPattern
-from src.tree.utils import random_point_within_bounding_box
+from src.tree.labels import LabelPlacer
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.desktop.config import AVOIDED_APPS, EXCLUDED_CLASSNAMES
 from PIL import Image, ImageFont, ImageDraw
 from typing import TYPE_CHECKING
 from time import sleep
-import random
 
 if TYPE_CHECKING:
+    from uiautomation import Control,ScrollPattern
     from src.desktop import Desktop
+    from src.desktop.views import Window
 
 class Tree:
     def __init__(self,desktop:'Desktop'):
         self.desktop=desktop
 
-    def get_state(self)->TreeState:
-        sleep(0.5)
-        # Get the root control of the desktop
-        root=GetRootControl()
-        interactive_nodes,informative_nodes,scrollable_nodes=self.get_appwise_nodes(node=root)
+    def get_state(self,windows:list['Window']|None=None)->TreeState:
+        if windows is None:
+            windows=self.desktop.get_windows(settle=0.5)
+        interactive_nodes,informative_nodes,scrollable_nodes=self.get_appwise_nodes(windows=windows)
         return TreeState(interactive_nodes=interactive_nodes,informative_nodes=informative_nodes,scrollable_nodes=scrollable_nodes)
     
-    def get_appwise_nodes(self,node:Control) -> tuple[list[TreeElementNode],list[TextElementNode]]:
-        apps:list[Control]=[]
+    def get_appwise_nodes(self,windows:list['Window']) -> tuple[list[TreeElementNode],list[TextElementNode]]:
+        apps:list['Window']=[]
         found_foreground_app=False
 
-        for app in node.GetChildren():
-            if app.ClassName in EXCLUDED_CLASSNAMES:
-                apps.append(app)
-            elif app.Name not in AVOIDED_APPS and self.desktop.is_app_visible(app):
+        for window in windows:
+            if window.class_name in EXCLUDED_CLASSNAMES:
+                apps.append(window)
+            elif window.name not in AVOIDED_APPS and self.desktop.is_app_visible(window):
                 if not found_foreground_app:
-                    apps.append(app)
+                    apps.append(window)
                     found_foreground_app=True
 
         interactive_nodes,informative_nodes,scrollable_nodes=[],[],[]
         # Parallel traversal (using ThreadPoolExecutor) to get nodes from each app
         with ThreadPoolExecutor() as executor:
-            future_to_node = {executor.submit(self.get_nodes, app,self.desktop.is_app_browser(app)): app for app in apps}
+            future_to_node = {executor.submit(self.get_nodes, app.control,self.desktop.is_app_browser(app.process_id)): app for app in apps}
             for future in as_completed(future_to_node):
                 try:
                     result = future.result()
@@ -48,15 +47,16 @@ class Tree:
                         informative_nodes.extend(text_nodes)
                         scrollable_nodes.extend(scroll_nodes)
                 except Exception as e:
-                    print(f"Error processing node {future_to_node[future].Name}: {e}")
+                    print(f"Error processing node {future_to_node[future].name}: {e}")
         return interactive_nodes,informative_nodes,scrollable_nodes
 
-    def get_nodes(self, node: Control, is_browser=False) -> tuple[list[TreeElementNode],list[TextElementNode],list[ScrollElementNode]]:
+    def get_nodes(self, node: 'Control', is_browser=False) -> tuple[list[TreeElementNode],list[TextElementNode],list[ScrollElementNode]]:
+        import uiautomation as ua
         interactive_nodes, informative_nodes, scrollable_nodes = [], [], []
         app_name=node.Name.strip()
         app_name='Desktop' if node.ClassName=='Progman' else app_name
         
-        def is_element_visible(node:Control,threshold:int=0):
+        def is_element_visible(node:'Control',threshold:int=0):
             is_control=node.IsControlElement
             box=node.BoundingRectangle
             if box.isempty():
@@ -67,26 +67,26 @@ class Tree:
             is_offscreen=(not node.IsOffscreen) or node.ControlTypeName in ['EditControl']
             return area > threshold and is_offscreen and is_control
     
-        def is_element_enabled(node:Control):
+        def is_element_enabled(node:'Control'):
             try:
                 return node.IsEnabled
             except Exception:
                 return False
             
-        def is_default_action(node:Control):
+        def is_default_action(node:'Control'):
             legacy_pattern=node.GetLegacyIAccessiblePattern()
             default_action=legacy_pattern.DefaultAction.title()
             if default_action in DEFAULT_ACTIONS:
                 return True
             return False
         
-        def is_element_image(node:Control):
-            if isinstance(node,ImageControl):
+        def is_element_image(node:'Control'):
+            if isinstance(node,ua.ImageControl):
                 if node.LocalizedControlType=='graphic' or not node.IsKeyboardFocusable:
                     return True
             return False
         
-        def is_element_text(node:Control):
+        def is_element_text(node:'Control'):
             try:
                 if node.ControlTypeName in INFORMATIVE_CONTROL_TYPE_NAMES:
                     if is_element_visible(node) and is_element_enabled(node) and not is_element_image(node):
@@ -95,14 +95,14 @@ class Tree:
                 return False
             return False
         
-        def is_element_scrollable(node:Control):
+        def is_element_scrollable(node:'Control'):
             try:
-                scroll_pattern:ScrollPattern=node.GetScrollPattern()
+                scroll_pattern:'ScrollPattern'=node.GetScrollPattern()
                 return scroll_pattern.VerticallyScrollable or scroll_pattern.HorizontallyScrollable
             except Exception:
                 return False
             
-        def is_keyboard_focusable(node:Control):
+        def is_keyboard_focusable(node:'Control'):
             try:
                 if node.ControlTypeName in set(['EditControl','ButtonControl','CheckBoxControl','RadioButtonControl','TabItemControl']):
                     return True
@@ -110,14 +110,14 @@ class Tree:
             except Exception:
                 return False
             
-        def element_has_child_element(node:Control,control_type:str,child_control_type:str):
+        def element_has_child_element(node:'Control',control_type:str,child_control_type:str):
             if node.LocalizedControlType==control_type:
                 first_child=node.GetFirstChildControl()
                 if first_child is None:
                     return False
                 return first_child.LocalizedControlType==child_control_type
             
-        def group_has_no_name(node:Control):
+        def group_has_no_name(node:'Control'):
             try:
                 if node.ControlTypeName=='GroupControl':
                     if not node.Name.strip():
@@ -126,7 +126,7 @@ class Tree:
             except Exception:
                 return False
             
-        def is_element_interactive(node:Control):
+        def is_element_interactive(node:'Control'):
             try:
                 if node.ControlTypeName in INTERACTIVE_CONTROL_TYPE_NAMES:
                     if is_element_visible(node) and is_element_enabled(node) and (not is_element_image(node) or is_keyboard_focusable(node)):
@@ -141,7 +141,7 @@ class Tree:
                 return False
             return False
         
-        def dom_correction(node:Control):
+        def dom_correction(node:'Control'):
             if element_has_child_element(node,'list item','link') or element_has_child_element(node,'item','link'):
                 interactive_nodes.pop()
                 return None
@@ -166,7 +166,8 @@ class Tree:
                         shortcut=node.AcceleratorKey or "''",
                         bounding_box=BoundingBox(left=box.left,top=box.top,right=box.right,bottom=box.bottom,width=box.width(),height=box.height()),
                         center=center,
-                        app_name=app_name
+                        app_name=app_name,
+                        control=node
                     ))
             elif element_has_child_element(node,'link','heading'):
                 interactive_nodes.pop()
@@ -181,17 +182,19 @@ class Tree:
                     shortcut=node.AcceleratorKey or "''",
                     bounding_box=BoundingBox(left=box.left,top=box.top,right=box.right,bottom=box.bottom,width=box.width(),height=box.height()),
                     center=center,
-                    app_name=app_name
+                    app_name=app_name,
+                    control=node
                 ))
             
-        def tree_traversal(node: Control):
+        def tree_traversal(node: 'Control'):
             # Checks to skip the nodes that are not interactive
             if node.IsOffscreen and node.ControlTypeName!= 'EditControl' and node.ClassName not in set(["Popup","Windows.UI.Core.CoreComponentInputSource"]):
                 return None
             
             if is_element_interactive(node):
                 box = node.BoundingRectangle
-                x,y=random_point_within_bounding_box(node=node,scale_factor=0.8)
+                # The box center, so an unchanged element keeps its coordinates between states
+                x,y=box.xcenter(),box.ycenter()
                 center = Center(x=x,y=y)
                 interactive_nodes.append(TreeElementNode(
                     name=node.Name.strip() or "''",
@@ -199,7 +202,8 @@ class Tree:
                     shortcut=node.AcceleratorKey or "''",
                     bounding_box=BoundingBox(left=box.left,top=box.top,right=box.right,bottom=box.bottom,width=box.width(),height=box.height()),
                     center=center,
-                    app_name=app_name
+                    app_name=app_name,
+                    control=node
                 ))
                 if is_browser:
                     dom_correction(node)
@@ -209,10 +213,10 @@ class Tree:
                     app_name=app_name
                 ))
             elif is_element_scrollable(node):
-                scroll_pattern:ScrollPattern=node.GetScrollPattern()
+                scroll_pattern:'ScrollPattern'=node.GetScrollPattern()
                 box = node.BoundingRectangle
                 # Get the center
-                x,y=random_point_within_bounding_box(node=node,scale_factor=0.8)
+                x,y=box.xcenter(),box.ycenter()
                 center = Center(x=x,y=y)
                 scrollable_nodes.append(ScrollElementNode(
                     name=node.Name.strip() or node.LocalizedControlType.capitalize() or "''",
@@ -221,7 +225,8 @@ class Tree:
                     bounding_box=BoundingBox(left=box.left,top=box.top,right=box.right,bottom=box.bottom,width=box.width(),height=box.height()),
                     center=center,
                     horizontal_scrollable=scroll_pattern.HorizontallyScrollable,
-                    vertical_scrollable=scroll_pattern.VerticallyScrollable
+                    vertical_scrollable=scroll_pattern.VerticallyScrollable,
+                    control=node
                 ))
             # Recursively check all children
             for child in node.GetChildren():
@@ -230,12 +235,10 @@ class Tree:
         tree_traversal(node)
         return (interactive_nodes,informative_nodes,scrollable_nodes)
     
-    def get_random_color(self):
-        return "#{:06x}".format(random.randint(0, 0xFFFFFF))
-
-    def annotated_screenshot(self, nodes: list[TreeElementNode],scale:float=0.7) -> Image.Image:
-        screenshot = self.desktop.get_screenshot(scale=scale)
-        sleep(0.25)
+    def annotated_screenshot(self, nodes: list[TreeElementNode],scale:float=0.7,screenshot:Image.Image|None=None) -> Image.Image:
+        if screenshot is None:
+            screenshot = self.desktop.get_screenshot(scale=scale)
+            sleep(0.25)
         # Add padding
         padding = 20
         width = screenshot.width + (2 * padding)
@@ -250,45 +253,31 @@ class Tree:
         except IOError:
             font = ImageFont.load_default()
 
-        def get_random_color():
-            return "#{:06x}".format(random.randint(0, 0xFFFFFF))
-
-        def draw_annotation(label, node: TreeElementNode):
-            box = node.bounding_box
-            color = get_random_color()
-
-            # Scale and pad the bounding box also clip the bounding box
-            adjusted_box = (
-                int(box.left * scale) + padding,
-                int(box.top * scale) + padding,
-                int(box.right * scale) + padding,
-                int(box.bottom * scale) + padding
-            )
-            # Draw bounding box
-            draw.rectangle(adjusted_box, outline=color, width=2)
+        # Scale and pad the bounding boxes
+        boxes=[(
+            int(node.bounding_box.left * scale) + padding,
+            int(node.bounding_box.top * scale) + padding,
+            int(node.bounding_box.right * scale) + padding,
+            int(node.bounding_box.bottom * scale) + padding
+        ) for node in nodes]
+        labels=[str(label) for label in range(len(nodes))]
+        # Label dimensions (text plus 2px margin on every side)
+        sizes=[(draw.textlength(label, font=font) + 4, font_size + 4) for label in labels]
 
-            # Label dimensions
-            label_width = draw.textlength(str(label), font=font)
-            label_height = font_size
-            left, top, right, bottom = adjusted_box
+        # Place labels around their boxes without overlapping each other
+        placer=LabelPlacer(width=width,height=height)
+        placements=placer.place(boxes=boxes,sizes=sizes,labels=labels)
 
-            # Label position above bounding box
-            label_x1 = right - label_width
-            label_y1 = top - label_height - 4
-            label_x2 = label_x1 + label_width
-            label_y2 = label_y1 + label_height + 4
-
-            # Draw label background and text
-            draw.rectangle([(label_x1, label_y1), (label_x2, label_y2)], fill=color)
-            draw.text((label_x1 + 2, label_y1 + 2), str(label), fill=(255, 255, 255), font=font)
-
-        # Draw annotations in parallel
-        with ThreadPoolExecutor() as executor:
-            executor.map(draw_annotation, range(len(nodes)), nodes)
+        # Draw bounding boxes first so labels always stay on top
+        for placement in placements:
+            draw.rectangle(placement.box, outline=placement.color, width=2)
+        for placement in placements:
+            label_x1, label_y1, label_x2, label_y2 = placement.rect
+            draw.rectangle([(label_x1, label_y1), (label_x2, label_y2)], fill=placement.color)
+            draw.text((label_x1 + 2, label_y1 + 2), placement.label, fill=(255, 255, 255), font=font)
         return padded_screenshot
     
     def get_annotated_image_data(self)->tuple[Image.Image,list[TreeElementNode]]:
-        node=GetRootControl()
-        nodes,_,_=self.get_appwise_nodes(node=node)
+        nodes,_,_=self.get_appwise_nodes(windows=self.desktop.get_windows())
         screenshot=self.annotated_screenshot(nodes=nodes,scale=1.0)
         return screenshot,nodes
\ No newline at end of file
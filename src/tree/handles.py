@@ -0,0 +1,100 @@
+from src.tree.views import TreeElementNode, ScrollElementNode, TreeState, Center
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uiautomation import Control
+
+@dataclass
+class ElementHandle:
+    label:int
+    node:TreeElementNode|ScrollElementNode
+    center:Center
+
+    @property
+    def control(self)->'Control|None':
+        return self.node.control
+
+    def revalidate(self)->bool:
+        """
+        Cheap liveness check (a single property read). A moved element stays valid and its center
+        is refreshed for the coordinate fallback; an element that is gone or collapsed is stale.
+        """
+        if self.control is None:
+            return False
+        try:
+            rect=self.control.BoundingRectangle
+        except Exception:
+            return False
+        if rect.isempty():
+            return False
+        box=self.node.bounding_box
+        if (rect.left,rect.top,rect.right,rect.bottom)!=(box.left,box.top,box.right,box.bottom):
+            self.center=Center(x=rect.xcenter(),y=rect.ycenter())
+        return True
+
+    def invoke(self)->str|None:
+        """
+        Activate the element through its UIA pattern instead of the mouse.
+
+        Returns:
+            str | None: Name of the pattern used, or None when the element supports none of them
+        """
+        control=self.control
+        if control is None:
+            return None
+        from uiautomation import PatternId, ExpandCollapseState
+        # waitTime=0: waiting for the app is left to the caller's input pacing
+        if (pattern:=control.GetPattern(PatternId.InvokePattern)) and pattern.Invoke(waitTime=0):
+            return 'Invoke'
+        if (pattern:=control.GetPattern(PatternId.TogglePattern)) and pattern.Toggle(waitTime=0):
+            return 'Toggle'
+        if (pattern:=control.GetPattern(PatternId.SelectionItemPattern)) and pattern.Select(waitTime=0):
+            return 'SelectionItem'
+        if pattern:=control.GetPattern(PatternId.ExpandCollapsePattern):
+            # Like a click: an open element (combo box, menu, tree node) closes, a closed one opens
+            state=pattern.ExpandCollapseState
+            if state==ExpandCollapseState.Expanded and pattern.Collapse(waitTime=0):
+                return 'ExpandCollapse (collapsed)'
+            if state in (ExpandCollapseState.Collapsed,ExpandCollapseState.PartiallyExpanded) and pattern.Expand(waitTime=0):
+                return 'ExpandCollapse (expanded)'
+        return None
+
+    def set_value(self,text:str,clear:bool=False)->bool:
+        """Write text through the Value pattern (no focus change, no key events). False when unsupported or read-only."""
+        control=self.control
+        if control is None:
+            return False
+        from uiautomation import PatternId
+        pattern=control.GetPattern(PatternId.ValuePattern)
+        if not pattern or pattern.IsReadOnly:
+            return False
+        value=text if clear else (pattern.Value or '')+text
+        return pattern.SetValue(value,waitTime=0)
+
+class ElementHandles:
+    """
+    Label -> live UI Automation element for the nodes listed by the latest State-Tool call.
+
+    Labels follow the State-Tool text: interactive elements first, then scrollable ones. The map
+    is replaced on every state capture, so a label always refers to what the model last saw.
+    """
+    def __init__(self):
+        self.lock=Lock()
+        self.handles:dict[int,ElementHandle]={}
+
+    def update(self,tree_state:TreeState):
+        nodes=[*tree_state.interactive_nodes,*tree_state.scrollable_nodes]
+        handles={label:ElementHandle(label=label,node=node,center=node.center) for label,node in enumerate(nodes)}
+        with self.lock:
+            self.handles=handles
+
+    def get(self,label:int)->ElementHandle:
+        with self.lock:
+            handle=self.handles.get(label)
+        if handle is None:
+            raise ValueError(f'Label {label} not found. Call State-Tool to get the current labels.')
+        if not handle.revalidate():
+            raise ValueError(f'The element with label {label} ({handle.node.name}) is no longer available. Call State-Tool again.')
+        return handle
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from colorsys import hsv_to_rgb
+from zlib import crc32
+
+Rect=tuple[float,float,float,float]
+
+@dataclass
+class LabelPlacement:
+    label:str
+    box:Rect
+    rect:Rect
+    color:str
+    overlaps:bool
+
+class SpatialGrid:
+    """
+    Uniform grid over the image used to answer "does this rect hit anything already placed?"
+    in (amortized) constant time instead of scanning every placed label.
+    """
+    def __init__(self,cell_size:int=32):
+        self.cell_size=cell_size
+        self.cells:dict[tuple[int,int],list[Rect]]={}
+
+    def _cells(self,rect:Rect):
+        x1,y1,x2,y2=rect
+        size=self.cell_size
+        for cx in range(int(x1//size),int(x2//size)+1):
+            for cy in range(int(y1//size),int(y2//size)+1):
+                yield (cx,cy)
+
+    def insert(self,rect:Rect):
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell,[]).append(rect)
+
+    def collides(self,rect:Rect)->bool:
+        """Whether rect intersects any placed rect; stops at the first hit."""
+        x1,y1,x2,y2=rect
+        for cell in self._cells(rect):
+            for other in self.cells.get(cell,()):
+                if min(x2,other[2])>max(x1,other[0]) and min(y2,other[3])>max(y1,other[1]):
+                    return True
+        return False
+
+    def overlap_area(self,rect:Rect)->float:
+        x1,y1,x2,y2=rect
+        seen=set()
+        area=0.0
+        for cell in self._cells(rect):
+            for other in self.cells.get(cell,()):
+                if id(other) in seen:
+                    continue
+                seen.add(id(other))
+                w=min(x2,other[2])-max(x1,other[0])
+                h=min(y2,other[3])-max(y1,other[1])
+                if w>0 and h>0:
+                    area+=w*h
+        return area
+
+class LabelPlacer:
+    """
+    Places one label per bounding box so that labels do not overlap each other.
+
+    Boxes are processed smallest first (small controls have the fewest good spots), and for each
+    box a fixed list of candidate positions around it is tried against a spatial grid of the
+    labels placed so far. The first free candidate wins. If every candidate collides the label
+    keeps the first (legacy) position and is not added to the grid: only non-overlapping labels
+    are stored, so a grid cell never holds more than it has room for and a crowded screen does
+    not make every later query scan a growing pile of labels. Sorting dominates, so placement is
+    O(n log n) for n boxes.
+    """
+    def __init__(self,width:int,height:int,cell_size:int=32):
+        self.width=width
+        self.height=height
+        self.grid=SpatialGrid(cell_size=cell_size)
+
+    def candidates(self,box:Rect,label_width:float,label_height:float)->list[Rect]:
+        left,top,right,bottom=box
+        w,h=label_width,label_height
+        positions=[
+            (right-w,top-h),   # above, right aligned (legacy position)
+            (left,top-h),      # above, left aligned
+            (right-w,bottom),  # below, right aligned
+            (left,bottom),     # below, left aligned
+            (right,top),       # right side, top aligned
+            (left-w,top),      # left side, top aligned
+            (right-w,top),     # inside, top right corner
+            (left,top),        # inside, top left corner
+        ]
+        return [self.clip((x,y,x+w,y+h)) for x,y in positions]
+
+    def clip(self,rect:Rect)->Rect:
+        x1,y1,x2,y2=rect
+        w,h=x2-x1,y2-y1
+        x1=min(max(x1,0),max(self.width-w,0))
+        y1=min(max(y1,0),max(self.height-h,0))
+        return (x1,y1,x1+w,y1+h)
+
+    def place(self,boxes:list[Rect],sizes:list[tuple[float,float]],labels:list[str])->list[LabelPlacement]:
+        """
+        Args:
+            boxes (list[Rect]): Bounding boxes (left, top, right, bottom) in image coordinates
+            sizes (list[tuple[float, float]]): Label (width, height) for every box
+            labels (list[str]): Label text for every box
+
+        Returns:
+            list[LabelPlacement]: One placement per box, in the same order as the input
+        """
+        order=sorted(range(len(boxes)),key=lambda i:((boxes[i][2]-boxes[i][0])*(boxes[i][3]-boxes[i][1]),i))
+        placements:list[LabelPlacement|None]=[None]*len(boxes)
+        for i in order:
+            candidates=self.candidates(boxes[i],*sizes[i])
+            rect=next((candidate for candidate in candidates if not self.grid.collides(candidate)),None)
+            if rect is not None:
+                self.grid.insert(rect)
+            placements[i]=LabelPlacement(label=labels[i],box=boxes[i],rect=rect or candidates[0],color=label_color(labels[i]),overlaps=rect is None)
+        return placements
+
+def label_color(label:str)->str:
+    """
+    Deterministic, well separated color for a label: the label hash picks a hue on the golden
+    ratio sequence and saturation/value stay high enough for white label text to be readable.
+    """
+    hue=(crc32(str(label).encode())*0.618033988749895)%1.0
+    r,g,b=hsv_to_rgb(hue,0.85,0.80)
+    return "#{:02x}{:02x}{:02x}".format(int(r*255),int(g*255),int(b*255))
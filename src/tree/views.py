@@ -1,4 +1,8 @@
 from dataclasses import dataclass,field
+from typing import TYPE_CHECKING,Optional
+
+if TYPE_CHECKING:
+    from uiautomation import Control
 
 @dataclass
 class TreeState:
@@ -53,6 +57,7 @@ class TreeElementNode:
     bounding_box:BoundingBox
     center:Center
     app_name:str
+    control:Optional['Control']=field(default=None,repr=False,compare=False)
 
 @dataclass
 class TextElementNode:
@@ -67,4 +72,5 @@ class ScrollElementNode:
     bounding_box:BoundingBox
     center:Center
     horizontal_scrollable:bool
-    vertical_scrollable:bool
\ No newline at end of file
+    vertical_scrollable:bool
+    control:Optional['Control']=field(default=None,repr=False,compare=False)
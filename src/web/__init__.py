@@ -0,0 +1,167 @@
+from src.web.config import WEB_POOL_SIZE, WEB_TIMEOUT, WEB_CACHE_PATH, WEB_CACHE_MAX_BYTES, WEB_MAX_BYTES, WEB_PAGE_SIZE, WEB_DOCUMENTS
+from src.web.views import FetchResult, Document
+from src.web.cache import HttpCache
+from src.web.markdown import MarkdownConverter, detect_encoding
+from src.web.readability import MainContentConverter
+from src.web.pages import paginate, document_digest
+from typing import Callable, Optional, Protocol, TYPE_CHECKING
+from collections import OrderedDict
+from threading import Lock
+from pathlib import Path
+from time import time
+
+if TYPE_CHECKING:
+    from requests import Session
+
+class Converter(Protocol):
+    def feed_bytes(self,data:bytes): ...
+    def finish(self)->str: ...
+
+# (url, content type, known encoding) -> converter fed with the body as it arrives
+ConverterFactory=Callable[[str,Optional[str],Optional[str]],Converter]
+ChunkSink=Callable[[Optional[str]],Callable[[bytes],None]]
+
+def markdown_converter(url:str,content_type:Optional[str],encoding:Optional[str])->MarkdownConverter:
+    return MarkdownConverter(content_type=content_type,base_url=url,encoding=encoding)
+
+def main_content_converter(url:str,content_type:Optional[str],encoding:Optional[str])->MainContentConverter:
+    return MainContentConverter(content_type=content_type,base_url=url,encoding=encoding)
+
+# Markdown variants: the whole page, or only its main content
+CONVERTERS:dict[str,ConverterFactory]={'full':markdown_converter,'main':main_content_converter}
+
+class WebClient:
+    """
+    HTTP access for the web tools: one pooled keep-alive session plus the on-disk HttpCache.
+
+    Fresh cache entries are served without touching the network, stale ones are revalidated with
+    If-None-Match / If-Modified-Since, and the markdown converted from a body is cached next to it
+    so an unchanged page is never converted twice. Bodies are streamed, fed to the converter
+    chunk by chunk while they download and cut at max_bytes. requests is imported on first use.
+    """
+    def __init__(self,cache_path:Path|None=WEB_CACHE_PATH,cache_max_bytes:int=WEB_CACHE_MAX_BYTES,pool_size:int=WEB_POOL_SIZE,timeout:float=WEB_TIMEOUT,
+                 max_bytes:int=WEB_MAX_BYTES,page_size:int=WEB_PAGE_SIZE,max_documents:int=WEB_DOCUMENTS):
+        self.cache=HttpCache(cache_path,max_bytes=cache_max_bytes) if cache_path is not None else None
+        self.pool_size=pool_size
+        self.timeout=timeout
+        self.max_bytes=max_bytes
+        self.page_size=page_size
+        self.max_documents=max_documents
+        self.lock=Lock()
+        self.documents:OrderedDict[tuple[str,str],Document]=OrderedDict()
+        self._session:'Session|None'=None
+
+    @property
+    def session(self)->'Session':
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session=requests.Session()
+                adapter=HTTPAdapter(pool_connections=self.pool_size,pool_maxsize=self.pool_size)
+                session.mount('http://',adapter)
+                session.mount('https://',adapter)
+                self._session=session
+            return self._session
+
+    def close(self):
+        with self.lock:
+            if self._session is not None:
+                self._session.close()
+                self._session=None
+
+    def fetch(self,url:str,timeout:float|None=None,sink:Optional[ChunkSink]=None)->FetchResult:
+        """
+        Args:
+            url (str): Page to fetch
+            timeout (float, optional): Connect/read timeout in seconds. Defaults to the client timeout.
+            sink (ChunkSink, optional): Called with the Content-Type of a downloaded body; the returned
+                callback receives each chunk as it arrives. Not called when the body comes from the cache.
+        """
+        key,entry=self.cache.get(url) if self.cache is not None else (None,None)
+        headers={}
+        if entry is not None:
+            body=self.cache.read_body(key)
+            if body is None:
+                entry=None
+            elif entry.is_fresh(time()):
+                return FetchResult(url=url,status=entry.status,body=body,encoding=entry.encoding,cache='fresh',key=key,content_type=entry.content_type,truncated=entry.truncated)
+            else:
+                if entry.etag:
+                    headers['If-None-Match']=entry.etag
+                if entry.last_modified:
+                    headers['If-Modified-Since']=entry.last_modified
+        with self.session.get(url,headers=headers,timeout=timeout or self.timeout,stream=True) as response:
+            if response.status_code==304 and entry is not None:
+                # Reading the empty body lets the connection go back to the pool instead of being closed
+                response.content
+                self.cache.refresh(key,response.headers)
+                return FetchResult(url=url,status=entry.status,body=body,encoding=entry.encoding,cache='revalidated',key=key,content_type=entry.content_type,truncated=entry.truncated)
+            content_type=response.headers.get('Content-Type')
+            on_chunk=sink(content_type) if sink is not None else None
+            buffer=bytearray()
+            truncated=False
+            for chunk in response.iter_content(chunk_size=65536):
+                room=self.max_bytes-len(buffer)
+                if len(chunk)>=room:
+                    # The rest of the body is never read; closing the response drops the connection
+                    chunk,truncated=chunk[:room],True
+                buffer+=chunk
+                if on_chunk is not None:
+                    on_chunk(chunk)
+                if truncated:
+                    break
+        body=bytes(buffer)
+        encoding=detect_encoding(content_type,body[:4096])
+        key=None
+        if self.cache is not None and response.status_code==200:
+            key=self.cache.store(url,response.status_code,response.headers,body,encoding,truncated=truncated)
+        return FetchResult(url=url,status=response.status_code,body=body,encoding=encoding,cache='miss',key=key,content_type=content_type,truncated=truncated)
+
+    def markdown(self,url:str,variant:str='full',factory:Optional[ConverterFactory]=None,timeout:float|None=None)->tuple[FetchResult,str]:
+        """
+        Fetch url and convert it while it downloads, reusing the cached conversion of an unchanged body.
+        The converter is CONVERTERS[variant] unless a factory is given.
+        """
+        if factory is None:
+            if variant not in CONVERTERS:
+                raise ValueError(f'Unknown markdown variant {variant!r}, expected one of {", ".join(CONVERTERS)}')
+            factory=CONVERTERS[variant]
+        converters:list[Converter]=[]
+        def sink(content_type:Optional[str])->Callable[[bytes],None]:
+            converters.append(factory(url,content_type,None))
+            return converters[0].feed_bytes
+        result=self.fetch(url,timeout=timeout,sink=sink)
+        if result.key is not None and result.cache!='miss':
+            content=self.cache.read_markdown(result.key,variant)
+            if content is not None:
+                return result,content
+        if not converters:
+            # Body from the cache without a stored conversion: convert it the same way, chunk by chunk
+            converter=factory(url,result.content_type,result.encoding)
+            for start in range(0,len(result.body),65536):
+                converter.feed_bytes(result.body[start:start+65536])
+            converters.append(converter)
+        content=converters[0].finish()
+        if result.key is not None:
+            self.cache.store_markdown(result.key,variant,content)
+        return result,content
+
+    def document(self,url:str,variant:str='full',digest:Optional[str]=None,factory:Optional[ConverterFactory]=None,timeout:float|None=None)->Document:
+        """
+        The paginated markdown of url. A document already converted for a page token (digest) is
+        served from memory, so reading further pages costs neither a request nor a conversion.
+        """
+        with self.lock:
+            document=self.documents.get((url,variant))
+            if document is not None and digest is not None and document.digest==digest:
+                self.documents.move_to_end((url,variant))
+                return document
+        result,content=self.markdown(url,variant=variant,factory=factory,timeout=timeout)
+        document=Document(url=url,variant=variant,digest=document_digest(content),pages=paginate(content,self.page_size),fetch=result)
+        with self.lock:
+            self.documents[(url,variant)]=document
+            self.documents.move_to_end((url,variant))
+            while len(self.documents)>self.max_documents:
+                self.documents.popitem(last=False)
+        return document
@@ -0,0 +1,96 @@
+from src.web.config import WEB_BATCH_CONCURRENCY, WEB_HOST_CONCURRENCY, WEB_HOST_INTERVAL
+from src.web.views import ScrapeResult
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+from time import monotonic
+import asyncio
+
+if TYPE_CHECKING:
+    from src.web import WebClient
+
+# Awaited with (finished, total, result) whenever a URL completes
+ProgressCallback=Callable[[int,int,ScrapeResult],Awaitable[None]]
+
+class HostLimiter:
+    """
+    Politeness per host: at most concurrency requests in flight and request starts spaced by
+    interval seconds. Start slots are handed out in order on the event loop, so no lock is needed.
+    """
+    def __init__(self,concurrency:int=WEB_HOST_CONCURRENCY,interval:float=WEB_HOST_INTERVAL):
+        self.concurrency=concurrency
+        self.interval=interval
+        self.semaphores:dict[str,asyncio.Semaphore]={}
+        self.next_start:dict[str,float]={}
+
+    def semaphore(self,host:str)->asyncio.Semaphore:
+        if host not in self.semaphores:
+            self.semaphores[host]=asyncio.Semaphore(self.concurrency)
+        return self.semaphores[host]
+
+    async def wait_turn(self,host:str):
+        now=monotonic()
+        start=max(now,self.next_start.get(host,0.0))
+        self.next_start[host]=start+self.interval
+        if start>now:
+            await asyncio.sleep(start-now)
+
+async def scrape_many(client:'WebClient',urls:list[str],variant:str='full',concurrency:int=WEB_BATCH_CONCURRENCY,
+                      limiter:Optional[HostLimiter]=None,on_progress:Optional[ProgressCallback]=None)->list[ScrapeResult]:
+    """
+    Fetch and convert urls concurrently.
+
+    The event loop only schedules: each page is downloaded and converted by WebClient.document on
+    a worker thread (the converter runs while the body streams in), so the HTTP cache, the pooled
+    session and the paginated documents are shared with Scrape-Tool. A failing URL yields a result
+    with its error instead of failing the batch.
+
+    Args:
+        client (WebClient): Client doing the fetch and the conversion
+        urls (list[str]): Pages to scrape; duplicates are fetched once
+        variant (str, optional): Markdown variant. Defaults to 'full'.
+        concurrency (int, optional): Pages in flight overall. Defaults to WEB_BATCH_CONCURRENCY.
+        limiter (HostLimiter, optional): Per-host limits. Defaults to a new HostLimiter().
+        on_progress (ProgressCallback, optional): Awaited after each URL completes
+
+    Returns:
+        list[ScrapeResult]: One result per URL, in input order
+    """
+    limiter=limiter or HostLimiter()
+    slots=asyncio.Semaphore(concurrency)
+    loop=asyncio.get_running_loop()
+    unique=list(dict.fromkeys(urls))
+    finished=0
+
+    async def scrape(url:str,executor:ThreadPoolExecutor)->ScrapeResult:
+        nonlocal finished
+        queued=monotonic()
+        result=ScrapeResult(url=url)
+        try:
+            host=(urlsplit(url).hostname or '').lower()
+            async with limiter.semaphore(host):
+                await limiter.wait_turn(host)
+                async with slots:
+                    start=monotonic()
+                    result.waited=start-queued
+                    try:
+                        result.document=await loop.run_in_executor(executor,lambda:client.document(url,variant=variant))
+                    finally:
+                        result.elapsed=monotonic()-start
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            result.error=f'{type(ex).__name__}: {ex}'
+        finished+=1
+        if on_progress is not None:
+            await on_progress(finished,len(unique),result)
+        return result
+
+    executor=ThreadPoolExecutor(max_workers=max(min(concurrency,len(unique)),1),thread_name_prefix='web-batch')
+    try:
+        results=await asyncio.gather(*(scrape(url,executor) for url in unique))
+    finally:
+        # Never block the event loop on downloads still running after a cancellation
+        executor.shutdown(wait=False,cancel_futures=True)
+    by_url=dict(zip(unique,results))
+    return [by_url[url] for url in urls]
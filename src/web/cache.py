@@ -0,0 +1,221 @@
+from src.web.views import CacheEntry
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
+from dataclasses import asdict
+from threading import Lock
+from typing import Mapping, Optional
+from pathlib import Path
+from time import time
+import hashlib
+import json
+import os
+
+# Freshness given to a response that only has Last-Modified: 10% of its age (RFC 9111 4.2.2), at most a day
+HEURISTIC_FRACTION=0.1
+HEURISTIC_MAX_AGE=86400.0
+
+def cache_key(url:str)->str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+def parse_cache_control(value:str|None)->dict[str,str|None]:
+    directives={}
+    for part in (value or '').split(','):
+        name,_,argument=part.strip().partition('=')
+        if name:
+            directives[name.lower()]=argument.strip('"') if argument else None
+    return directives
+
+def parse_http_date(value:str|None)->Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError,ValueError):
+        return None
+
+def freshness_lifetime(headers:Mapping[str,str],now:float)->Optional[float]:
+    """
+    Seconds the response may be served without revalidation, from Cache-Control max-age,
+    Expires or the Last-Modified heuristic. None when it must not be stored at all.
+    """
+    directives=parse_cache_control(headers.get('Cache-Control'))
+    if 'no-store' in directives:
+        return None
+    for name in ('s-maxage','max-age'):
+        if directives.get(name) is not None:
+            try:
+                return max(float(directives[name]),0.0)
+            except ValueError:
+                pass
+    date=parse_http_date(headers.get('Date')) or now
+    expires=parse_http_date(headers.get('Expires'))
+    if expires is not None:
+        return max(expires-date,0.0)
+    last_modified=parse_http_date(headers.get('Last-Modified'))
+    if last_modified is not None:
+        return min(max(date-last_modified,0.0)*HEURISTIC_FRACTION,HEURISTIC_MAX_AGE)
+    return 0.0
+
+class HttpCache:
+    """
+    On-disk cache of HTTP responses keyed by URL, with the markdown converted from each body.
+
+    Every entry is three kinds of files in one directory: <key>.json (validators and freshness),
+    <key>.body (raw bytes) and <key>.<variant>.md (conversions of that body, dropped whenever the
+    body changes). Entries without a validator and without freshness are not stored, since they
+    could never be reused. The total size is bounded by max_bytes, evicting least recently used
+    entries; recency survives restarts through the mtime of the metadata file.
+    """
+    def __init__(self,directory:Path,max_bytes:int=200*1024*1024):
+        self.directory=directory
+        self.max_bytes=max_bytes
+        self.lock=Lock()
+        self.entries:OrderedDict[str,CacheEntry]=OrderedDict()
+        self.total=0
+        self.loaded=False
+
+    def path(self,key:str,suffix:str)->Path:
+        return self.directory/f'{key}{suffix}'
+
+    def size_of(self,entry:CacheEntry,key:str)->int:
+        size=entry.size
+        for variant in entry.markdown:
+            try:
+                size+=self.path(key,f'.{variant}.md').stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def load(self):
+        """Index the cache directory once, oldest access first. Caller holds the lock."""
+        if self.loaded:
+            return
+        self.loaded=True
+        if not self.directory.is_dir():
+            return
+        metas=[]
+        for meta in self.directory.glob('*.json'):
+            try:
+                metas.append((meta.stat().st_mtime,meta.stem,CacheEntry(**json.loads(meta.read_text(encoding='utf-8')))))
+            except (OSError,ValueError,TypeError) as ex:
+                print(f"Error loading cache entry {meta.name}: {ex}")
+        for _,key,entry in sorted(metas,key=lambda item:item[0]):
+            self.entries[key]=entry
+            self.total+=self.size_of(entry,key)
+
+    def get(self,url:str)->tuple[str,Optional[CacheEntry]]:
+        key=cache_key(url)
+        with self.lock:
+            self.load()
+            entry=self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is not None:
+            try:
+                os.utime(self.path(key,'.json'))
+            except OSError:
+                pass
+        return key,entry
+
+    def read_body(self,key:str)->Optional[bytes]:
+        try:
+            return self.path(key,'.body').read_bytes()
+        except OSError:
+            return None
+
+    def read_markdown(self,key:str,variant:str)->Optional[str]:
+        with self.lock:
+            entry=self.entries.get(key)
+            if entry is None or variant not in entry.markdown:
+                return None
+        try:
+            return self.path(key,f'.{variant}.md').read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def store(self,url:str,status:int,headers:Mapping[str,str],body:bytes,encoding:Optional[str],truncated:bool=False)->Optional[str]:
+        """Store a full response; returns its key, or None when the response is not cacheable."""
+        now=time()
+        lifetime=freshness_lifetime(headers,now)
+        etag,last_modified=headers.get('ETag'),headers.get('Last-Modified')
+        key=cache_key(url)
+        if lifetime is None or (lifetime<=0 and not etag and not last_modified):
+            # The stored copy is superseded by a response that may not be reused
+            with self.lock:
+                self.load()
+                self.remove(key)
+            return None
+        directives=parse_cache_control(headers.get('Cache-Control'))
+        entry=CacheEntry(url=url,status=status,encoding=encoding,stored=now,expires=now+lifetime,etag=etag,last_modified=last_modified,
+                         no_cache='no-cache' in directives,size=len(body),content_type=headers.get('Content-Type'),truncated=truncated)
+        with self.lock:
+            self.load()
+            self.remove(key)
+            try:
+                self.directory.mkdir(parents=True,exist_ok=True)
+                self.write(self.path(key,'.body'),body)
+                self.write(self.path(key,'.json'),json.dumps(asdict(entry)).encode('utf-8'))
+            except OSError as ex:
+                print(f"Error saving cache entry: {ex}")
+                return None
+            self.entries[key]=entry
+            self.total+=entry.size
+            self.evict()
+        return key
+
+    def refresh(self,key:str,headers:Mapping[str,str]):
+        """Apply the headers of a 304 response: new validators and freshness, body and markdown kept."""
+        now=time()
+        with self.lock:
+            entry=self.entries.get(key)
+            if entry is None:
+                return
+            entry.expires=now+(freshness_lifetime(headers,now) or 0.0)
+            entry.stored=now
+            entry.etag=headers.get('ETag') or entry.etag
+            entry.last_modified=headers.get('Last-Modified') or entry.last_modified
+            try:
+                self.write(self.path(key,'.json'),json.dumps(asdict(entry)).encode('utf-8'))
+            except OSError as ex:
+                print(f"Error saving cache entry: {ex}")
+
+    def store_markdown(self,key:str,variant:str,markdown:str):
+        data=markdown.encode('utf-8')
+        path=self.path(key,f'.{variant}.md')
+        with self.lock:
+            entry=self.entries.get(key)
+            if entry is None:
+                return
+            previous=path.stat().st_size if variant in entry.markdown and path.exists() else 0
+            try:
+                self.write(path,data)
+                if variant not in entry.markdown:
+                    entry.markdown.append(variant)
+                    self.write(self.path(key,'.json'),json.dumps(asdict(entry)).encode('utf-8'))
+            except OSError as ex:
+                print(f"Error saving cached markdown: {ex}")
+                return
+            self.total+=len(data)-previous
+            self.evict()
+
+    def write(self,path:Path,data:bytes):
+        temp_path=path.with_name(path.name+'.tmp')
+        temp_path.write_bytes(data)
+        temp_path.replace(path)
+
+    def remove(self,key:str):
+        """Caller holds the lock."""
+        entry=self.entries.pop(key,None)
+        if entry is None:
+            return
+        self.total-=self.size_of(entry,key)
+        for path in [self.path(key,'.json'),self.path(key,'.body'),*(self.path(key,f'.{variant}.md') for variant in entry.markdown)]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def evict(self):
+        """Caller holds the lock."""
+        while self.total>self.max_bytes and len(self.entries)>1:
+            self.remove(next(iter(self.entries)))
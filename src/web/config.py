@@ -0,0 +1,23 @@
+from pathlib import Path
+import os
+
+# Shared HTTP session used by Scrape-Tool: keep-alive connections per host.
+WEB_POOL_SIZE:int=10
+WEB_TIMEOUT:float=10.0
+
+# On-disk HTTP cache (raw bodies plus their converted markdown), evicted least recently used first.
+WEB_CACHE_PATH:Path=Path(os.environ.get('LOCALAPPDATA',Path.home()))/'windows-mcp'/'http_cache'
+WEB_CACHE_MAX_BYTES:int=200*1024*1024
+
+# Bytes read from a response at most; larger pages are cut there.
+WEB_MAX_BYTES:int=5*1024*1024
+# Characters of markdown returned per Scrape-Tool call; the rest is reached through page tokens.
+WEB_PAGE_SIZE:int=20_000
+# Converted documents kept in memory so later pages need neither a fetch nor a conversion.
+WEB_DOCUMENTS:int=16
+
+# Scrape-Batch-Tool: pages fetched at once overall, at once per host, and the minimum gap between
+# two requests to the same host.
+WEB_BATCH_CONCURRENCY:int=8
+WEB_HOST_CONCURRENCY:int=2
+WEB_HOST_INTERVAL:float=0.25
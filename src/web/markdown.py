@@ -0,0 +1,282 @@
+from html.parser import HTMLParser
+from typing import Optional
+import codecs
+import re
+
+# Subtrees dropped while parsing: never content, or page chrome repeated on every page. Form controls go,
+# but not <form> or <button>: some sites wrap the whole body in one <form>, and buttons often carry link text
+SKIPPED_TAGS=frozenset(['script','style','noscript','template','svg','canvas','iframe','head','nav','footer','input','select','textarea','dialog'])
+# Elements without an end tag
+VOID_TAGS=frozenset(['area','base','br','col','embed','hr','img','input','link','meta','param','source','track','wbr'])
+BLOCK_TAGS=frozenset(['p','div','section','article','main','aside','header','figure','figcaption','address','details','summary','table','thead','tbody','tfoot','dl','dt','dd','ul','ol','body','html'])
+HEADINGS={'h1':1,'h2':2,'h3':3,'h4':4,'h5':5,'h6':6}
+EMPHASIS={'strong':'**','b':'**','em':'*','i':'*'}
+
+META_CHARSET=re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w-]+)',re.IGNORECASE)
+
+def detect_encoding(content_type:Optional[str],prefix:bytes)->str:
+    """Charset from the Content-Type header, else a BOM or <meta charset> in the first bytes, else UTF-8."""
+    if content_type:
+        match=re.search(r'charset\s*=\s*["\']?([\w-]+)',content_type,re.IGNORECASE)
+        if match and is_known_encoding(match.group(1)):
+            return match.group(1)
+    for bom,encoding in ((codecs.BOM_UTF8,'utf-8-sig'),(codecs.BOM_UTF16_LE,'utf-16'),(codecs.BOM_UTF16_BE,'utf-16')):
+        if prefix.startswith(bom):
+            return encoding
+    match=META_CHARSET.search(prefix[:4096])
+    if match and is_known_encoding(match.group(1).decode('ascii','ignore')):
+        return match.group(1).decode('ascii')
+    return 'utf-8'
+
+def is_known_encoding(name:str)->bool:
+    try:
+        codecs.lookup(name)
+        return True
+    except LookupError:
+        return False
+
+def is_skipped(tag:str,attributes:dict[str,Optional[str]])->bool:
+    return tag in SKIPPED_TAGS or attributes.get('hidden') is not None or attributes.get('aria-hidden')=='true'
+
+class ByteFeedParser(HTMLParser):
+    """
+    HTMLParser fed raw bytes chunk by chunk. Bytes are decoded incrementally, the charset being
+    taken from the Content-Type header or sniffed from the first bytes.
+
+    Args:
+        content_type (str, optional): Content-Type header of the response
+        encoding (str, optional): Known charset of the bytes; skips detection
+    """
+    def __init__(self,content_type:Optional[str]=None,encoding:Optional[str]=None):
+        super().__init__(convert_charrefs=True)
+        self.content_type=content_type
+        self.decoder=codecs.getincrementaldecoder(encoding)(errors='replace') if encoding else None
+        self.pending=b''
+
+    def feed_bytes(self,data:bytes):
+        if self.decoder is None:
+            self.pending+=data
+            # Wait for enough of the document to find a <meta charset>
+            if len(self.pending)>=1024:
+                self.start_decoding()
+            return
+        self.feed(self.decoder.decode(data))
+
+    def start_decoding(self):
+        encoding=detect_encoding(self.content_type,self.pending)
+        self.decoder=codecs.getincrementaldecoder(encoding)(errors='replace')
+        pending,self.pending=self.pending,b''
+        self.feed(self.decoder.decode(pending))
+
+    def close_bytes(self):
+        """Flush the decoder and the parser once the last chunk was fed."""
+        if self.decoder is None:
+            self.start_decoding()
+        self.feed(self.decoder.decode(b'',final=True))
+        self.close()
+
+class MarkdownConverter(ByteFeedParser):
+    """
+    HTML to markdown converter fed chunk by chunk while the page downloads.
+
+    Nothing is kept of the document except the markdown produced so far: skipped subtrees
+    (scripts, styles, navigation, footers, form controls) are discarded as they stream by, and whitespace
+    is collapsed on the fly.
+
+    Args:
+        content_type (str, optional): Content-Type header of the response
+        base_url (str, optional): Used to resolve relative links and images
+        encoding (str, optional): Known charset of the bytes; skips detection
+    """
+    def __init__(self,content_type:Optional[str]=None,base_url:Optional[str]=None,encoding:Optional[str]=None):
+        super().__init__(content_type=content_type,encoding=encoding)
+        self.base_url=base_url
+        self.out:list[str]=[]
+        # Open skipped subtree: its tag and how many elements of that tag are open in it
+        self.skip_tag:Optional[str]=None
+        self.skip_depth=0
+        self.lists:list[list]=[]
+        self.links:list[Optional[str]]=[]
+        self.pre=0
+        self.cells:Optional[list[str]]=None
+        self.row_count=0
+        self.at_line_start=True
+        self.space_pending=False
+
+    def finish(self)->str:
+        self.close_bytes()
+        return self.render()
+
+    def render(self)->str:
+        # A row still open at the end of the document: </tr> and </table> are optional
+        self.flush_row()
+        text=''.join(self.out)
+        return re.sub(r'\n{3,}','\n\n',text).strip()+'\n'
+
+    def write(self,text:str):
+        if not text:
+            return
+        if self.cells is not None:
+            if not self.cells:
+                self.cells.append('')
+            self.cells[-1]+=text
+            return
+        self.out.append(text)
+        self.at_line_start=text.endswith('\n')
+
+    def inline(self,markup:str):
+        """Opening inline markup takes over a space pending from the preceding text."""
+        if self.space_pending and not self.at_line_start:
+            markup=' '+markup
+        self.space_pending=False
+        self.write(markup)
+
+    def block(self,lines:int=2):
+        """Make sure the next output starts on a new block, separated by lines newlines."""
+        self.space_pending=False
+        if not self.out:
+            return
+        tail=''.join(self.out[-3:])
+        missing=lines-(len(tail)-len(tail.rstrip('\n')))
+        if missing>0:
+            self.write('\n'*missing)
+
+    def resolve(self,url:Optional[str])->Optional[str]:
+        if not url or url.startswith(('javascript:','data:')):
+            return None
+        if self.base_url:
+            from urllib.parse import urljoin
+            return urljoin(self.base_url,url)
+        return url
+
+    def handle_starttag(self,tag:str,attrs:list[tuple[str,Optional[str]]]):
+        if self.skip_tag is not None:
+            if tag==self.skip_tag:
+                self.skip_depth+=1
+            elif self.skip_tag=='head' and tag=='body':
+                # </head> is optional
+                self.skip_tag,self.skip_depth=None,0
+            return
+        attributes=dict(attrs)
+        if is_skipped(tag,attributes):
+            # Only the end tag of the same element closes the subtree, so unclosed <li>/<p> inside cannot leak
+            if tag not in VOID_TAGS:
+                self.skip_tag,self.skip_depth=tag,1
+            return
+        if tag in HEADINGS:
+            self.block()
+            self.write('#'*HEADINGS[tag]+' ')
+        elif tag=='br':
+            self.write('  \n' if not self.pre else '\n')
+        elif tag=='hr':
+            self.block()
+            self.write('---')
+            self.block()
+        elif tag in ('ul','ol'):
+            self.block(1 if self.lists else 2)
+            self.lists.append([tag,0])
+        elif tag=='li':
+            self.block(1)
+            indent='  '*max(len(self.lists)-1,0)
+            if self.lists and self.lists[-1][0]=='ol':
+                self.lists[-1][1]+=1
+                self.write(f'{indent}{self.lists[-1][1]}. ')
+            else:
+                self.write(f'{indent}- ')
+        elif tag=='pre':
+            self.block()
+            self.write('```\n')
+            self.pre+=1
+        elif tag=='code' and not self.pre:
+            self.inline('`')
+        elif tag=='blockquote':
+            self.block()
+            self.write('> ')
+        elif tag in EMPHASIS:
+            self.inline(EMPHASIS[tag])
+        elif tag=='a':
+            href=self.resolve(attributes.get('href'))
+            self.links.append(href)
+            if href:
+                self.inline('[')
+        elif tag=='img':
+            src=self.resolve(attributes.get('src'))
+            alt=(attributes.get('alt') or '').strip()
+            if src and alt:
+                self.inline(f'![{alt}]({src})')
+        elif tag=='tr':
+            # The previous row may not have been closed
+            self.flush_row()
+            self.cells=[]
+        elif tag in ('td','th'):
+            if self.cells is not None:
+                self.cells.append('')
+        elif tag in BLOCK_TAGS:
+            self.block()
+
+    def handle_endtag(self,tag:str):
+        if self.skip_tag is not None:
+            if tag==self.skip_tag:
+                self.skip_depth-=1
+                if self.skip_depth==0:
+                    self.skip_tag=None
+            return
+        if tag in HEADINGS or tag in ('p','blockquote'):
+            self.block()
+        elif tag in ('ul','ol'):
+            if self.lists:
+                self.lists.pop()
+            self.block(1 if self.lists else 2)
+        elif tag=='pre':
+            self.pre=max(self.pre-1,0)
+            self.block(1)
+            self.write('```')
+            self.block()
+        elif tag=='code' and not self.pre:
+            self.write('`')
+        elif tag in EMPHASIS:
+            self.write(EMPHASIS[tag])
+        elif tag=='a':
+            href=self.links.pop() if self.links else None
+            if href:
+                self.write(f']({href})')
+        elif tag=='tr':
+            self.flush_row()
+        elif tag=='table':
+            self.flush_row()
+            self.row_count=0
+            self.block()
+        elif tag in BLOCK_TAGS:
+            self.block()
+
+    def flush_row(self):
+        """Write the open table row, if any, as a markdown row."""
+        cells,self.cells=self.cells,None
+        if cells:
+            self.block(1)
+            self.write('| '+' | '.join(' '.join(cell.split()) for cell in cells)+' |\n')
+            self.row_count+=1
+            if self.row_count==1:
+                self.write('|'+'---|'*len(cells)+'\n')
+
+    def handle_data(self,data:str):
+        if self.skip_tag is not None:
+            return
+        if self.pre:
+            self.write(data)
+            return
+        leading=data[:1].isspace()
+        trailing=data[-1:].isspace()
+        text=' '.join(data.split())
+        if not text:
+            self.space_pending=self.space_pending or bool(data)
+            return
+        if (leading or self.space_pending) and not self.at_line_start:
+            text=' '+text
+        self.space_pending=trailing
+        self.write(text)
+
+def html_to_markdown(html:str,base_url:Optional[str]=None)->str:
+    converter=MarkdownConverter(base_url=base_url)
+    converter.feed(html)
+    return converter.finish()
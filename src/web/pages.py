@@ -0,0 +1,36 @@
+import hashlib
+
+def paginate(text:str,page_size:int)->list[str]:
+    """
+    Split markdown into pages of at most page_size characters, cutting at the last paragraph
+    break (else line break, else space) before the limit so blocks stay whole where possible.
+    """
+    pages=[]
+    start=0
+    while len(text)-start>page_size:
+        end=start+page_size
+        cut=-1
+        for separator in ('\n\n','\n',' '):
+            cut=text.rfind(separator,start+page_size//2,end)
+            if cut!=-1:
+                break
+        if cut==-1:
+            cut=end
+        pages.append(text[start:cut].strip('\n'))
+        start=cut
+        while start<len(text) and text[start] in '\n ':
+            start+=1
+    pages.append(text[start:].strip('\n'))
+    return pages
+
+def document_digest(text:str)->str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+def make_page_token(digest:str,page:int)->str:
+    return f'{digest}-{page}'
+
+def parse_page_token(token:str)->tuple[str,int]:
+    digest,_,page=token.strip().rpartition('-')
+    if not digest or not page.isdigit():
+        raise ValueError(f'Invalid page token {token!r}')
+    return digest,int(page)
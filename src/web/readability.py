@@ -0,0 +1,260 @@
+from src.web.markdown import ByteFeedParser, MarkdownConverter, VOID_TAGS, BLOCK_TAGS, HEADINGS, is_skipped
+from typing import Optional, Union
+import re
+
+# Class/id/role hints: subtrees that look like page chrome are dropped while parsing unless they also
+# look like content; on candidates they move the score either way
+POSITIVE=re.compile(r'article|body|content|entry|main|post|text|blog|story|prose|markdown',re.IGNORECASE)
+NEGATIVE=re.compile(r'comment|footer|footnote|masthead|sidebar|sponsor|share|social|related|recommend|promo|advert|\bads?\b|banner|cookie|consent|'
+                    r'newsletter|subscribe|popup|modal|breadcrumb|menu|\bnav|widget|toolbar|pagination|login|signup|navigation|complementary|contentinfo|dialog',re.IGNORECASE)
+# Never dropped on their class alone
+PROTECTED_TAGS=frozenset(['html','body','article','main'])
+# Elements whose text is scored and credited to their ancestors
+PARAGRAPH_TAGS=frozenset(['p','pre','td','blockquote','li','dd'])
+TAG_WEIGHTS={'article':10,'main':10,'div':5,'section':3,'pre':3,'td':3,'blockquote':3,'ol':-3,'ul':-3,'dl':-3,'dd':-3,'li':-3,'address':-3,'th':-5,
+             **{heading:-5 for heading in HEADINGS}}
+# End tags implied by a new element of the same kind
+SELF_CLOSING_SIBLINGS=frozenset(['p','option'])
+# Elements that close an open element of these tags, looking no further up than the boundary tags
+IMPLIED_END={'tr':(frozenset(['tr']),frozenset(['table','thead','tbody','tfoot'])),
+             'td':(frozenset(['td','th']),frozenset(['tr','table'])),'th':(frozenset(['td','th']),frozenset(['tr','table'])),
+             'li':(frozenset(['li']),frozenset(['ul','ol'])),
+             'dt':(frozenset(['dt','dd']),frozenset(['dl'])),'dd':(frozenset(['dt','dd']),frozenset(['dl']))}
+# Candidates compared when looking for a container shared by close ones, and how many must share it
+TOP_CANDIDATES=5
+MIN_CLOSE_CANDIDATES=3
+# Below this much text the extraction is not trusted and the whole page is returned
+MIN_CONTENT_CHARS=250
+
+class Node:
+    __slots__=('tag','attrs','children','parent','text_length','link_length','commas','is_block','score')
+
+    def __init__(self,tag:str,attrs:list[tuple[str,Optional[str]]],parent:Optional['Node']):
+        self.tag=tag
+        self.attrs=attrs
+        self.children:list[Union['Node',str]]=[]
+        self.parent=parent
+        self.text_length=0
+        self.link_length=0
+        self.commas=0
+        self.is_block=False
+        self.score:Optional[float]=None
+
+    @property
+    def link_density(self)->float:
+        return self.link_length/self.text_length if self.text_length else 0.0
+
+    def hints(self)->str:
+        attributes=dict(self.attrs)
+        return ' '.join(value for value in (attributes.get('class'),attributes.get('id'),attributes.get('role')) if value)
+
+class MainContentConverter(ByteFeedParser):
+    """
+    Readability-style extraction of the main content of a page, rendered as markdown.
+
+    The page is parsed into a light tree while it downloads, dropping the subtrees MarkdownConverter
+    skips plus those whose class, id or role marks them as chrome (cookie banners, sidebars,
+    comments, share bars). Every paragraph-like element with enough text scores 1 + its commas +
+    1 per 100 characters (at most 3) and credits it to its parent and half of it to its
+    grandparent. A container's score starts from its tag and class weights and is scaled by
+    (1 - link density), so link lists lose to prose. The best container is rendered together
+    with the siblings that score close to it; when that leaves too little text, the whole
+    (pruned) page is rendered instead.
+
+    Args:
+        content_type (str, optional): Content-Type header of the response
+        base_url (str, optional): Used to resolve relative links and images
+        encoding (str, optional): Known charset of the bytes; skips detection
+    """
+    def __init__(self,content_type:Optional[str]=None,base_url:Optional[str]=None,encoding:Optional[str]=None):
+        super().__init__(content_type=content_type,encoding=encoding)
+        self.base_url=base_url
+        self.root=Node('#document',[],None)
+        self.current=self.root
+        self.skip_tag:Optional[str]=None
+        self.skip_depth=0
+
+    def handle_starttag(self,tag:str,attrs:list[tuple[str,Optional[str]]]):
+        if self.skip_tag is not None:
+            if tag==self.skip_tag:
+                self.skip_depth+=1
+            elif self.skip_tag=='head' and tag=='body':
+                self.skip_tag,self.skip_depth=None,0
+            return
+        attributes=dict(attrs)
+        if is_skipped(tag,attributes) or self.is_unlikely(tag,attrs):
+            if tag not in VOID_TAGS:
+                self.skip_tag,self.skip_depth=tag,1
+            return
+        if tag in SELF_CLOSING_SIBLINGS and self.current.tag==tag:
+            self.current=self.current.parent
+        elif tag in IMPLIED_END:
+            self.close_implied(*IMPLIED_END[tag])
+        node=Node(tag,attrs,self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current=node
+
+    def close_implied(self,closed:frozenset[str],boundary:frozenset[str]):
+        """A new row closes the open row and its cells, a new cell the open cell, and so on."""
+        node=self.current
+        while node is not self.root and node.tag not in boundary:
+            if node.tag in closed:
+                self.current=node.parent
+                return
+            node=node.parent
+
+    def handle_endtag(self,tag:str):
+        if self.skip_tag is not None:
+            if tag==self.skip_tag:
+                self.skip_depth-=1
+                if self.skip_depth==0:
+                    self.skip_tag=None
+            return
+        node=self.current
+        while node is not self.root and node.tag!=tag:
+            node=node.parent
+        # A stray end tag closes nothing
+        if node is not self.root:
+            self.current=node.parent
+
+    def handle_data(self,data:str):
+        if self.skip_tag is None and data:
+            self.current.children.append(data)
+
+    def is_unlikely(self,tag:str,attrs:list[tuple[str,Optional[str]]])->bool:
+        if tag in PROTECTED_TAGS:
+            return False
+        hints=' '.join(value for name,value in attrs if name in ('class','id','role') and value)
+        return bool(hints) and NEGATIVE.search(hints) is not None and POSITIVE.search(hints) is None
+
+    def finish(self)->str:
+        self.close_bytes()
+        nodes=self.measure()
+        content=self.extract(nodes)
+        return self.render(content)
+
+    def measure(self)->list[Node]:
+        """
+        Text, link text and comma counts of every element, children before parents (no recursion:
+        DOMs can be deep). Returns the elements in document order.
+        """
+        order:list[Node]=[]
+        stack=[self.root]
+        while stack:
+            node=stack.pop()
+            order.append(node)
+            stack.extend(child for child in reversed(node.children) if isinstance(child,Node))
+        for node in reversed(order):
+            for child in node.children:
+                if isinstance(child,str):
+                    text=child.strip()
+                    node.text_length+=len(text)
+                    node.commas+=text.count(',')+text.count('，')
+                else:
+                    node.text_length+=child.text_length
+                    node.link_length+=child.link_length
+                    node.commas+=child.commas
+                    node.is_block=node.is_block or child.is_block or child.tag in BLOCK_TAGS or child.tag in PARAGRAPH_TAGS or child.tag in HEADINGS
+            if node.tag=='a':
+                node.link_length=node.text_length
+        return order
+
+    def extract(self,nodes:list[Node])->list[Node]:
+        candidates:list[Node]=[]
+        for node in nodes:
+            # A div or section holding only inline content is a paragraph too
+            paragraph=node.tag in PARAGRAPH_TAGS or (node.tag in ('div','section') and not node.is_block)
+            if not paragraph or node.text_length<25 or node.parent is None:
+                continue
+            score=1+node.commas+min(node.text_length//100,3)
+            for ancestor,share in ((node.parent,1.0),(node.parent.parent,0.5)):
+                if ancestor is None or ancestor is self.root:
+                    break
+                if ancestor.score is None:
+                    ancestor.score=self.initial_score(ancestor)
+                    candidates.append(ancestor)
+                ancestor.score+=score*share
+        if not candidates:
+            return [self.root]
+        for candidate in candidates:
+            candidate.score*=1-candidate.link_density
+        candidates.sort(key=lambda candidate:candidate.score,reverse=True)
+        top=self.common_container(candidates[0],candidates[1:TOP_CANDIDATES])
+        parent=top.parent
+        if parent is None or parent is self.root:
+            content=[top]
+        else:
+            threshold=max(10.0,candidates[0].score*0.2)
+            content=[sibling for sibling in parent.children if isinstance(sibling,Node) and (sibling is top or self.is_related(sibling,threshold))]
+        if sum(node.text_length for node in content)<MIN_CONTENT_CHARS:
+            return [self.root]
+        title=self.title(nodes)
+        if title is not None and not any(self.contains(node,title) for node in content):
+            # The headline usually sits above the body text, outside the container that won
+            content.insert(0,title)
+        return content
+
+    def title(self,nodes:list[Node])->Optional[Node]:
+        """First <h1> of the page (nodes are in document order)."""
+        return next((node for node in nodes if node.tag=='h1' and node.text_length),None)
+
+    def common_container(self,top:Node,others:list[Node])->Node:
+        """
+        Content split into several similar blocks (posts of a thread, sections of a page) makes
+        each block a close candidate; the ancestor holding enough of them is the content instead.
+        """
+        close=[other for other in others if other.score>=top.score*0.75]
+        if len(close)<MIN_CLOSE_CANDIDATES:
+            return top
+        ancestor=top.parent
+        while ancestor is not None and ancestor is not self.root and ancestor.tag not in ('body','html'):
+            if sum(self.contains(ancestor,other) for other in close)>=MIN_CLOSE_CANDIDATES:
+                return ancestor
+            ancestor=ancestor.parent
+        return top
+
+    def contains(self,ancestor:Node,node:Node)->bool:
+        while node is not None:
+            if node is ancestor:
+                return True
+            node=node.parent
+        return False
+
+    def initial_score(self,node:Node)->float:
+        score=float(TAG_WEIGHTS.get(node.tag,0))
+        hints=node.hints()
+        if hints:
+            if POSITIVE.search(hints):
+                score+=25
+            if NEGATIVE.search(hints):
+                score-=25
+        return score
+
+    def is_related(self,sibling:Node,threshold:float)->bool:
+        """Siblings of the top candidate that carry the same content: close scores or plain prose paragraphs."""
+        if sibling.score is not None and sibling.score>=threshold:
+            return True
+        if sibling.tag!='p':
+            return False
+        if sibling.text_length>80:
+            return sibling.link_density<0.25
+        return sibling.text_length>0 and sibling.link_length==0
+
+    def render(self,content:list[Node])->str:
+        converter=MarkdownConverter(base_url=self.base_url)
+        for top in content:
+            stack:list[tuple[Union[Node,str],bool]]=[(top,False)]
+            while stack:
+                item,closing=stack.pop()
+                if isinstance(item,str):
+                    converter.handle_data(item)
+                elif closing:
+                    converter.handle_endtag(item.tag)
+                else:
+                    if item is not self.root:
+                        converter.handle_starttag(item.tag,item.attrs)
+                    if item.tag not in VOID_TAGS and item is not self.root:
+                        stack.append((item,True))
+                    stack.extend((child,False) for child in reversed(item.children))
+        return converter.render()
@@ -0,0 +1,54 @@
+from dataclasses import dataclass,field
+from typing import Literal,Optional
+
+CacheStatus=Literal['miss','fresh','revalidated']
+
+@dataclass
+class CacheEntry:
+    url:str
+    status:int
+    encoding:Optional[str]
+    stored:float
+    expires:float
+    etag:Optional[str]=None
+    last_modified:Optional[str]=None
+    no_cache:bool=False
+    size:int=0
+    content_type:Optional[str]=None
+    truncated:bool=False
+    markdown:list[str]=field(default_factory=list)
+
+    def is_fresh(self,now:float)->bool:
+        return not self.no_cache and now<self.expires
+
+@dataclass
+class FetchResult:
+    url:str
+    status:int
+    body:bytes
+    encoding:Optional[str]
+    cache:CacheStatus
+    key:Optional[str]=None
+    content_type:Optional[str]=None
+    truncated:bool=False
+
+    @property
+    def text(self)->str:
+        return self.body.decode(self.encoding or 'utf-8',errors='replace')
+
+@dataclass
+class Document:
+    url:str
+    variant:str
+    digest:str
+    pages:list[str]
+    fetch:FetchResult
+
+@dataclass
+class ScrapeResult:
+    url:str
+    document:Optional[Document]=None
+    error:Optional[str]=None
+    # Seconds spent queued behind the concurrency and per-host limits, then fetching and converting
+    waited:float=0.0
+    elapsed:float=0.0